@@ -0,0 +1,323 @@
+"""
+Нагрузочные замеры AVL-дерева, B+-дерева и хеш-таблицы.
+
+Для каждого движка, распределения ключей и размера замеряются сценарии
+insert, search, delete, range и traversal: операций в секунду, задержка
+одной операции (перцентили) и пиковая память при построении структуры.
+
+Запуск:
+    python benchmarks.py                                   # 1e3, 1e4, 1e5 ключей, все движки
+    python benchmarks.py --sizes 1000 10000000 --engines BTree HashTable
+    python benchmarks.py --output results.json             # сохранить результаты в JSON
+    python benchmarks.py --baseline results.json           # сравнить с сохранёнными;
+                                                           # код возврата 1 при регрессии
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+from collections import deque, namedtuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(ROOT, 'task1'), os.path.join(ROOT, 'task2')]
+
+from AVLTree import AVLTree
+from BTree import BTree
+from HashTable import HashTable
+from OpenHashTable import OpenHashTable
+
+# =======================
+# Распределения ключей
+# =======================
+
+# Шаг ключей-коллизий делится на 10**7 и на 2**20, поэтому все ключи попадают
+# в одну ячейку таблицы размером 10**k (k <= 7), 2**k (k <= 20) или
+# 10 · 2**k (k <= 19) — так растёт HashTable с размера по умолчанию.
+# OpenHashTable подмешивает старшие биты хэша и эти ключи разводит.
+COLLISION_STRIDE = 2 ** 20 * 5 ** 7
+
+# Ключи-коллизии в цепочечной таблице дают квадратичное время,
+# поэтому для больших размеров это распределение пропускается.
+COLLISION_LIMIT = 10_000
+
+ZIPF_EXPONENT = 1.1
+
+def sequential_keys(size: int, rng: random.Random) -> list:
+    """
+    Возрастающие ключи 1..size.
+    """
+    return list(range(1, size + 1))
+
+def random_keys(size: int, rng: random.Random) -> list:
+    """
+    size различных случайных ключей из диапазона в десять раз шире.
+    """
+    return rng.sample(range(1, 10 * size + 1), size)
+
+def zipf_keys(size: int, rng: random.Random) -> list:
+    """
+    size обращений к ключам с частотами по закону Ципфа (ранг r встречается
+    с вероятностью ~ r ** -ZIPF_EXPONENT): немного горячих ключей и длинный хвост.
+    Ранг берётся обращением непрерывной функции распределения, а затем
+    перемешивается умножением на нечётную константу по модулю 2**32.
+    """
+    power = 1 - ZIPF_EXPONENT
+    span = size ** power - 1
+    keys = []
+    for _ in range(size):
+        rank = min(size, int((1 + rng.random() * span) ** (1 / power)))
+        keys.append(rank * 2654435761 % 2 ** 32 + 1)
+    return keys
+
+def collision_keys(size: int, rng: random.Random) -> list:
+    """
+    Ключи, кратные COLLISION_STRIDE: у хеш-таблицы все они попадают в одну ячейку.
+    """
+    return [i * COLLISION_STRIDE for i in range(1, size + 1)]
+
+DISTRIBUTIONS = {
+    'sequential': sequential_keys,
+    'random': random_keys,
+    'zipf': zipf_keys,
+    'collision': collision_keys,
+}
+
+# =======================
+# Движки
+# =======================
+
+# create(size) строит пустую структуру; kind — 'tree' (упорядоченное множество)
+# или 'table' (словарь без порядка: сценарии range и traversal для неё не запускаются).
+Engine = namedtuple('Engine', ['create', 'kind'])
+
+ENGINES = {
+    'AVLTree': Engine(lambda size: AVLTree(), 'tree'),
+    'BTree': Engine(lambda size: BTree(), 'tree'),
+    'HashTable': Engine(lambda size: HashTable(), 'table'),
+    'OpenHashTable': Engine(lambda size: OpenHashTable(), 'table'),
+}
+
+WORKLOADS = ('insert', 'search', 'delete', 'range', 'traversal')
+TABLE_WORKLOADS = ('insert', 'search', 'delete')
+
+RANGE_WIDTH = 100  # Ключей в одном запросе диапазона
+RANGE_QUERIES = 1_000
+TRAVERSAL_REPEATS = 5
+
+def fill(engine: Engine, keys: list):
+    """
+    Строит структуру из ключей вставкой по одному (вне замера).
+    """
+    structure = engine.create(len(keys))
+    insert = operations(engine, structure)['insert']
+    for key in keys:
+        insert(key)
+    return structure
+
+def operations(engine: Engine, structure) -> dict:
+    """
+    Возвращает операции структуры с единым видом op(аргумент).
+    """
+    if engine.kind == 'table':
+        return {
+            'insert': lambda key: structure.insert(key, key),
+            'search': structure.get,
+            'delete': structure.delete,
+        }
+    return {
+        'insert': structure.insert,
+        'search': structure.search,
+        'delete': structure.delete,
+        'range': lambda bounds: deque(structure.irange(*bounds), maxlen=0),
+        'traversal': lambda _: structure.inorder_traversal(),
+    }
+
+def workload_arguments(workload: str, keys: list) -> list:
+    """
+    Возвращает аргументы операций сценария: ключи, границы диапазонов или заглушки.
+    """
+    if workload == 'range':
+        ordered = sorted(set(keys))
+        step = max(1, len(ordered) // RANGE_QUERIES)
+        last = len(ordered) - 1
+        return [(ordered[i], ordered[min(last, i + RANGE_WIDTH)]) for i in range(0, len(ordered), step)]
+    if workload == 'traversal':
+        return [None] * TRAVERSAL_REPEATS
+    return keys
+
+# =======================
+# Замеры
+# =======================
+
+def time_operations(operation, arguments: list) -> array:
+    """
+    Выполняет операцию для каждого аргумента и возвращает задержки в наносекундах.
+    В задержку входит вызов таймера (порядка десятков наносекунд).
+    """
+    latencies = array('q', [0]) * len(arguments)
+    clock = time.perf_counter_ns
+    for i, argument in enumerate(arguments):
+        start = clock()
+        operation(argument)
+        latencies[i] = clock() - start
+    return latencies
+
+def summarize(latencies: array) -> dict:
+    """
+    Считает пропускную способность и перцентили задержки.
+    """
+    ordered = sorted(latencies)
+    count = len(ordered)
+
+    def percentile(fraction):
+        return ordered[min(count - 1, int(fraction * count))]
+
+    total = sum(ordered)
+    return {
+        'ops': count,
+        'ops_per_sec': count * 1e9 / total if total else float('inf'),
+        'latency_ns': {
+            'p50': percentile(0.5),
+            'p90': percentile(0.9),
+            'p99': percentile(0.99),
+            'p999': percentile(0.999),
+            'max': ordered[-1],
+        },
+    }
+
+def measure_peak_memory(engine: Engine, keys: list) -> int:
+    """
+    Возвращает пиковый прирост памяти (байт) при построении структуры из keys.
+    """
+    gc.collect()
+    tracemalloc.start()
+    structure = fill(engine, keys)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del structure
+    return peak
+
+def run_workload(engine: Engine, workload: str, keys: list) -> dict:
+    """
+    Готовит структуру для сценария и замеряет его.
+    """
+    structure = engine.create(len(keys)) if workload == 'insert' else fill(engine, keys)
+    arguments = workload_arguments(workload, keys)
+    operation = operations(engine, structure)[workload]
+
+    gc.collect()
+    gc.disable()
+    try:
+        return summarize(time_operations(operation, arguments))
+    finally:
+        gc.enable()
+
+def run(engine_names: list, distributions: list, sizes: list, memory: bool, seed: int) -> list:
+    """
+    Прогоняет все сочетания движка, распределения, размера и сценария.
+    Возвращает список записей с результатами.
+    """
+    results = []
+    for size in sizes:
+        for distribution in distributions:
+            if distribution == 'collision' and size > COLLISION_LIMIT:
+                continue
+            keys = DISTRIBUTIONS[distribution](size, random.Random(seed))
+            for name in engine_names:
+                engine = ENGINES[name]
+                peak = measure_peak_memory(engine, keys) if memory else None
+                for workload in WORKLOADS if engine.kind == 'tree' else TABLE_WORKLOADS:
+                    record = {
+                        'engine': name,
+                        'distribution': distribution,
+                        'size': size,
+                        'workload': workload,
+                        'peak_memory_bytes': peak,
+                    }
+                    record.update(run_workload(engine, workload, keys))
+                    results.append(record)
+                    print_record(record)
+    return results
+
+# =======================
+# Отчёт и сравнение с базой
+# =======================
+
+def print_header() -> None:
+    print(f"{'движок':<14}{'ключи':<11}{'размер':>11} {'сценарий':<10}"
+          f"{'оп/с':>13}{'p50, мкс':>10}{'p99, мкс':>10}{'память, МБ':>12}")
+
+def print_record(record: dict) -> None:
+    latency = record['latency_ns']
+    peak = record['peak_memory_bytes']
+    memory = f'{peak / 2 ** 20:>12.1f}' if peak is not None else f"{'—':>12}"
+    print(f"{record['engine']:<14}{record['distribution']:<11}{record['size']:>11,} {record['workload']:<10}"
+          f"{record['ops_per_sec']:>13,.0f}{latency['p50'] / 1000:>10.2f}{latency['p99'] / 1000:>10.2f}{memory}")
+
+def record_key(record: dict) -> tuple:
+    return record['engine'], record['distribution'], record['size'], record['workload']
+
+def compare(results: list, baseline: list, tolerance: float) -> list:
+    """
+    Сравнивает результаты с базовыми. Регрессия — пропускная способность
+    ниже базовой или пиковая память выше базовой больше чем на tolerance.
+    Возвращает список описаний регрессий.
+    """
+    base = {record_key(record): record for record in baseline}
+    regressions = []
+    for record in results:
+        old = base.get(record_key(record))
+        if old is None:
+            continue
+        name = '/'.join(map(str, record_key(record)))
+        speed = record['ops_per_sec'] / old['ops_per_sec']
+        if speed < 1 - tolerance:
+            regressions.append(f'{name}: {speed - 1:+.0%} оп/с')
+        if record['peak_memory_bytes'] and old['peak_memory_bytes']:
+            memory = record['peak_memory_bytes'] / old['peak_memory_bytes']
+            if memory > 1 + tolerance:
+                regressions.append(f'{name}: {memory - 1:+.0%} памяти')
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Нагрузочные замеры AVL-дерева и хеш-таблицы')
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument('--distributions', nargs='+', choices=list(DISTRIBUTIONS), default=list(DISTRIBUTIONS))
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--no-memory', action='store_true', help='не замерять пиковую память (tracemalloc медленный)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='куда записать результаты в JSON')
+    parser.add_argument('--baseline', help='JSON с базовыми результатами для сравнения')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='допустимое ухудшение (доля)')
+    args = parser.parse_args()
+
+    print_header()
+    results = run(args.engines, args.distributions, args.sizes, not args.no_memory, args.seed)
+
+    if args.output:
+        report = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            regressions = compare(results, json.load(file)['results'], args.tolerance)
+        for regression in regressions:
+            print('Регрессия:', regression)
+        if regressions:
+            sys.exit(1)
+        print('Регрессий нет')
+
+if __name__ == '__main__':
+    main()
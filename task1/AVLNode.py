@@ -1,14 +1,19 @@
-class Node:
-    def __init__(self, val):
-        """
-        Инициализация узла в AVL-дереве.
-
-        :param val: Значение, которое будет храниться в узле.
-        :param height: Начальная высота узла, равная 1 (для листа дерева).
-        :param left: Ссылка на левое поддерево (изначально None).
-        :param right: Ссылка на правое поддерево (изначально None).
-        """
-        self.val = val
-        self.height = 1
-        self.left = None
-        self.right = None
+class Node:
+    # Без __dict__ у каждого узла: поля хранятся в слотах фиксированного размера
+    __slots__ = ('val', 'height', 'size', 'left', 'right')
+
+    def __init__(self, val):
+        """
+        Инициализация узла в AVL-дереве.
+
+        :param val: Значение, которое будет храниться в узле.
+        :param height: Начальная высота узла, равная 1 (для листа дерева).
+        :param size: Количество узлов в поддереве, равное 1 (для листа дерева).
+        :param left: Ссылка на левое поддерево (изначально None).
+        :param right: Ссылка на правое поддерево (изначально None).
+        """
+        self.val = val
+        self.height = 1
+        self.size = 1
+        self.left = None
+        self.right = None
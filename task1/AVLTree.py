@@ -1,356 +1,1311 @@
-from AVLNode import Node
-from collections import deque
-
-class AVLTree:
-
-    # =======================
-    # Базовые операции
-    # =======================
-
-    def __init__(self):
-        """
-        Инициализация AVL-дерева.
-        Корень дерева изначально отсутствует.
-        """
-        self.root = None
-
-    def get_height(self, node: Node) -> int:
-        """
-        Возвращает высоту узла. Если узел отсутствует, возвращает 0.
-        """
-        return 0 if not node else node.height
-
-    def update_height(self, node: Node) -> None:
-        """
-        Обновляет высоту узла на основе высоты его потомков.
-        """
-        node.height = 1 + max(self.get_height(node.left), self.get_height(node.right))
-
-    def get_balance(self, node: Node) -> int:
-        """
-        Возвращает баланс-фактор узла (разность высот левого и правого поддерева).
-        """
-        return 0 if not node else self.get_height(node.left) - self.get_height(node.right)
-
-    def get_min_node(self, node: Node) -> Node:
-        """
-        Возвращает узел с минимальным значением в поддереве.
-        """
-        return node if not node.left else self.get_min_node(node.left)
-
-    def get_max_node(self, node: Node) -> Node:
-        """
-        Возвращает узел с максимальным значением в поддереве.
-        """
-        return node if not node.right else self.get_max_node(node.right)
-
-    # =======================
-    # Повороты
-    # =======================
-
-    def rotate_right(self, root: Node) -> Node:
-        """
-        Правый поворот вокруг узла root.
-        Возвращает новую вершину, которая стала вместо root.
-        """
-        new_root = root.left
-        moved_subtree = new_root.right
-
-        # Выполняем поворот
-        new_root.right = root
-        root.left = moved_subtree
-
-        # Обновляем высоты
-        self.update_height(root)
-        self.update_height(new_root)
-
-        return new_root
-
-    def rotate_left(self, root: Node) -> Node:
-        """
-        Левый поворот вокруг узла root.
-        Возвращает новую вершину, которая стала вместо root.
-        """
-        new_root = root.right
-        moved_subtree = new_root.left
-
-        # Выполняем поворот
-        new_root.left = root
-        root.right = moved_subtree
-
-        # Обновляем высоты
-        self.update_height(root)
-        self.update_height(new_root)
-
-        return new_root
-
-    def left_right_rotate(self, node: Node) -> Node:
-        """
-        Выполняет левый поворот вокруг левого поддерева узла,
-        а затем правый поворот вокруг самого узла.
-        Возвращает новую вершину, которая стала вместо исходного узла.
-        """
-        node.left = self.rotate_left(node.left)
-        return self.rotate_right(node)
-
-    def right_left_rotate(self, node: Node) -> Node:
-        """
-        Выполняет правый поворот вокруг правого поддерева узла,
-        а затем левый поворот вокруг самого узла.
-        Возвращает новую вершину, которая стала вместо исходного узла.
-        """
-        node.right = self.rotate_right(node.right)
-        return self.rotate_left(node)
-
-    def balance(self, node: Node) -> Node:
-        """
-        Балансировка узла node.
-        В зависимости от баланс-фактора выполняется левый, правый или двойной поворот.
-        """
-        balance = self.get_balance(node)
-
-        if balance == -2:
-            if self.get_balance(node.right) == 1:
-                return self.right_left_rotate(node)  # Большой левый поворот
-            return self.rotate_left(node)  # Малый левый поворот
-
-        if balance == 2:
-            if self.get_balance(node.left) == -1:
-                return self.left_right_rotate(node)  # Большой правый поворот
-            return self.rotate_right(node)  # Малый правый поворот
-
-        return node  # Если баланс в норме, возвращаем без изменений
-
-    # =======================
-    # Операции поиска, вставки, удаления
-    # =======================
-
-    def search(self, val: int) -> Node:
-        """
-        Ищет узел с заданным значением в дереве.
-        Возвращает узел, если найден, иначе вызывает рекурсивный метод _search.
-        """
-        return self._search(self.root, val)
-
-    def _search(self, node: Node, val: int) -> Node:
-        """
-        Рекурсивно ищет узел с заданным значением в поддереве, начиная с узла node.
-        Возвращает True, если узел найден, иначе продолжает поиск в левом или правом поддереве.
-        """
-        if not node:
-            return False
-        if node.val == val:
-            return True
-        elif val < node.val:
-            return self._search(node.left, val)
-        else:
-            return self._search(node.right, val)
-
-    def insert(self, val: int) -> None:
-        """
-        Вставка нового значения в AVL-дерево.
-        Значение должно быть натуральным числом.
-        """
-        if val <= 0:
-            raise ValueError("Значение должно быть натуральным числом")
-        self.root = self._insert(self.root, val)
-
-    def _insert(self, node: Node, val: int) -> Node:
-        """
-        Рекурсивная вставка в поддерево с корнем node.
-        Возвращает новый корень поддерева после вставки.
-        """
-        if not node:
-            return Node(val)
-
-        if val < node.val:
-            node.left = self._insert(node.left, val)
-        elif val > node.val:
-            node.right = self._insert(node.right, val)
-        else:
-            return node  # Дубликаты не вставляем
-        self.update_height(node)
-        return self.balance(node)# Балансируем поддерево
-
-
-    def delete(self, val: int) -> None:
-        """
-        Удаление значения из AVL-дерева.
-        """
-        self.root = self._delete(self.root, val)
-
-    def _delete(self, node: Node, val: int) -> Node:
-        """
-        Рекурсивное удаление узла со значением val.
-        Возвращает новый корень поддерева после удаления.
-        """
-        if not node:
-            return None
-
-        if val < node.val:
-            node.left = self._delete(node.left, val)
-        elif val > node.val:
-            node.right = self._delete(node.right, val)
-        else:
-            if not node.left:
-                return node.right
-            elif not node.right:
-                return node.left
-            else:
-                min_larger_node = self.get_min_node(node.right)
-                node.val = min_larger_node.val
-                node.right = self._delete(node.right, min_larger_node.val)
-
-        return self.balance(node)
-
-    # =======================
-    # Дополнительные операции
-    # =======================
-
-    def merge(self, left_tree: Node, right_tree: Node) -> Node:
-        """
-        Сливает два поддерева в одно сбалансированное дерево.
-        Возвращает корень нового дерева.
-        """
-        if not left_tree:
-            return right_tree
-        if not right_tree:
-            return left_tree
-
-        if self.get_height(left_tree) > self.get_height(right_tree):
-            max_left = self.get_max_node(left_tree)
-            left_tree = self._delete(left_tree, max_left.val)
-
-            max_left.left = left_tree
-            max_left.right = right_tree
-
-            self.update_height(max_left)
-            return self.balance(max_left)
-        else:
-            min_right = self.get_min_node(right_tree)
-            right_tree = self._delete(right_tree, min_right.val)
-
-            min_right.left = left_tree
-            min_right.right = right_tree
-
-            self.update_height(min_right)
-            return self.balance(min_right)
-
-    def split(self, root: Node, val: int):
-        """
-        Разделяет дерево на два поддерева: одно с элементами <= val, другое — с элементами > val.
-        Возвращает два поддерева.
-        """
-        def traverse(node, left_elements, right_elements):
-            if not node:
-                return
-            traverse(node.left, left_elements, right_elements)
-            if node.val <= val:
-                left_elements.append(node.val)
-            else:
-                right_elements.append(node.val)
-            traverse(node.right, left_elements, right_elements)
-
-        left_elements = []
-        right_elements = []
-        traverse(root, left_elements, right_elements)
-
-        return self.build_avl(left_elements), self.build_avl(right_elements)
-
-    def build_avl(self, arr: list) -> Node:
-        """
-        Строит сбалансированное AVL-дерево из отсортированного массива.
-        Возвращает корень созданного дерева.
-        """
-        sorted_list = sorted(arr)
-        if not sorted_list:
-            return None
-
-        mid = len(sorted_list) // 2
-        node = Node(sorted_list[mid])
-        node.left = self.build_avl(sorted_list[:mid])
-        node.right = self.build_avl(sorted_list[mid+1:])
-        self.update_height(node)
-
-        return node
-
-    # =======================
-    # Статические операции
-    # =======================
-
-    def count_nodes(self) -> int:
-        """
-        Возвращает количество узлов в дереве.
-        """
-        return self._count_nodes(self.root)
-
-    def _count_nodes(self, node) -> int:
-        """
-        Рекурсивно считает количество узлов в поддереве.
-        """
-        return 0 if not node else 1 + self._count_nodes(node.left) + self._count_nodes(node.right)
-
-    # =======================
-    # Обходы дерева (в глубину и в ширину)
-    # =======================
-
-    def inorder_traversal(self) -> list:
-        """
-        Возвращает список значений в дереве, отсортированный по возрастанию.
-        """
-        result = []
-        self._inorder_traversal(self.root, result)
-        return result
-
-    def _inorder_traversal(self, node: Node, result: list) -> None:
-        """
-        Рекурсивный обход дерева в порядке возрастания значений (LNR).
-        """
-        if node:
-            self._inorder_traversal(node.left, result)
-            result.append(node.val)
-            self._inorder_traversal(node.right, result)
-
-    def bfs(self) -> list:
-        """
-        Выполняет обход дерева в ширину и возвращает список значений узлов.
-        """
-        if not self.root:
-            return []
-
-        result = []
-        queue = deque([self.root])
-
-        while queue:
-            node = queue.popleft()
-            result.append(node.val)
-
-            if node.left:
-                queue.append(node.left)
-            if node.right:
-                queue.append(node.right)
-
-        return result
-    
-    # =======================
-    # Валидация дерева
-    # =======================
-    
-    def validate_avl(self, node: Node) -> bool:
-        """
-        Проверяет, является ли дерево сбалансированным AVL-деревом.
-        """
-        return self._validate_avl(node)
-
-    def _validate_avl(self, node: Node) -> bool:
-        """
-        Рекурсивно проверяет балансировку дерева.
-        Возвращает True, если дерево сбалансировано, иначе False.
-        """
-        if not node:
-            return True
-
-        balance = self.get_balance(node)
-        if abs(balance) > 1:
-            return False
-        return self._validate_avl(node.left) and self._validate_avl(node.right)
+import copy
+import math
+import struct
+import sys
+from AVLNode import Node
+from TreeStats import TreeStats
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from operator import attrgetter, lt
+
+# Двоичный формат файла: заголовок (сигнатура, версия, зарезервированное поле,
+# число ключей), за ним — отсортированный массив ключей int64 little-endian.
+FILE_MAGIC = b'AVLT'
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct('<4sHHQ')
+
+# Минимальный размер обоих деревьев, начиная с которого операции над
+# множествами имеет смысл раздавать пулу процессов.
+PARALLEL_THRESHOLD = 200_000
+
+def _set_operation_chunk(operation: str, left: list, right: list) -> list:
+    """
+    Выполняет операцию над двумя отсортированными кусками ключей в процессе-работнике.
+    Возвращает отсортированный результат.
+    """
+    if operation == 'union':
+        result = set(left).union(right)
+    elif operation == 'intersection':
+        result = set(left).intersection(right)
+    else:
+        result = set(left).difference(right)
+    return sorted(result)
+
+class AVLTree:
+
+    # =======================
+    # Базовые операции
+    # =======================
+
+    def __init__(self):
+        """
+        Инициализация AVL-дерева.
+        Корень дерева изначально отсутствует.
+        """
+        self._root = None
+
+        # Кэш узлов с минимальным и максимальным значением. insert, delete
+        # и pop поддерживают его сами, а любое присваивание root снаружи
+        # (split, merge, массовая загрузка) сбрасывает его до следующего чтения.
+        self._min_node = None
+        self._max_node = None
+        self._extremes_valid = True
+
+        # Статистика (TreeStats) появляется только после enable_stats
+        self._stats = None
+
+    @property
+    def root(self) -> Node:
+        """
+        Корень дерева.
+        """
+        return self._root
+
+    @root.setter
+    def root(self, node: Node) -> None:
+        self._root = node
+        self._extremes_valid = False
+
+    def get_height(self, node: Node) -> int:
+        """
+        Возвращает высоту узла. Если узел отсутствует, возвращает 0.
+        """
+        return 0 if not node else node.height
+
+    def get_size(self, node: Node) -> int:
+        """
+        Возвращает количество узлов в поддереве. Если узел отсутствует, возвращает 0.
+        """
+        return 0 if not node else node.size
+
+    def update_height(self, node: Node) -> None:
+        """
+        Обновляет высоту узла и размер его поддерева на основе потомков.
+        """
+        node.height = 1 + max(self.get_height(node.left), self.get_height(node.right))
+        node.size = 1 + self.get_size(node.left) + self.get_size(node.right)
+
+    def update_size(self, node: Node) -> None:
+        """
+        Обновляет только размер поддерева узла (высота остаётся прежней).
+        """
+        node.size = 1 + self.get_size(node.left) + self.get_size(node.right)
+
+    def get_balance(self, node: Node) -> int:
+        """
+        Возвращает баланс-фактор узла (разность высот левого и правого поддерева).
+        """
+        return 0 if not node else self.get_height(node.left) - self.get_height(node.right)
+
+    def get_min_node(self, node: Node) -> Node:
+        """
+        Возвращает узел с минимальным значением в поддереве.
+        """
+        while node.left:
+            node = node.left
+        return node
+
+    def get_max_node(self, node: Node) -> Node:
+        """
+        Возвращает узел с максимальным значением в поддереве.
+        """
+        while node.right:
+            node = node.right
+        return node
+
+    # =======================
+    # Повороты
+    # =======================
+
+    def rotate_right(self, root: Node) -> Node:
+        """
+        Правый поворот вокруг узла root.
+        Возвращает новую вершину, которая стала вместо root.
+        """
+        new_root = root.left
+        moved_subtree = new_root.right
+
+        # Выполняем поворот
+        new_root.right = root
+        root.left = moved_subtree
+
+        # Обновляем высоты
+        self.update_height(root)
+        self.update_height(new_root)
+
+        return new_root
+
+    def rotate_left(self, root: Node) -> Node:
+        """
+        Левый поворот вокруг узла root.
+        Возвращает новую вершину, которая стала вместо root.
+        """
+        new_root = root.right
+        moved_subtree = new_root.left
+
+        # Выполняем поворот
+        new_root.left = root
+        root.right = moved_subtree
+
+        # Обновляем высоты
+        self.update_height(root)
+        self.update_height(new_root)
+
+        return new_root
+
+    def left_right_rotate(self, node: Node) -> Node:
+        """
+        Выполняет левый поворот вокруг левого поддерева узла,
+        а затем правый поворот вокруг самого узла.
+        Возвращает новую вершину, которая стала вместо исходного узла.
+        """
+        node.left = self.rotate_left(node.left)
+        return self.rotate_right(node)
+
+    def right_left_rotate(self, node: Node) -> Node:
+        """
+        Выполняет правый поворот вокруг правого поддерева узла,
+        а затем левый поворот вокруг самого узла.
+        Возвращает новую вершину, которая стала вместо исходного узла.
+        """
+        node.right = self.rotate_right(node.right)
+        return self.rotate_left(node)
+
+    def balance(self, node: Node) -> Node:
+        """
+        Балансировка узла node.
+        В зависимости от баланс-фактора выполняется левый, правый или двойной поворот.
+        """
+        balance = self.get_balance(node)
+
+        if balance == -2:
+            if self.get_balance(node.right) == 1:
+                return self.right_left_rotate(node)  # Большой левый поворот
+            return self.rotate_left(node)  # Малый левый поворот
+
+        if balance == 2:
+            if self.get_balance(node.left) == -1:
+                return self.left_right_rotate(node)  # Большой правый поворот
+            return self.rotate_right(node)  # Малый правый поворот
+
+        return node  # Если баланс в норме, возвращаем без изменений
+
+    def _rebalance_path(self, root: Node, path: list) -> Node:
+        """
+        Восстанавливает высоты и баланс снизу вверх вдоль пути path
+        (список узлов от корня root до родителя изменённого места).
+        Балансировка прекращается, как только высота очередного поддерева
+        перестаёт меняться: выше по пути остаётся пересчитать только размеры.
+        Возвращает новый корень дерева.
+        """
+        i = len(path) - 1
+        while i >= 0:
+            node = path[i]
+            old_height = node.height
+            self.update_height(node)
+            new_node = self.balance(node)
+
+            # Подвешиваем поддерево обратно к родителю
+            if new_node is not node:
+                if i == 0:
+                    root = new_node
+                elif path[i - 1].left is node:
+                    path[i - 1].left = new_node
+                else:
+                    path[i - 1].right = new_node
+
+            i -= 1
+            if new_node.height == old_height:
+                break
+
+        while i >= 0:
+            self.update_size(path[i])
+            i -= 1
+
+        return root
+
+    # =======================
+    # Операции поиска, вставки, удаления
+    # =======================
+
+    def search(self, val: int) -> bool:
+        """
+        Ищет узел с заданным значением в дереве.
+        Возвращает True, если значение найдено, иначе False.
+        """
+        return self._search(self.root, val)
+
+    def __contains__(self, val: int) -> bool:
+        """
+        Проверка вхождения значения: val in tree.
+        Идёт через search, чтобы обёртка статистики учитывала и этот путь.
+        """
+        return self.search(val)
+
+    def _search(self, node: Node, val: int) -> bool:
+        """
+        Ищет узел с заданным значением в поддереве, начиная с узла node.
+        Возвращает True, если узел найден, иначе False.
+        """
+        while node:
+            if val < node.val:
+                node = node.left
+            elif val > node.val:
+                node = node.right
+            else:
+                return True
+        return False
+
+    def insert(self, val: int) -> None:
+        """
+        Вставка нового значения в AVL-дерево.
+        Значение должно быть натуральным числом.
+        """
+        if val <= 0:
+            raise ValueError("Значение должно быть натуральным числом")
+        self._root = self._insert(self._root, val)
+        self._after_insert(val)
+
+    def _insert(self, node: Node, val: int) -> Node:
+        """
+        Вставка в поддерево с корнем node без рекурсии:
+        спуск с явным стеком пути, затем балансировка снизу вверх.
+        Возвращает новый корень поддерева после вставки.
+        """
+        if not node:
+            return Node(val)
+
+        path = []
+        current = node
+        while current:
+            path.append(current)
+            if val < current.val:
+                current = current.left
+            elif val > current.val:
+                current = current.right
+            else:
+                return node  # Дубликаты не вставляем
+
+        parent = path[-1]
+        if val < parent.val:
+            parent.left = Node(val)
+        else:
+            parent.right = Node(val)
+
+        return self._rebalance_path(node, path)  # Балансируем поддерево
+
+    def delete(self, val: int) -> None:
+        """
+        Удаление значения из AVL-дерева.
+        """
+        self._root = self._delete(self._root, val)
+        self._after_delete(val)
+
+    def _delete(self, node: Node, val: int) -> Node:
+        """
+        Удаление узла со значением val из поддерева с корнем node без рекурсии.
+        Возвращает новый корень поддерева после удаления.
+        """
+        path = []
+        current = node
+        while current:
+            if val < current.val:
+                path.append(current)
+                current = current.left
+            elif val > current.val:
+                path.append(current)
+                current = current.right
+            else:
+                break
+        if not current:
+            return node  # Значение не найдено
+
+        if current.left and current.right:
+            # Вырезаем узел-преемник и ставим его на место удаляемого узла.
+            # Узлы не обмениваются значениями, поэтому данные, привязанные
+            # к узлу (например, полезная нагрузка), остаются при своём ключе.
+            index = len(path)
+            path.append(current)
+            min_larger_node = current.right
+            while min_larger_node.left:
+                path.append(min_larger_node)
+                min_larger_node = min_larger_node.left
+
+            if path[-1] is current:
+                current.right = min_larger_node.right
+            else:
+                path[-1].left = min_larger_node.right
+
+            min_larger_node.left = current.left
+            min_larger_node.right = current.right
+            min_larger_node.height = current.height
+            path[index] = min_larger_node
+
+            if index == 0:
+                node = min_larger_node
+            elif path[index - 1].left is current:
+                path[index - 1].left = min_larger_node
+            else:
+                path[index - 1].right = min_larger_node
+
+            return self._rebalance_path(node, path)
+
+        child = current.left if current.left else current.right
+        if not path:
+            return child
+
+        parent = path[-1]
+        if parent.left is current:
+            parent.left = child
+        else:
+            parent.right = child
+
+        return self._rebalance_path(node, path)
+
+    def _pop_min_node(self) -> Node:
+        """
+        Отрезает узел с минимальным значением за один спуск по левому краю
+        и возвращает его (None для пустого дерева).
+        """
+        node = self._root
+        if not node:
+            return None
+
+        path = []
+        while node.left:
+            path.append(node)
+            node = node.left
+
+        if path:
+            path[-1].left = node.right
+            self._root = self._rebalance_path(self._root, path)
+        else:
+            self._root = node.right
+
+        # У крайнего левого узла правое поддерево — не больше одного листа,
+        # поэтому новый минимум — этот лист или родитель отрезанного узла.
+        self._min_node = node.right if node.right else (path[-1] if path else None)
+        if not self._root:
+            self._max_node = None
+
+        node.right = None
+        return node
+
+    def _pop_max_node(self) -> Node:
+        """
+        Отрезает узел с максимальным значением за один спуск по правому краю
+        и возвращает его (None для пустого дерева).
+        """
+        node = self._root
+        if not node:
+            return None
+
+        path = []
+        while node.right:
+            path.append(node)
+            node = node.right
+
+        if path:
+            path[-1].right = node.left
+            self._root = self._rebalance_path(self._root, path)
+        else:
+            self._root = node.left
+
+        self._max_node = node.left if node.left else (path[-1] if path else None)
+        if not self._root:
+            self._min_node = None
+
+        node.left = None
+        return node
+
+    # =======================
+    # Крайние значения и очередь с приоритетами
+    # =======================
+
+    def _extreme_nodes(self) -> tuple:
+        """
+        Возвращает (узел с минимумом, узел с максимумом).
+        Из действительного кэша — за O(1), иначе кэш заполняется двумя спусками.
+        """
+        if not self._extremes_valid:
+            root = self._root
+            self._min_node = self.get_min_node(root) if root else None
+            self._max_node = self.get_max_node(root) if root else None
+            self._extremes_valid = True
+        return self._min_node, self._max_node
+
+    def _after_insert(self, val) -> None:
+        """
+        Обновляет кэш крайних узлов после вставки значения val.
+        Повороты не меняют, какой узел хранит минимум или максимум,
+        поэтому спуск нужен, только если val стал новым крайним значением.
+        """
+        if not self._extremes_valid:
+            return
+        root = self._root
+        if self._min_node is None or val < self._min_node.val:
+            self._min_node = self.get_min_node(root)
+        if self._max_node is None or self._max_node.val < val:
+            self._max_node = self.get_max_node(root)
+
+    def _after_delete(self, val) -> None:
+        """
+        Обновляет кэш крайних узлов после удаления значения val.
+        """
+        if not self._extremes_valid:
+            return
+        root = self._root
+        if not root:
+            self._min_node = self._max_node = None
+            return
+        if self._min_node.val == val:
+            self._min_node = self.get_min_node(root)
+        if self._max_node.val == val:
+            self._max_node = self.get_max_node(root)
+
+    def peek_min(self) -> int:
+        """
+        Возвращает минимальное значение за O(1). Для пустого дерева вызывает IndexError.
+        """
+        node = self._extreme_nodes()[0]
+        if node is None:
+            raise IndexError("peek_min из пустого дерева")
+        return node.val
+
+    def peek_max(self) -> int:
+        """
+        Возвращает максимальное значение за O(1). Для пустого дерева вызывает IndexError.
+        """
+        node = self._extreme_nodes()[1]
+        if node is None:
+            raise IndexError("peek_max из пустого дерева")
+        return node.val
+
+    def pop_min(self) -> int:
+        """
+        Удаляет и возвращает минимальное значение за один спуск.
+        Для пустого дерева вызывает IndexError.
+        """
+        node = self._pop_min_node()
+        if node is None:
+            raise IndexError("pop_min из пустого дерева")
+        return node.val
+
+    def pop_max(self) -> int:
+        """
+        Удаляет и возвращает максимальное значение за один спуск.
+        Для пустого дерева вызывает IndexError.
+        """
+        node = self._pop_max_node()
+        if node is None:
+            raise IndexError("pop_max из пустого дерева")
+        return node.val
+
+    def _pop_min_nodes(self, k: int) -> list:
+        """
+        Отрезает k узлов с наименьшими значениями одним split за O(k + log n)
+        и возвращает их по возрастанию.
+        """
+        if k <= 0 or not self.root:
+            return []
+
+        if k >= len(self):
+            taken, self.root = self.root, None
+        else:
+            taken, self.root = self.split(self.root, self._select_node(k - 1).val)
+
+        nodes = []
+        stack = []
+        node = taken
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            nodes.append(node)
+            node = node.right
+        return nodes
+
+    def pop_min_many(self, k: int) -> list:
+        """
+        Удаляет и возвращает k наименьших значений по возрастанию за O(k + log n).
+        """
+        return [node.val for node in self._pop_min_nodes(k)]
+
+    # =======================
+    # Соседние значения
+    # =======================
+
+    def _floor_node(self, val: int, inclusive: bool = True) -> Node:
+        """
+        Возвращает узел с наибольшим значением, не большим val
+        (строго меньшим при inclusive=False), или None. Один спуск, O(log n).
+        """
+        result = None
+        node = self.root
+        while node:
+            if node.val < val or (inclusive and node.val == val):
+                result = node
+                node = node.right
+            else:
+                node = node.left
+        return result
+
+    def _ceiling_node(self, val: int, inclusive: bool = True) -> Node:
+        """
+        Возвращает узел с наименьшим значением, не меньшим val
+        (строго большим при inclusive=False), или None. Один спуск, O(log n).
+        """
+        result = None
+        node = self.root
+        while node:
+            if val < node.val or (inclusive and node.val == val):
+                result = node
+                node = node.left
+            else:
+                node = node.right
+        return result
+
+    def floor(self, val: int) -> int:
+        """
+        Возвращает наибольшее значение, не большее val, или None.
+        """
+        node = self._floor_node(val)
+        return node.val if node else None
+
+    def ceiling(self, val: int) -> int:
+        """
+        Возвращает наименьшее значение, не меньшее val, или None.
+        """
+        node = self._ceiling_node(val)
+        return node.val if node else None
+
+    def predecessor(self, val: int) -> int:
+        """
+        Возвращает наибольшее значение, строго меньшее val, или None.
+        """
+        node = self._floor_node(val, False)
+        return node.val if node else None
+
+    def successor(self, val: int) -> int:
+        """
+        Возвращает наименьшее значение, строго большее val, или None.
+        """
+        node = self._ceiling_node(val, False)
+        return node.val if node else None
+
+    # =======================
+    # Дополнительные операции
+    # =======================
+
+    def join(self, left_tree: Node, node: Node, right_tree: Node) -> Node:
+        """
+        Соединяет два поддерева через разделяющий узел node за O(|h1 - h2| + 1).
+        Все значения left_tree должны быть меньше node.val, а значения
+        right_tree — больше. Высоты поддеревьев могут быть любыми.
+        Узлы не копируются. Возвращает корень нового дерева.
+        """
+        left_height = self.get_height(left_tree)
+        right_height = self.get_height(right_tree)
+
+        if left_height > right_height + 1:
+            # Спускаемся по правому краю left_tree до поддерева подходящей высоты
+            path = []
+            current = left_tree
+            while self.get_height(current) > right_height + 1:
+                path.append(current)
+                current = current.right
+            node.left = current
+            node.right = right_tree
+            self.update_height(node)
+            path[-1].right = node
+            return self._rebalance_path(left_tree, path)
+
+        if right_height > left_height + 1:
+            # Симметрично спускаемся по левому краю right_tree
+            path = []
+            current = right_tree
+            while self.get_height(current) > left_height + 1:
+                path.append(current)
+                current = current.left
+            node.left = left_tree
+            node.right = current
+            self.update_height(node)
+            path[-1].left = node
+            return self._rebalance_path(right_tree, path)
+
+        node.left = left_tree
+        node.right = right_tree
+        self.update_height(node)
+        return node
+
+    def merge(self, left_tree: Node, right_tree: Node) -> Node:
+        """
+        Сливает два поддерева в одно сбалансированное дерево за O(log n).
+        Все значения left_tree должны быть меньше значений right_tree.
+        Разделяющим узлом служит максимум левого или минимум правого поддерева.
+        Возвращает корень нового дерева.
+        """
+        if not left_tree:
+            return right_tree
+        if not right_tree:
+            return left_tree
+
+        if self.get_height(left_tree) > self.get_height(right_tree):
+            max_left = self.get_max_node(left_tree)
+            left_tree = self._delete(left_tree, max_left.val)
+            return self.join(left_tree, max_left, right_tree)
+        else:
+            min_right = self.get_min_node(right_tree)
+            right_tree = self._delete(right_tree, min_right.val)
+            return self.join(left_tree, min_right, right_tree)
+
+    def split(self, root: Node, val: int):
+        """
+        Разделяет дерево на два поддерева: одно с элементами <= val, другое — с элементами > val.
+        Работает за O(log n): узлы исходного дерева переиспользуются, а не копируются,
+        поэтому после вызова root больше не является корректным деревом.
+        Возвращает два поддерева.
+        """
+        # Спуск: запоминаем узлы и сторону, в которую ушли
+        path = []
+        node = root
+        while node:
+            went_left = val < node.val
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+
+        # Подъём: собираем обе половины из отрезанных кусков
+        left_tree = right_tree = None
+        for node, went_left in reversed(path):
+            if went_left:
+                right_tree = self.join(right_tree, node, node.right)
+            else:
+                left_tree = self.join(node.left, node, left_tree)
+
+        return left_tree, right_tree
+
+    def _split3(self, root: Node, val: int):
+        """
+        Разделяет дерево на части со значениями < val и > val за O(log n).
+        Возвращает (левое поддерево, узел со значением val или None, правое поддерево);
+        найденный узел отсоединяется от дерева.
+        """
+        path = []
+        node = root
+        while node and node.val != val:
+            went_left = val < node.val
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+
+        middle = node
+        left_tree = middle.left if middle else None
+        right_tree = middle.right if middle else None
+        for node, went_left in reversed(path):
+            if went_left:
+                right_tree = self.join(right_tree, node, node.right)
+            else:
+                left_tree = self.join(node.left, node, left_tree)
+
+        return left_tree, middle, right_tree
+
+    def build_avl(self, arr: list) -> Node:
+        """
+        Строит сбалансированное AVL-дерево из массива значений.
+        Массив сортируется один раз, дальше дерево строится по индексам без срезов.
+        Возвращает корень созданного дерева.
+        """
+        sorted_list = sorted(arr)
+        return self._build(sorted_list, 0, len(sorted_list))
+
+    def _build(self, keys: list, lo: int, hi: int) -> Node:
+        """
+        Строит идеально сбалансированное поддерево из отсортированного
+        отрезка keys[lo:hi] за O(hi - lo). Глубина рекурсии — O(log n).
+        """
+        if lo >= hi:
+            return None
+
+        mid = lo + (hi - lo) // 2
+        node = Node(keys[mid])
+        node.left = self._build(keys, lo, mid)
+        node.right = self._build(keys, mid + 1, hi)
+        self.update_height(node)
+
+        return node
+
+    # =======================
+    # Массовая загрузка
+    # =======================
+
+    @staticmethod
+    def _sorted_unique(iterable) -> list:
+        """
+        Превращает итерируемый набор значений (в том числе генератор) в строго
+        возрастающий список. Если вход уже отсортирован без повторов,
+        сортировка пропускается и проверка стоит один проход.
+        """
+        keys = list(iterable)
+        if all(map(lt, keys, islice(keys, 1, None))):
+            return keys
+
+        keys.sort()
+        unique = keys[:1]
+        for val in islice(keys, 1, None):
+            if val != unique[-1]:
+                unique.append(val)
+        return unique
+
+    @classmethod
+    def from_sorted(cls, iterable) -> 'AVLTree':
+        """
+        Строит AVL-дерево из набора значений за O(n).
+        Отсортированный вход используется как есть, иначе сортируется один раз;
+        дубликаты отбрасываются. Значения должны быть натуральными числами.
+        """
+        tree = cls()
+        tree.insert_many(iterable)
+        return tree
+
+    def insert_many(self, iterable) -> None:
+        """
+        Вставляет пачку значений в дерево.
+        Небольшие пачки вставляются по одному значению, крупные — сливаются
+        с содержимым дерева в один отсортированный массив, по которому дерево
+        перестраивается за O(n + m) без балансировки на каждый ключ.
+        """
+        batch = self._sorted_unique(iterable)
+        if not batch:
+            return
+        if batch[0] <= 0:
+            raise ValueError("Значение должно быть натуральным числом")
+
+        if not self.root:
+            self.root = self._build(batch, 0, len(batch))
+            return
+
+        size = self.count_nodes()
+        if len(batch) * self.get_height(self.root) < size:
+            for val in batch:
+                self.insert(val)
+            return
+
+        # Две отсортированные серии timsort сливает за линейное время
+        merged = self.inorder_traversal()
+        merged.extend(batch)
+        keys = self._sorted_unique(merged)
+        self.root = self._build(keys, 0, len(keys))
+
+    # =======================
+    # Операции над множествами
+    # =======================
+
+    # Персистентные наследники копируют изменяемые узлы и не портят операнды
+    persistent = False
+
+    def _union(self, small: Node, large: Node) -> Node:
+        """
+        Объединение поддеревьев: large делится по корню small, половины
+        объединяются рекурсивно и соединяются через этот корень.
+        Глубина рекурсии — высота small, работа — O(m log(n/m + 1)).
+        """
+        if not small:
+            return large
+        if not large:
+            return small
+
+        small_left, small_right = small.left, small.right
+        large_left, _, large_right = self._split3(large, small.val)
+        left_tree = self._union(small_left, large_left)
+        right_tree = self._union(small_right, large_right)
+        return self.join(left_tree, small, right_tree)
+
+    def _intersection(self, small: Node, large: Node) -> Node:
+        """
+        Пересечение поддеревьев: корень small остаётся, только если
+        значение нашлось при делении large.
+        """
+        if not small or not large:
+            return None
+
+        small_left, small_right = small.left, small.right
+        large_left, middle, large_right = self._split3(large, small.val)
+        left_tree = self._intersection(small_left, large_left)
+        right_tree = self._intersection(small_right, large_right)
+        if middle:
+            return self.join(left_tree, small, right_tree)
+        return self.merge(left_tree, right_tree)
+
+    def _difference(self, tree: Node, removed: Node) -> Node:
+        """
+        Разность поддеревьев: tree делится по корню removed, из половин
+        рекурсивно вычитаются поддеревья removed, сам корень отбрасывается.
+        """
+        if not tree:
+            return None
+        if not removed:
+            return tree
+
+        removed_left, removed_right = removed.left, removed.right
+        left_tree, _, right_tree = self._split3(tree, removed.val)
+        left_tree = self._difference(left_tree, removed_left)
+        right_tree = self._difference(right_tree, removed_right)
+        return self.merge(left_tree, right_tree)
+
+    def _clone(self, node: Node) -> Node:
+        """
+        Копирует поддерево узел за узлом за O(n), вместе с полями наследников
+        (например, ключом и значением узла SortedMap).
+        """
+        if not node:
+            return None
+        new_node = copy.copy(node)
+        new_node.left = self._clone(node.left)
+        new_node.right = self._clone(node.right)
+        return new_node
+
+    def _set_operation(self, operation: str, other: 'AVLTree', processes: int, consume: bool) -> 'AVLTree':
+        """
+        Общая часть union / intersection / difference: выбирает последовательный
+        или параллельный путь и оформляет результат новым деревом.
+        """
+        result = type(self)()
+        if processes and min(len(self), len(other)) >= PARALLEL_THRESHOLD:
+            # Результат строится заново из ключей, операнды остаются как были
+            keys = self._parallel_set_operation(operation, other, processes)
+            result.root = result._build(keys, 0, len(keys))
+            return result
+
+        # Алгоритмы ниже разбирают узлы self (и other, кроме разности) на части;
+        # персистентные деревья копируют узлы сами, остальные работают над копиями
+        destroy = consume and not self.persistent
+        mine, theirs = self.root, other.root
+        if not destroy and not self.persistent:
+            mine = self._clone(mine)
+            if operation != 'difference':
+                theirs = self._clone(theirs)
+
+        if operation == 'difference':
+            result.root = self._difference(mine, theirs)
+        else:
+            small, large = (mine, theirs) if len(self) <= len(other) else (theirs, mine)
+            if operation == 'union':
+                result.root = self._union(small, large)
+            else:
+                result.root = self._intersection(small, large)
+
+        if destroy:
+            # Узлы операндов перешли в результат: сами операнды больше не деревья
+            self.root = None
+            if operation != 'difference':
+                other.root = None
+        return result
+
+    def _parallel_set_operation(self, operation: str, other: 'AVLTree', processes: int) -> list:
+        """
+        Режет оба дерева на processes диапазонов по равноотстоящим ключам
+        большего дерева и выполняет операцию над кусками в пуле процессов.
+        Возвращает отсортированный список ключей результата.
+        """
+        larger = self if len(self) >= len(other) else other
+        step = len(larger) // processes
+        pivots = [larger.select(i * step) for i in range(1, processes)]
+        bounds = list(zip([None] + pivots, pivots + [None]))
+
+        def chunk(tree, lo, hi):
+            return list(tree.irange(lo, hi, inclusive=(True, False)))
+
+        with ProcessPoolExecutor(processes) as pool:
+            futures = [pool.submit(_set_operation_chunk, operation, chunk(self, lo, hi), chunk(other, lo, hi))
+                       for lo, hi in bounds]
+            keys = []
+            for future in futures:
+                keys.extend(future.result())
+        return keys
+
+    def union(self, other: 'AVLTree', processes: int = None, consume: bool = False) -> 'AVLTree':
+        """
+        Возвращает дерево-объединение. Операнды не меняются: алгоритм на split/join
+        работает над копиями их узлов, поэтому вызов стоит O(n + m).
+        consume: отдать узлы операндов в результат без копирования — O(m log(n/m + 1)),
+                 где m — размер меньшего дерева, но оба операнда после вызова пусты.
+        PersistentAVLTree копирует только затронутые узлы: у него всегда
+        O(m log(n/m + 1)) и операнды не меняются, consume ничего не делает.
+        processes: число процессов для очень больших деревьев (см. PARALLEL_THRESHOLD);
+        тогда куски сливаются в пуле процессов, а результат строится заново за O(n + m)
+        из новых узлов — операнды при этом не меняются.
+        """
+        return self._set_operation('union', other, processes, consume)
+
+    def intersection(self, other: 'AVLTree', processes: int = None, consume: bool = False) -> 'AVLTree':
+        """
+        Возвращает дерево-пересечение. Про операнды, consume и processes — см. union.
+        """
+        return self._set_operation('intersection', other, processes, consume)
+
+    def difference(self, other: 'AVLTree', processes: int = None, consume: bool = False) -> 'AVLTree':
+        """
+        Возвращает дерево со значениями self, которых нет в other.
+        Про consume и processes — см. union; узлы other только читаются,
+        поэтому копируется и (при consume) опустошается лишь self.
+        """
+        return self._set_operation('difference', other, processes, consume)
+
+    def issubset(self, other: 'AVLTree') -> bool:
+        """
+        Проверяет, что все значения self есть в other. Деревья не меняются.
+        Маленькое self проверяется поиском каждого значения через search
+        (O(m log n)), как и in, — так учитывается функция ключа SortedMap.
+        Соизмеримые деревья с одним порядком — одним совместным проходом
+        по ключам сравнения (O(n + m)).
+        """
+        small, large = len(self), len(other)
+        if small > large:
+            return False
+        same_order = getattr(self, '_key', None) is getattr(other, '_key', None)
+        if not same_order or small * math.log2(large + 1) < small + large:
+            # Метод класса, а не экземпляра: обёртка статистики other эти поиски не считает
+            search = type(other).search
+            return all(search(other, val) for val in self)
+
+        sort_key = getattr(other, '_sort_key', None)
+        values = map(sort_key, other) if sort_key else iter(other)
+        for val in (map(sort_key, self) if sort_key else self):
+            for candidate in values:
+                if candidate >= val:
+                    break
+            else:
+                return False
+            if candidate != val:
+                return False
+        return True
+
+    # =======================
+    # Сохранение и загрузка
+    # =======================
+
+    def save(self, path: str) -> None:
+        """
+        Сохраняет дерево в компактный двоичный файл: заголовок и
+        отсортированный массив ключей int64 (8 байт на ключ).
+        """
+        keys = array('q', self)
+        if sys.byteorder == 'big':
+            keys.byteswap()
+        with open(path, 'wb') as file:
+            file.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, 0, len(keys)))
+            keys.tofile(file)
+
+    @staticmethod
+    def read_header(file) -> int:
+        """
+        Читает и проверяет заголовок файла. Возвращает число ключей.
+        """
+        header = file.read(FILE_HEADER.size)
+        if len(header) != FILE_HEADER.size:
+            raise ValueError("Файл слишком короткий для AVL-дерева")
+        magic, version, _, count = FILE_HEADER.unpack(header)
+        if magic != FILE_MAGIC or version != FILE_VERSION:
+            raise ValueError("Неизвестный формат файла AVL-дерева")
+        return count
+
+    @classmethod
+    def load(cls, path: str) -> 'AVLTree':
+        """
+        Загружает дерево из файла, созданного save, за O(n):
+        ключи уже отсортированы, поэтому дерево строится без поворотов.
+        """
+        with open(path, 'rb') as file:
+            count = cls.read_header(file)
+            keys = array('q')
+            keys.fromfile(file, count)
+        if sys.byteorder == 'big':
+            keys.byteswap()
+
+        tree = cls()
+        tree.root = tree._build(keys, 0, count)
+        return tree
+
+    def freeze(self):
+        """
+        Возвращает неизменяемый снимок дерева (FrozenAVLTree) за O(n):
+        ключи лежат в одном непрерывном отсортированном массиве int64,
+        что удобно для пакетного поиска search_many / contains_many.
+        """
+        from FrozenAVLTree import FrozenAVLTree
+        return FrozenAVLTree(array('q', self))
+
+    # =======================
+    # Статистика
+    # =======================
+
+    def enable_stats(self, hook=None) -> TreeStats:
+        """
+        Включает сбор статистики (повороты, длины путей поиска, время операций)
+        и возвращает её объект. hook(операция, время в нс), если задан,
+        вызывается после каждой замеряемой операции. Пока сбор не включён,
+        он ничего не стоит.
+        """
+        if self._stats is None:
+            self._stats = TreeStats(self)
+        self._stats.hook = hook
+        self._stats.enable()
+        return self._stats
+
+    def disable_stats(self) -> None:
+        """
+        Выключает сбор статистики, сохраняя накопленные значения.
+        """
+        if self._stats is not None:
+            self._stats.disable()
+
+    def stats(self) -> dict:
+        """
+        Возвращает статистику словарём (пустым, если сбор ни разу не включали).
+        """
+        return self._stats.as_dict() if self._stats is not None else {}
+
+    # =======================
+    # Статические операции
+    # =======================
+
+    def count_nodes(self) -> int:
+        """
+        Возвращает количество узлов в дереве за O(1).
+        """
+        return self.get_size(self.root)
+
+    def __len__(self) -> int:
+        """
+        Возвращает количество узлов в дереве за O(1).
+        """
+        return self.get_size(self.root)
+
+    def _count_nodes(self, node) -> int:
+        """
+        Считает количество узлов в поддереве обходом с явным стеком.
+        """
+        count = 0
+        stack = [node] if node else []
+        while stack:
+            node = stack.pop()
+            count += 1
+            if node.left:
+                stack.append(node.left)
+            if node.right:
+                stack.append(node.right)
+        return count
+
+    # =======================
+    # Порядковые статистики
+    # =======================
+
+    def rank(self, val: int) -> int:
+        """
+        Возвращает количество значений в дереве, строго меньших val, за O(log n).
+        """
+        return self._rank(val, False)
+
+    def _rank(self, val: int, inclusive: bool) -> int:
+        """
+        Считает значения меньше val (или не больше val при inclusive=True)
+        за один спуск, суммируя размеры левых поддеревьев.
+        """
+        rank = 0
+        node = self.root
+        while node:
+            if val < node.val or (val == node.val and not inclusive):
+                node = node.left
+            else:
+                rank += self.get_size(node.left) + 1
+                node = node.right
+        return rank
+
+    def select(self, k: int) -> int:
+        """
+        Возвращает k-е по возрастанию значение (нумерация с нуля) за O(log n).
+        Отрицательные k отсчитываются с конца, как в списках.
+        """
+        return self._select_node(k).val
+
+    def _select_node(self, k: int) -> Node:
+        """
+        Возвращает узел с k-м по возрастанию значением.
+        """
+        size = self.get_size(self.root)
+        if k < 0:
+            k += size
+        if not 0 <= k < size:
+            raise IndexError("Индекс вне диапазона")
+
+        node = self.root
+        while True:
+            left_size = self.get_size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k > left_size:
+                k -= left_size + 1
+                node = node.right
+            else:
+                return node
+
+    def count_range(self, lo: int, hi: int) -> int:
+        """
+        Возвращает количество значений в отрезке [lo, hi] за O(log n).
+        """
+        if lo > hi:
+            return 0
+        return self._rank(hi, True) - self._rank(lo, False)
+
+    # =======================
+    # Обходы дерева (в глубину и в ширину)
+    # =======================
+
+    def inorder_traversal(self) -> list:
+        """
+        Возвращает список значений в дереве, отсортированный по возрастанию.
+        """
+        result = []
+        self._inorder_traversal(self.root, result)
+        return result
+
+    def _inorder_traversal(self, node: Node, result: list) -> None:
+        """
+        Обход дерева в порядке возрастания значений (LNR) с явным стеком.
+        """
+        stack = []
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            result.append(node.val)
+            node = node.right
+
+    def bfs(self) -> list:
+        """
+        Выполняет обход дерева в ширину и возвращает список значений узлов.
+        """
+        return list(self.level_order())
+
+    # =======================
+    # Ленивые итераторы
+    # =======================
+
+    def __iter__(self):
+        """
+        Лениво перечисляет значения по возрастанию.
+        Память — O(h), каждое следующее значение — амортизированно O(1).
+        Изменять дерево во время итерации нельзя.
+        """
+        return map(attrgetter('val'), self._iter_nodes())
+
+    def __reversed__(self):
+        """
+        Лениво перечисляет значения по убыванию.
+        """
+        return map(attrgetter('val'), self._iter_nodes(reverse=True))
+
+    def irange(self, lo: int = None, hi: int = None, inclusive: tuple = (True, True), reverse: bool = False):
+        """
+        Лениво перечисляет значения из диапазона между lo и hi.
+        lo или hi, равные None, означают отсутствие границы;
+        inclusive задаёт, включаются ли сами границы (для lo и для hi).
+        Старт стоит O(log n), дальше каждое значение — амортизированно O(1),
+        непрочитанная часть диапазона не обходится вовсе.
+        """
+        return map(attrgetter('val'), self._iter_nodes(lo, hi, inclusive, reverse))
+
+    def _iter_nodes(self, lo=None, hi=None, inclusive: tuple = (True, True), reverse: bool = False):
+        """
+        Генератор узлов диапазона в порядке возрастания (или убывания при reverse=True).
+        """
+        include_lo, include_hi = inclusive
+        stack = []
+        node = self.root
+
+        if not reverse:
+            # Левая граница: кладём на стек узлы, не меньшие lo
+            while node:
+                if lo is None or lo < node.val or (include_lo and lo == node.val):
+                    stack.append(node)
+                    node = node.left
+                else:
+                    node = node.right
+
+            while stack:
+                node = stack.pop()
+                if hi is not None and (hi < node.val or (not include_hi and hi == node.val)):
+                    return
+                yield node
+                node = node.right
+                while node:
+                    stack.append(node)
+                    node = node.left
+        else:
+            # Правая граница: кладём на стек узлы, не большие hi
+            while node:
+                if hi is None or node.val < hi or (include_hi and hi == node.val):
+                    stack.append(node)
+                    node = node.right
+                else:
+                    node = node.left
+
+            while stack:
+                node = stack.pop()
+                if lo is not None and (node.val < lo or (not include_lo and lo == node.val)):
+                    return
+                yield node
+                node = node.left
+                while node:
+                    stack.append(node)
+                    node = node.right
+
+    def level_order(self):
+        """
+        Лениво перечисляет значения по уровням (обход в ширину).
+        Очередь хранит не больше одного уровня дерева.
+        """
+        return map(attrgetter('val'), self._iter_level_nodes())
+
+    def _iter_level_nodes(self):
+        """
+        Генератор узлов в порядке обхода в ширину.
+        """
+        if not self.root:
+            return
+
+        queue = deque([self.root])
+        while queue:
+            node = queue.popleft()
+            yield node
+
+            if node.left:
+                queue.append(node.left)
+            if node.right:
+                queue.append(node.right)
+
+    # =======================
+    # Валидация дерева
+    # =======================
+    
+    def validate_avl(self, node: Node) -> bool:
+        """
+        Проверяет, является ли дерево сбалансированным AVL-деревом.
+        """
+        return self._validate_avl(node)
+
+    def _validate_avl(self, node: Node) -> bool:
+        """
+        Рекурсивно проверяет балансировку дерева.
+        Возвращает True, если дерево сбалансировано, иначе False.
+        """
+        if not node:
+            return True
+
+        balance = self.get_balance(node)
+        if abs(balance) > 1:
+            return False
+        return self._validate_avl(node.left) and self._validate_avl(node.right)
@@ -0,0 +1,161 @@
+from collections import namedtuple
+from SortedMap import MapNode, SortedMap
+
+# Моноид задаёт агрегат: нейтральный элемент, ассоциативную операцию
+# и функцию, превращающую пару (ключ, значение) в элемент моноида.
+Monoid = namedtuple('Monoid', ['identity', 'combine', 'lift'])
+
+def _none_aware(function):
+    """
+    Оборачивает min/max так, чтобы None служил нейтральным элементом.
+    """
+    def combine(a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return function(a, b)
+    return combine
+
+SUM = Monoid(0, lambda a, b: a + b, lambda key, value: value)
+COUNT = Monoid(0, lambda a, b: a + b, lambda key, value: 1)
+MIN = Monoid(None, _none_aware(min), lambda key, value: value)
+MAX = Monoid(None, _none_aware(max), lambda key, value: value)
+
+class AggregateNode(MapNode):
+    __slots__ = ('agg',)
+
+    def __init__(self, sort_key, key, value, agg):
+        """
+        Узел словаря с агрегатом поддерева.
+
+        :param agg: Агрегат моноида по всем парам поддерева (для листа — по самой паре).
+        """
+        super().__init__(sort_key, key, value)
+        self.agg = agg
+
+class AggregateMap(SortedMap):
+    """
+    Отсортированный словарь с агрегатами поддеревьев.
+
+    Каждый узел хранит агрегат моноида по своему поддереву. Агрегат
+    пересчитывается везде, где пересчитываются высота и размер: в поворотах,
+    при вставке, удалении, соединении и массовой загрузке. Поэтому
+    aggregate(lo, hi) отвечает за O(log n), собирая готовые агрегаты
+    поддеревьев вдоль двух граничных путей.
+    """
+
+    def __init__(self, items=None, key=None, monoid: Monoid = SUM):
+        """
+        monoid: агрегируемая величина — SUM, COUNT, MIN, MAX или свой Monoid.
+        """
+        self.monoid = monoid
+        super().__init__(items, key)
+
+    def _new_node(self, val, key, value) -> AggregateNode:
+        """
+        Создаёт лист с агрегатом, равным вкладу его собственной пары.
+        """
+        return AggregateNode(val, key, value, self.monoid.lift(key, value))
+
+    def _update_aggregate(self, node: AggregateNode) -> None:
+        """
+        Пересчитывает агрегат узла по агрегатам потомков.
+        """
+        monoid = self.monoid
+        agg = monoid.lift(node.key, node.value)
+        if node.left:
+            agg = monoid.combine(node.left.agg, agg)
+        if node.right:
+            agg = monoid.combine(agg, node.right.agg)
+        node.agg = agg
+
+    def update_height(self, node: AggregateNode) -> None:
+        """
+        Обновляет высоту, размер и агрегат поддерева узла.
+        """
+        super().update_height(node)
+        self._update_aggregate(node)
+
+    def update_size(self, node: AggregateNode) -> None:
+        """
+        Обновляет размер и агрегат поддерева узла.
+        """
+        super().update_size(node)
+        self._update_aggregate(node)
+
+    def insert(self, key, value=None) -> None:
+        """
+        Вставка или обновление пары. При обновлении значения агрегаты
+        пересчитываются вдоль пути от узла к корню.
+        """
+        val = self._sort_key(key)
+        path = []
+        node = self.root
+        while node:
+            path.append(node)
+            if val < node.val:
+                node = node.left
+            elif node.val < val:
+                node = node.right
+            else:
+                node.value = value
+                for node in reversed(path):
+                    self._update_aggregate(node)
+                return
+        super().insert(key, value)
+
+    # =======================
+    # Агрегаты по диапазонам
+    # =======================
+
+    def aggregate(self, lo=None, hi=None):
+        """
+        Возвращает агрегат по парам с ключами из отрезка [lo, hi] за O(log n).
+        lo или hi, равные None, означают отсутствие границы.
+        """
+        monoid = self.monoid
+        combine = monoid.combine
+        lo = None if lo is None else self._sort_key(lo)
+        hi = None if hi is None else self._sort_key(hi)
+
+        # Ищем верхний узел, попадающий в отрезок: ниже пути к границам расходятся
+        node = self.root
+        while node:
+            if lo is not None and node.val < lo:
+                node = node.right
+            elif hi is not None and hi < node.val:
+                node = node.left
+            else:
+                break
+        if not node:
+            return monoid.identity
+
+        # Левая граница: узлы не меньше lo вместе с правыми поддеревьями
+        left_part = monoid.identity
+        current = node.left
+        while current:
+            if lo is None or not current.val < lo:
+                part = monoid.lift(current.key, current.value)
+                if current.right:
+                    part = combine(part, current.right.agg)
+                left_part = combine(part, left_part)
+                current = current.left
+            else:
+                current = current.right
+
+        # Правая граница: узлы не больше hi вместе с левыми поддеревьями
+        right_part = monoid.identity
+        current = node.right
+        while current:
+            if hi is None or not hi < current.val:
+                part = monoid.lift(current.key, current.value)
+                if current.left:
+                    part = combine(current.left.agg, part)
+                right_part = combine(right_part, part)
+                current = current.right
+            else:
+                current = current.left
+
+        middle = monoid.lift(node.key, node.value)
+        return combine(combine(left_part, middle), right_part)
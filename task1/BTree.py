@@ -0,0 +1,656 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from functools import partial
+from itertools import islice, takewhile
+from operator import ge, gt, le, lt
+from AVLTree import AVLTree
+
+class BNode:
+    __slots__ = ('keys', 'children', 'size', 'next')
+
+    def __init__(self, keys: array, children: list = None):
+        """
+        Узел B+-дерева.
+
+        :param keys: Ключи узла (array('q')). В листе это сами значения,
+                     во внутреннем узле — разделители: все значения в children[i]
+                     меньше keys[i], а все значения в children[i + 1] не меньше его.
+        :param children: Список потомков внутреннего узла; у листа — None.
+        """
+        self.keys = keys
+        self.children = children
+        self.size = len(keys) if children is None else sum(child.size for child in children)
+        self.next = None  # Следующий лист по возрастанию (только у листьев)
+
+class BTree:
+    """
+    B+-дерево с тем же интерфейсом, что у AVLTree.
+
+    Значения хранятся только в листах, по order штук в плотном массиве
+    array('q'), а листья связаны в список для быстрого обхода диапазонов.
+    Поиск проходит log_order(n) узлов вместо 1.44 · log2(n) у AVL-дерева
+    и внутри узла делает бинарный поиск по непрерывному массиву, поэтому
+    на десятках миллионов ключей дерево заметно бережнее к кэшу и памяти.
+
+    order — наибольшее число потомков внутреннего узла и значений в листе.
+    Любой узел, кроме корня, заполнен хотя бы на половину (но не меньше двух).
+    В каждом узле хранится число значений в его поддереве, поэтому
+    count_nodes работает за O(1), а rank и select — за O(order · log n).
+    """
+
+    def __init__(self, order: int = 64):
+        """
+        Инициализация пустого B+-дерева с заданной шириной узла.
+        """
+        if order < 3:
+            raise ValueError("Порядок B-дерева должен быть не меньше 3")
+        self.order = order
+        self.min_fill = max(2, order // 2)
+        self.root = None
+
+    def _fill(self, node: BNode) -> int:
+        """
+        Возвращает заполненность узла: число значений листа или потомков внутреннего узла.
+        """
+        return len(node.keys) if node.children is None else len(node.children)
+
+    def get_height(self, node: BNode) -> int:
+        """
+        Возвращает высоту поддерева (все листья лежат на одной глубине).
+        Для пустого дерева возвращает 0.
+        """
+        height = 0
+        while node:
+            height += 1
+            node = node.children[0] if node.children is not None else None
+        return height
+
+    def _edge_leaf(self, node: BNode, leftmost: bool) -> BNode:
+        """
+        Возвращает крайний левый (leftmost=True) или крайний правый лист поддерева.
+        """
+        index = 0 if leftmost else -1
+        while node.children is not None:
+            node = node.children[index]
+        return node
+
+    # =======================
+    # Разбиение и слияние узлов
+    # =======================
+
+    def _split_node(self, node: BNode):
+        """
+        Делит переполненный узел пополам. Возвращает (разделитель, правая половина).
+        Левая половина остаётся в самом узле.
+        """
+        keys = node.keys
+        if node.children is None:
+            mid = len(keys) // 2
+            right = BNode(keys[mid:])
+            del keys[mid:]
+            right.next = node.next
+            node.next = right
+            node.size = len(keys)
+            return right.keys[0], right
+
+        mid = len(keys) // 2
+        separator = keys[mid]
+        right = BNode(keys[mid + 1:], node.children[mid + 1:])
+        del keys[mid:]
+        del node.children[mid + 1:]
+        node.size -= right.size
+        return separator, right
+
+    def _split_up(self, root: BNode, node: BNode, path: list) -> BNode:
+        """
+        Разбивает переполненный узел node и, если нужно, его предков
+        вдоль пути path из пар (родитель, индекс потомка). Возвращает новый корень.
+        """
+        while True:
+            separator, right = self._split_node(node)
+            if not path:
+                return BNode(array('q', [separator]), [node, right])
+
+            parent, index = path.pop()
+            parent.keys.insert(index, separator)
+            parent.children.insert(index + 1, right)
+            if len(parent.children) <= self.order:
+                return root
+            node = parent
+
+    def _absorb(self, left: BNode, right: BNode, separator: int) -> None:
+        """
+        Дописывает в узел left содержимое соседнего узла right того же уровня.
+        separator разделяет их значения и нужен только внутренним узлам.
+        """
+        if left.children is None:
+            left.next = right.next
+        else:
+            left.keys.append(separator)
+            left.children.extend(right.children)
+        left.keys.extend(right.keys)
+        left.size += right.size
+
+    def _borrow_from_left(self, parent: BNode, index: int) -> None:
+        """
+        Переносит крайний правый элемент левого соседа в начало потомка index.
+        """
+        node = parent.children[index]
+        left = parent.children[index - 1]
+        if node.children is None:
+            val = left.keys.pop()
+            node.keys.insert(0, val)
+            parent.keys[index - 1] = val
+            moved = 1
+        else:
+            node.keys.insert(0, parent.keys[index - 1])
+            parent.keys[index - 1] = left.keys.pop()
+            child = left.children.pop()
+            node.children.insert(0, child)
+            moved = child.size
+        left.size -= moved
+        node.size += moved
+
+    def _borrow_from_right(self, parent: BNode, index: int) -> None:
+        """
+        Переносит крайний левый элемент правого соседа в конец потомка index.
+        """
+        node = parent.children[index]
+        right = parent.children[index + 1]
+        if node.children is None:
+            node.keys.append(right.keys.pop(0))
+            parent.keys[index] = right.keys[0]
+            moved = 1
+        else:
+            node.keys.append(parent.keys[index])
+            parent.keys[index] = right.keys.pop(0)
+            child = right.children.pop(0)
+            node.children.append(child)
+            moved = child.size
+        right.size -= moved
+        node.size += moved
+
+    def _rebalance_child(self, parent: BNode, index: int) -> None:
+        """
+        Восстанавливает заполненность потомка index: занимает элемент у соседа,
+        а если соседи заполнены минимально — сливается с одним из них.
+        """
+        children = parent.children
+        if index > 0 and self._fill(children[index - 1]) > self.min_fill:
+            self._borrow_from_left(parent, index)
+        elif index + 1 < len(children) and self._fill(children[index + 1]) > self.min_fill:
+            self._borrow_from_right(parent, index)
+        else:
+            if index == 0:
+                index = 1
+            right = children.pop(index)
+            self._absorb(children[index - 1], right, parent.keys.pop(index - 1))
+
+    # =======================
+    # Операции поиска, вставки, удаления
+    # =======================
+
+    def search(self, val: int) -> bool:
+        """
+        Возвращает True, если значение есть в дереве, иначе False.
+        """
+        node = self.root
+        if not node:
+            return False
+        while node.children is not None:
+            node = node.children[bisect_right(node.keys, val)]
+        keys = node.keys
+        index = bisect_left(keys, val)
+        return index < len(keys) and keys[index] == val
+
+    def __contains__(self, val: int) -> bool:
+        """
+        Проверка вхождения значения: val in tree.
+        """
+        return self.search(val)
+
+    def insert(self, val: int) -> None:
+        """
+        Вставка нового значения. Значение должно быть натуральным числом.
+        """
+        if val <= 0:
+            raise ValueError("Значение должно быть натуральным числом")
+        if not self.root:
+            self.root = BNode(array('q', [val]))
+            return
+
+        path = []
+        node = self.root
+        while node.children is not None:
+            index = bisect_right(node.keys, val)
+            path.append((node, index))
+            node = node.children[index]
+
+        keys = node.keys
+        index = bisect_left(keys, val)
+        if index < len(keys) and keys[index] == val:
+            return  # Дубликаты не вставляем
+        keys.insert(index, val)
+        node.size += 1
+        for parent, _ in path:
+            parent.size += 1
+
+        if len(keys) > self.order:
+            self.root = self._split_up(self.root, node, path)
+
+    def delete(self, val: int) -> None:
+        """
+        Удаление значения. Если значение не найдено, ничего не происходит.
+        """
+        node = self.root
+        if not node:
+            return
+
+        path = []
+        while node.children is not None:
+            index = bisect_right(node.keys, val)
+            path.append((node, index))
+            node = node.children[index]
+
+        keys = node.keys
+        index = bisect_left(keys, val)
+        if index == len(keys) or keys[index] != val:
+            return  # Значение не найдено
+        del keys[index]
+        node.size -= 1
+        for parent, _ in path:
+            parent.size -= 1
+
+        # Поднимаемся, пока узлы недозаполнены; корень проверяем отдельно
+        while path and self._fill(node) < self.min_fill:
+            node, index = path.pop()
+            self._rebalance_child(node, index)
+
+        root = self.root
+        if root.children is None:
+            if not root.keys:
+                self.root = None
+        elif len(root.children) == 1:
+            self.root = root.children[0]
+
+    # =======================
+    # Массовая загрузка
+    # =======================
+
+    @classmethod
+    def from_sorted(cls, iterable, order: int = 64) -> 'BTree':
+        """
+        Строит дерево из набора значений за O(n) (после сортировки, если она нужна).
+        """
+        tree = cls(order)
+        tree.insert_many(iterable)
+        return tree
+
+    def insert_many(self, iterable) -> None:
+        """
+        Вставляет пачку значений: небольшие пачки — по одному значению,
+        крупные — слиянием с содержимым дерева и построением снизу вверх за O(n + m).
+        """
+        batch = AVLTree._sorted_unique(iterable)
+        if not batch:
+            return
+        if batch[0] <= 0:
+            raise ValueError("Значение должно быть натуральным числом")
+
+        if self.root and len(batch) * self.get_height(self.root) < len(self):
+            for val in batch:
+                self.insert(val)
+            return
+
+        merged = self.inorder_traversal()
+        merged.extend(batch)
+        self.root = self._build(AVLTree._sorted_unique(merged))
+
+    def _build(self, keys: list) -> BNode:
+        """
+        Строит дерево снизу вверх из отсортированного списка без повторов.
+        Элементы каждого уровня делятся между узлами поровну,
+        поэтому все узлы, кроме корня, заполнены хотя бы наполовину.
+        """
+        count = len(keys)
+        if not count:
+            return None
+
+        parts = -(-count // self.order)
+        level = []
+        mins = []
+        for part in range(parts):
+            leaf = BNode(array('q', keys[part * count // parts:(part + 1) * count // parts]))
+            if level:
+                level[-1].next = leaf
+            level.append(leaf)
+            mins.append(leaf.keys[0])
+
+        while len(level) > 1:
+            count = len(level)
+            parts = -(-count // self.order)
+            upper = []
+            upper_mins = []
+            for part in range(parts):
+                lo, hi = part * count // parts, (part + 1) * count // parts
+                upper.append(BNode(array('q', mins[lo + 1:hi]), level[lo:hi]))
+                upper_mins.append(mins[lo])
+            level, mins = upper, upper_mins
+        return level[0]
+
+    # =======================
+    # Дополнительные функции
+    # =======================
+
+    def merge(self, left_tree: BNode, right_tree: BNode) -> BNode:
+        """
+        Сливает два B+-дерева, где все значения left_tree меньше значений
+        right_tree, за O(order · log n). Более низкое дерево сливается с узлом
+        той же высоты на краю более высокого, при переполнении узлы делятся вверх.
+        """
+        if not left_tree:
+            return right_tree
+        if not right_tree:
+            return left_tree
+
+        first_leaf = self._edge_leaf(right_tree, True)
+        self._edge_leaf(left_tree, False).next = first_leaf
+        separator = first_leaf.keys[0]
+        left_height = self.get_height(left_tree)
+        right_height = self.get_height(right_tree)
+
+        path = []
+        if left_height >= right_height:
+            root = node = left_tree
+            for _ in range(left_height - right_height):
+                path.append((node, len(node.children) - 1))
+                node = node.children[-1]
+            for parent, _ in path:
+                parent.size += right_tree.size
+            self._absorb(node, right_tree, separator)
+        else:
+            root = node = right_tree
+            for _ in range(right_height - left_height):
+                path.append((node, 0))
+                node = node.children[0]
+            for parent, _ in path:
+                parent.size += left_tree.size
+            self._absorb(left_tree, node, separator)
+            path[-1][0].children[0] = node = left_tree
+
+        if self._fill(node) > self.order:
+            root = self._split_up(root, node, path)
+        return root
+
+    def _piece(self, keys: array, children: list) -> BNode:
+        """
+        Оформляет часть потомков разрезаемого узла как отдельное дерево.
+        """
+        if len(children) == 1:
+            return children[0]
+        return BNode(keys, children)
+
+    def split(self, root: BNode, val: int):
+        """
+        Разделяет дерево на два: значения <= val и > val. Возвращает корни частей.
+        Узлы исходного дерева переиспользуются; части, отрезанные на каждом
+        уровне пути поиска, соединяются через merge.
+        """
+        left_parts = []
+        right_parts = []
+        node = root
+        while node and node.children is not None:
+            index = bisect_right(node.keys, val)
+            children = node.children
+            if index:
+                left_parts.append(self._piece(node.keys[:index - 1], children[:index]))
+            if index + 1 < len(children):
+                right_parts.append(self._piece(node.keys[index + 1:], children[index + 1:]))
+            node = children[index]
+
+        left = right = None
+        if node:
+            keys = node.keys
+            index = bisect_right(keys, val)
+            if not index:
+                right = node
+            elif index == len(keys):
+                left = node
+            else:
+                right = BNode(keys[index:])
+                right.next = node.next
+                del keys[index:]
+                node.size = index
+                left = node
+
+        for part in reversed(left_parts):
+            left = self.merge(part, left)
+        for part in reversed(right_parts):
+            right = self.merge(right, part)
+        if left:
+            self._edge_leaf(left, False).next = None
+        return left, right
+
+    # =======================
+    # Статические операции
+    # =======================
+
+    def count_nodes(self) -> int:
+        """
+        Возвращает количество значений в дереве за O(1).
+        """
+        return self.root.size if self.root else 0
+
+    def __len__(self) -> int:
+        """
+        Возвращает количество значений в дереве за O(1).
+        """
+        return self.root.size if self.root else 0
+
+    def rank(self, val: int) -> int:
+        """
+        Возвращает количество значений, строго меньших val.
+        """
+        rank = 0
+        node = self.root
+        if not node:
+            return 0
+        while node.children is not None:
+            index = bisect_right(node.keys, val)
+            rank += sum(child.size for child in islice(node.children, index))
+            node = node.children[index]
+        return rank + bisect_left(node.keys, val)
+
+    def select(self, k: int) -> int:
+        """
+        Возвращает k-е по возрастанию значение (нумерация с нуля).
+        """
+        size = len(self)
+        if k < 0:
+            k += size
+        if not 0 <= k < size:
+            raise IndexError("Индекс вне диапазона")
+
+        node = self.root
+        while node.children is not None:
+            for child in node.children:
+                if k < child.size:
+                    node = child
+                    break
+                k -= child.size
+        return node.keys[k]
+
+    # =======================
+    # Обходы дерева
+    # =======================
+
+    def inorder_traversal(self) -> list:
+        """
+        Возвращает список значений в дереве, отсортированный по возрастанию.
+        """
+        result = []
+        self._inorder_traversal(self.root, result)
+        return result
+
+    def _inorder_traversal(self, node: BNode, result: list) -> None:
+        """
+        Дописывает в result значения поддерева node по возрастанию,
+        проходя его листья по связному списку.
+        """
+        if not node:
+            return
+        last = self._edge_leaf(node, False)
+        leaf = self._edge_leaf(node, True)
+        while True:
+            result.extend(leaf.keys)
+            if leaf is last:
+                return
+            leaf = leaf.next
+
+    def bfs(self) -> list:
+        """
+        Возвращает ключи узлов в порядке обхода в ширину: сначала
+        разделители внутренних узлов по уровням, затем значения листьев.
+        """
+        result = []
+        if not self.root:
+            return result
+
+        queue = deque([self.root])
+        while queue:
+            node = queue.popleft()
+            result.extend(node.keys)
+            if node.children is not None:
+                queue.extend(node.children)
+        return result
+
+    def __iter__(self):
+        """
+        Лениво перечисляет значения по возрастанию.
+        """
+        return self._iter_forward(None, True)
+
+    def __reversed__(self):
+        """
+        Лениво перечисляет значения по убыванию.
+        """
+        return self._iter_backward(None, True)
+
+    def irange(self, lo: int = None, hi: int = None, inclusive: tuple = (True, True), reverse: bool = False):
+        """
+        Лениво перечисляет значения между lo и hi (см. AVLTree.irange).
+        Прямой обход идёт по связному списку листьев без повторных спусков.
+        """
+        if reverse:
+            values = self._iter_backward(hi, inclusive[1])
+            if lo is None:
+                return values
+            return takewhile(partial(le if inclusive[0] else lt, lo), values)
+
+        values = self._iter_forward(lo, inclusive[0])
+        if hi is None:
+            return values
+        return takewhile(partial(ge if inclusive[1] else gt, hi), values)
+
+    def _iter_forward(self, lo, inclusive: bool):
+        """
+        Перечисляет значения от lo (или от минимума) по возрастанию.
+        """
+        node = self.root
+        if not node:
+            return
+        if lo is None:
+            node = self._edge_leaf(node, True)
+            start = 0
+        else:
+            while node.children is not None:
+                node = node.children[bisect_right(node.keys, lo)]
+            start = (bisect_left if inclusive else bisect_right)(node.keys, lo)
+
+        while node:
+            yield from node.keys[start:]
+            node = node.next
+            start = 0
+
+    def _iter_backward(self, hi, inclusive: bool):
+        """
+        Перечисляет значения от hi (или от максимума) по убыванию.
+        Листья связаны только вперёд, поэтому путь от корня хранится в стеке.
+        """
+        node = self.root
+        if not node:
+            return
+
+        stack = []
+        while node.children is not None:
+            index = len(node.children) - 1 if hi is None else bisect_right(node.keys, hi)
+            stack.append((node, index))
+            node = node.children[index]
+        keys = node.keys
+        if hi is None:
+            end = len(keys)
+        else:
+            end = (bisect_right if inclusive else bisect_left)(keys, hi)
+
+        while True:
+            yield from reversed(keys[:end])
+            while stack:
+                parent, index = stack.pop()
+                if index:
+                    break
+            else:
+                return
+            stack.append((parent, index - 1))
+            node = parent.children[index - 1]
+            while node.children is not None:
+                stack.append((node, len(node.children) - 1))
+                node = node.children[-1]
+            keys = node.keys
+            end = len(keys)
+
+    # =======================
+    # Валидация дерева
+    # =======================
+
+    def validate_btree(self, node: BNode) -> bool:
+        """
+        Проверяет инварианты поддерева node: порядок значений и разделителей,
+        заполненность узлов, одинаковую глубину листьев, размеры поддеревьев
+        и связи между соседними листьями.
+        """
+        if not node:
+            return True
+
+        leaves = []
+        leaf_depth = None
+        stack = [(node, None, None, 1)]
+        while stack:
+            current, lo, hi, depth = stack.pop()
+            keys = current.keys
+            if not all(map(lt, keys, islice(keys, 1, None))):
+                return False
+            if keys and ((lo is not None and keys[0] < lo) or (hi is not None and keys[-1] >= hi)):
+                return False
+
+            min_fill = 1 if current is node else self.min_fill
+            if current.children is None:
+                if not min_fill <= len(keys) <= self.order or current.size != len(keys):
+                    return False
+                if leaf_depth is None:
+                    leaf_depth = depth
+                elif depth != leaf_depth:
+                    return False
+                leaves.append(current)
+                continue
+
+            children = current.children
+            if not max(2, min_fill) <= len(children) <= self.order or len(children) != len(keys) + 1:
+                return False
+            if current.size != sum(child.size for child in children):
+                return False
+            bounds = [lo, *keys, hi]
+            for index in range(len(children) - 1, -1, -1):
+                stack.append((children[index], bounds[index], bounds[index + 1], depth + 1))
+
+        return all(leaf.next is following for leaf, following in zip(leaves, islice(leaves, 1, None)))
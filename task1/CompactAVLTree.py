@@ -0,0 +1,606 @@
+from array import array
+from collections import deque
+from AVLTree import AVLTree
+
+class CompactAVLTree:
+    """
+    AVL-дерево с компактным хранением узлов в параллельных массивах (struct of arrays).
+
+    Узел — это индекс i, его поля лежат в массивах _keys[i], _heights[i],
+    _sizes[i], _left[i] и _right[i]. Индекс 0 зарезервирован под пустой узел
+    (высота и размер 0), поэтому обращения к потомкам не требуют проверок на None.
+    Освобождённые при удалении индексы связываются в список свободных ячеек
+    через массив _left и переиспользуются при следующих вставках.
+
+    На ключ уходит 21 байт (8 — ключ, 1 — высота, 4 — размер, 2 × 4 — потомки)
+    против сотни с лишним байт у объекта Node. Ключи — натуральные числа до 2**63 - 1.
+
+    Интерфейс совпадает с AVLTree, кроме операций над узлами как объектами:
+    split, merge и join перевешивают узлы между деревьями, а индекс узла
+    имеет смысл только в массивах своего дерева. Эти методы бросают
+    NotImplementedError; вместо них — inorder_traversal, irange и from_sorted.
+    validate_avl принимает индекс узла (по умолчанию — корень).
+    """
+
+    # =======================
+    # Базовые операции
+    # =======================
+
+    def __init__(self):
+        """
+        Инициализация пустого дерева: в массивах есть только пустой узел 0.
+        """
+        self._keys = array('q', [0])
+        self._heights = array('b', [0])
+        self._sizes = array('i', [0])
+        self._left = array('i', [0])
+        self._right = array('i', [0])
+        self._free = 0  # Голова списка свободных ячеек (0 — список пуст)
+        self.root = 0
+
+    def _new_node(self, val: int) -> int:
+        """
+        Выделяет ячейку под новый лист: берёт её из списка свободных или
+        дописывает в конец массивов. Возвращает индекс узла.
+        """
+        index = self._free
+        if index:
+            self._free = self._left[index]
+            self._keys[index] = val
+            self._heights[index] = 1
+            self._sizes[index] = 1
+            self._left[index] = 0
+            self._right[index] = 0
+            return index
+
+        self._keys.append(val)
+        self._heights.append(1)
+        self._sizes.append(1)
+        self._left.append(0)
+        self._right.append(0)
+        return len(self._keys) - 1
+
+    def _release_node(self, index: int) -> None:
+        """
+        Возвращает ячейку в список свободных.
+        """
+        self._left[index] = self._free
+        self._right[index] = 0
+        self._free = index
+
+    def _update(self, index: int) -> None:
+        """
+        Обновляет высоту и размер поддерева узла по его потомкам.
+        """
+        left = self._left[index]
+        right = self._right[index]
+        left_height = self._heights[left]
+        right_height = self._heights[right]
+        self._heights[index] = 1 + (left_height if left_height > right_height else right_height)
+        self._sizes[index] = 1 + self._sizes[left] + self._sizes[right]
+
+    def _get_balance(self, index: int) -> int:
+        """
+        Возвращает баланс-фактор узла.
+        """
+        return self._heights[self._left[index]] - self._heights[self._right[index]]
+
+    # =======================
+    # Повороты
+    # =======================
+
+    def _rotate_right(self, root: int) -> int:
+        """
+        Правый поворот вокруг узла root. Возвращает новую вершину поддерева.
+        """
+        new_root = self._left[root]
+        self._left[root] = self._right[new_root]
+        self._right[new_root] = root
+        self._update(root)
+        self._update(new_root)
+        return new_root
+
+    def _rotate_left(self, root: int) -> int:
+        """
+        Левый поворот вокруг узла root. Возвращает новую вершину поддерева.
+        """
+        new_root = self._right[root]
+        self._right[root] = self._left[new_root]
+        self._left[new_root] = root
+        self._update(root)
+        self._update(new_root)
+        return new_root
+
+    def _balance(self, index: int) -> int:
+        """
+        Балансировка узла: малый или большой поворот в зависимости от баланс-фактора.
+        """
+        balance = self._get_balance(index)
+
+        if balance == -2:
+            if self._get_balance(self._right[index]) == 1:
+                self._right[index] = self._rotate_right(self._right[index])
+            return self._rotate_left(index)
+
+        if balance == 2:
+            if self._get_balance(self._left[index]) == -1:
+                self._left[index] = self._rotate_left(self._left[index])
+            return self._rotate_right(index)
+
+        return index
+
+    def _rebalance_path(self, path: list) -> None:
+        """
+        Восстанавливает высоты и баланс снизу вверх вдоль пути от корня.
+        Как только высота поддерева перестаёт меняться, дальше
+        пересчитываются только размеры.
+        """
+        heights = self._heights
+        i = len(path) - 1
+        while i >= 0:
+            index = path[i]
+            old_height = heights[index]
+            self._update(index)
+            new_index = self._balance(index)
+
+            if new_index != index:
+                if i == 0:
+                    self.root = new_index
+                elif self._left[path[i - 1]] == index:
+                    self._left[path[i - 1]] = new_index
+                else:
+                    self._right[path[i - 1]] = new_index
+
+            i -= 1
+            if heights[new_index] == old_height:
+                break
+
+        sizes = self._sizes
+        while i >= 0:
+            index = path[i]
+            sizes[index] = 1 + sizes[self._left[index]] + sizes[self._right[index]]
+            i -= 1
+
+    # =======================
+    # Операции поиска, вставки, удаления
+    # =======================
+
+    def search(self, val: int) -> bool:
+        """
+        Возвращает True, если значение есть в дереве, иначе False.
+        """
+        keys, left, right = self._keys, self._left, self._right
+        index = self.root
+        while index:
+            key = keys[index]
+            if val < key:
+                index = left[index]
+            elif val > key:
+                index = right[index]
+            else:
+                return True
+        return False
+
+    def insert(self, val: int) -> None:
+        """
+        Вставка нового значения. Значение должно быть натуральным числом.
+        """
+        if val <= 0:
+            raise ValueError("Значение должно быть натуральным числом")
+        if not self.root:
+            self.root = self._new_node(val)
+            return
+
+        keys, left, right = self._keys, self._left, self._right
+        path = []
+        index = self.root
+        while index:
+            path.append(index)
+            key = keys[index]
+            if val < key:
+                index = left[index]
+            elif val > key:
+                index = right[index]
+            else:
+                return  # Дубликаты не вставляем
+
+        node = self._new_node(val)
+        parent = path[-1]
+        if val < keys[parent]:
+            left[parent] = node
+        else:
+            right[parent] = node
+        self._rebalance_path(path)
+
+    def delete(self, val: int) -> None:
+        """
+        Удаление значения из дерева. Освободившаяся ячейка идёт в список свободных.
+        """
+        keys, left, right = self._keys, self._left, self._right
+        path = []
+        index = self.root
+        while index:
+            key = keys[index]
+            if val < key:
+                path.append(index)
+                index = left[index]
+            elif val > key:
+                path.append(index)
+                index = right[index]
+            else:
+                break
+        if not index:
+            return  # Значение не найдено
+
+        if left[index] and right[index]:
+            # Переносим ключ преемника и удаляем сам преемник
+            path.append(index)
+            successor = right[index]
+            while left[successor]:
+                path.append(successor)
+                successor = left[successor]
+            keys[index] = keys[successor]
+            index = successor
+
+        child = left[index] if left[index] else right[index]
+        self._release_node(index)
+        if not path:
+            self.root = child
+            return
+
+        parent = path[-1]
+        if left[parent] == index:
+            left[parent] = child
+        else:
+            right[parent] = child
+        self._rebalance_path(path)
+
+    # =======================
+    # Соседние значения
+    # =======================
+
+    def _floor_index(self, val: int, inclusive: bool = True) -> int:
+        """
+        Индекс узла с наибольшим ключом, не большим val (строго меньшим при
+        inclusive=False), или 0.
+        """
+        keys, left, right = self._keys, self._left, self._right
+        result = 0
+        index = self.root
+        while index:
+            key = keys[index]
+            if key < val or (inclusive and key == val):
+                result = index
+                index = right[index]
+            else:
+                index = left[index]
+        return result
+
+    def _ceiling_index(self, val: int, inclusive: bool = True) -> int:
+        """
+        Индекс узла с наименьшим ключом, не меньшим val (строго большим при
+        inclusive=False), или 0.
+        """
+        keys, left, right = self._keys, self._left, self._right
+        result = 0
+        index = self.root
+        while index:
+            key = keys[index]
+            if val < key or (inclusive and key == val):
+                result = index
+                index = left[index]
+            else:
+                index = right[index]
+        return result
+
+    def floor(self, val: int) -> int:
+        """
+        Возвращает наибольшее значение, не большее val, или None.
+        """
+        index = self._floor_index(val)
+        return self._keys[index] if index else None
+
+    def ceiling(self, val: int) -> int:
+        """
+        Возвращает наименьшее значение, не меньшее val, или None.
+        """
+        index = self._ceiling_index(val)
+        return self._keys[index] if index else None
+
+    def predecessor(self, val: int) -> int:
+        """
+        Возвращает наибольшее значение, строго меньшее val, или None.
+        """
+        index = self._floor_index(val, False)
+        return self._keys[index] if index else None
+
+    def successor(self, val: int) -> int:
+        """
+        Возвращает наименьшее значение, строго большее val, или None.
+        """
+        index = self._ceiling_index(val, False)
+        return self._keys[index] if index else None
+
+    # =======================
+    # Операции над узлами
+    # =======================
+
+    def _node_operation(self, name: str):
+        raise NotImplementedError(
+            f"CompactAVLTree.{name} не поддерживается: индексы узлов принадлежат массивам "
+            "одного дерева; используйте inorder_traversal, irange и from_sorted")
+
+    def join(self, left_tree, node, right_tree):
+        """
+        Не поддерживается (см. описание класса).
+        """
+        self._node_operation('join')
+
+    def merge(self, left_tree, right_tree):
+        """
+        Не поддерживается (см. описание класса).
+        """
+        self._node_operation('merge')
+
+    def split(self, root, val: int):
+        """
+        Не поддерживается (см. описание класса).
+        """
+        self._node_operation('split')
+
+    # =======================
+    # Массовая загрузка
+    # =======================
+
+    @classmethod
+    def from_sorted(cls, iterable) -> 'CompactAVLTree':
+        """
+        Строит дерево из набора значений за O(n). Узел с i-м по порядку ключом
+        получает индекс i + 1, так что массив ключей остаётся отсортированным.
+        """
+        tree = cls()
+        tree.insert_many(iterable)
+        return tree
+
+    def insert_many(self, iterable) -> None:
+        """
+        Вставляет пачку значений: небольшие пачки — по одному значению,
+        крупные — слиянием с содержимым дерева и перестройкой массивов за O(n + m).
+        """
+        batch = AVLTree._sorted_unique(iterable)
+        if not batch:
+            return
+        if batch[0] <= 0:
+            raise ValueError("Значение должно быть натуральным числом")
+
+        if self.root and len(batch) * self._heights[self.root] < len(self):
+            for val in batch:
+                self.insert(val)
+            return
+
+        merged = self.inorder_traversal()
+        merged.extend(batch)
+        self._build(AVLTree._sorted_unique(merged))
+
+    def _build(self, keys: list) -> None:
+        """
+        Заново заполняет массивы идеально сбалансированным деревом из
+        отсортированного списка keys. Список свободных ячеек сбрасывается.
+        """
+        count = len(keys)
+        self._keys = array('q', [0])
+        self._keys.extend(keys)
+        self._heights = array('b', [0]) * (count + 1)
+        self._sizes = array('i', [0]) * (count + 1)
+        self._left = array('i', [0]) * (count + 1)
+        self._right = array('i', [0]) * (count + 1)
+        self._free = 0
+        self.root = self._build_range(0, count)
+
+    def _build_range(self, lo: int, hi: int) -> int:
+        """
+        Связывает узлы с ключами keys[lo:hi] в поддерево и возвращает индекс его корня.
+        Глубина рекурсии — O(log n).
+        """
+        if lo >= hi:
+            return 0
+
+        mid = lo + (hi - lo) // 2
+        index = mid + 1
+        self._left[index] = self._build_range(lo, mid)
+        self._right[index] = self._build_range(mid + 1, hi)
+        self._update(index)
+        return index
+
+    # =======================
+    # Статические операции
+    # =======================
+
+    def count_nodes(self) -> int:
+        """
+        Возвращает количество узлов в дереве за O(1).
+        """
+        return self._sizes[self.root]
+
+    def __len__(self) -> int:
+        """
+        Возвращает количество узлов в дереве за O(1).
+        """
+        return self._sizes[self.root]
+
+    def rank(self, val: int) -> int:
+        """
+        Возвращает количество значений, строго меньших val, за O(log n).
+        """
+        rank = 0
+        index = self.root
+        while index:
+            if val <= self._keys[index]:
+                index = self._left[index]
+            else:
+                rank += self._sizes[self._left[index]] + 1
+                index = self._right[index]
+        return rank
+
+    def select(self, k: int) -> int:
+        """
+        Возвращает k-е по возрастанию значение (нумерация с нуля) за O(log n).
+        """
+        size = len(self)
+        if k < 0:
+            k += size
+        if not 0 <= k < size:
+            raise IndexError("Индекс вне диапазона")
+
+        index = self.root
+        while True:
+            left_size = self._sizes[self._left[index]]
+            if k < left_size:
+                index = self._left[index]
+            elif k > left_size:
+                k -= left_size + 1
+                index = self._right[index]
+            else:
+                return self._keys[index]
+
+    def count_range(self, lo: int, hi: int) -> int:
+        """
+        Возвращает количество значений в отрезке [lo, hi] за O(log n).
+        """
+        if lo > hi:
+            return 0
+        return self.rank(hi + 1) - self.rank(lo)
+
+    # =======================
+    # Обходы дерева
+    # =======================
+
+    def inorder_traversal(self) -> list:
+        """
+        Возвращает список значений в дереве, отсортированный по возрастанию.
+        """
+        return list(self)
+
+    def bfs(self) -> list:
+        """
+        Возвращает список значений узлов в порядке обхода в ширину.
+        """
+        if not self.root:
+            return []
+
+        result = []
+        queue = deque([self.root])
+        while queue:
+            index = queue.popleft()
+            result.append(self._keys[index])
+            if self._left[index]:
+                queue.append(self._left[index])
+            if self._right[index]:
+                queue.append(self._right[index])
+        return result
+
+    def __iter__(self):
+        """
+        Лениво перечисляет значения по возрастанию, храня стек из O(h) индексов.
+        """
+        keys, left, right = self._keys, self._left, self._right
+        stack = []
+        index = self.root
+        while stack or index:
+            while index:
+                stack.append(index)
+                index = left[index]
+            index = stack.pop()
+            yield keys[index]
+            index = right[index]
+
+    def __reversed__(self):
+        """
+        Лениво перечисляет значения по убыванию.
+        """
+        keys, left, right = self._keys, self._left, self._right
+        stack = []
+        index = self.root
+        while stack or index:
+            while index:
+                stack.append(index)
+                index = right[index]
+            index = stack.pop()
+            yield keys[index]
+            index = left[index]
+
+    def irange(self, lo: int = None, hi: int = None, inclusive: tuple = (True, True), reverse: bool = False):
+        """
+        Лениво перечисляет значения из диапазона между lo и hi (см. AVLTree.irange).
+        """
+        include_lo, include_hi = inclusive
+        keys, left, right = self._keys, self._left, self._right
+        stack = []
+        index = self.root
+
+        if not reverse:
+            # Левая граница: кладём на стек узлы, не меньшие lo
+            while index:
+                if lo is None or lo < keys[index] or (include_lo and lo == keys[index]):
+                    stack.append(index)
+                    index = left[index]
+                else:
+                    index = right[index]
+
+            while stack:
+                index = stack.pop()
+                key = keys[index]
+                if hi is not None and (hi < key or (not include_hi and hi == key)):
+                    return
+                yield key
+                index = right[index]
+                while index:
+                    stack.append(index)
+                    index = left[index]
+        else:
+            # Правая граница: кладём на стек узлы, не большие hi
+            while index:
+                if hi is None or keys[index] < hi or (include_hi and hi == keys[index]):
+                    stack.append(index)
+                    index = right[index]
+                else:
+                    index = left[index]
+
+            while stack:
+                index = stack.pop()
+                key = keys[index]
+                if lo is not None and (key < lo or (not include_lo and lo == key)):
+                    return
+                yield key
+                index = left[index]
+                while index:
+                    stack.append(index)
+                    index = right[index]
+
+    # =======================
+    # Валидация дерева
+    # =======================
+
+    def validate_avl(self, node: int = None) -> bool:
+        """
+        Проверяет порядок ключей, высоты, размеры и баланс всех узлов
+        поддерева с корнем node (индекс узла; None — всё дерево).
+        """
+        stack = [(self.root if node is None else node, None, None)]
+        while stack:
+            index, lo, hi = stack.pop()
+            if not index:
+                continue
+            key = self._keys[index]
+            left, right = self._left[index], self._right[index]
+            if (lo is not None and key <= lo) or (hi is not None and key >= hi):
+                return False
+            if abs(self._get_balance(index)) > 1:
+                return False
+            if self._heights[index] != 1 + max(self._heights[left], self._heights[right]):
+                return False
+            if self._sizes[index] != 1 + self._sizes[left] + self._sizes[right]:
+                return False
+            stack.append((left, lo, key))
+            stack.append((right, key, hi))
+        return True
@@ -0,0 +1,245 @@
+import threading
+from contextlib import contextmanager
+from AVLTree import AVLTree
+
+class RWLock:
+    """
+    Блокировка «читатели-писатель»: читателей может быть сколько угодно
+    одновременно, писатель работает в одиночку. Ждущий писатель не пропускает
+    новых читателей вперёд, поэтому поток чтений не может его «заморить».
+    Блокировка не реентерабельная.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self) -> None:
+        """
+        Захватывает блокировку на чтение.
+        """
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        """
+        Освобождает блокировку чтения.
+        """
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """
+        Захватывает блокировку на запись, дожидаясь ухода читателей.
+        """
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        """
+        Освобождает блокировку записи.
+        """
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        """
+        Контекстный менеджер для чтения: with lock.read_locked(): ...
+        """
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        """
+        Контекстный менеджер для записи: with lock.write_locked(): ...
+        """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+class ConcurrentAVLTree:
+    """
+    Потокобезопасная обёртка над AVL-деревом.
+
+    Чтения выполняются параллельно под блокировкой чтения, изменения
+    (в том числе повороты при балансировке) — под блокировкой записи.
+    Пачку изменений можно применить за один захват блокировки через apply_batch.
+    Ленивые итераторы дерева здесь не отдаются: диапазоны и обходы
+    возвращаются готовыми списками, собранными под блокировкой.
+    """
+
+    def __init__(self, tree: AVLTree = None):
+        """
+        tree: оборачиваемое дерево (по умолчанию новое пустое AVLTree).
+        Обращаться к нему напрямую в обход обёртки нельзя.
+        """
+        self._tree = tree if tree is not None else AVLTree()
+        self._lock = RWLock()
+
+    # =======================
+    # Чтение
+    # =======================
+
+    def search(self, val: int) -> bool:
+        """
+        Ищет значение в дереве.
+        """
+        with self._lock.read_locked():
+            return self._tree.search(val)
+
+    def __contains__(self, val: int) -> bool:
+        """
+        Проверка вхождения значения: val in tree.
+        """
+        return self.search(val)
+
+    def __len__(self) -> int:
+        """
+        Возвращает количество узлов в дереве.
+        """
+        with self._lock.read_locked():
+            return len(self._tree)
+
+    def count_nodes(self) -> int:
+        """
+        Возвращает количество узлов в дереве.
+        """
+        return len(self)
+
+    def rank(self, val: int) -> int:
+        """
+        Возвращает количество значений, строго меньших val.
+        """
+        with self._lock.read_locked():
+            return self._tree.rank(val)
+
+    def select(self, k: int) -> int:
+        """
+        Возвращает k-е по возрастанию значение.
+        """
+        with self._lock.read_locked():
+            return self._tree.select(k)
+
+    def count_range(self, lo: int, hi: int) -> int:
+        """
+        Возвращает количество значений в отрезке [lo, hi].
+        """
+        with self._lock.read_locked():
+            return self._tree.count_range(lo, hi)
+
+    def floor(self, val: int) -> int:
+        """
+        Возвращает наибольшее значение, не большее val, или None.
+        """
+        with self._lock.read_locked():
+            return self._tree.floor(val)
+
+    def ceiling(self, val: int) -> int:
+        """
+        Возвращает наименьшее значение, не меньшее val, или None.
+        """
+        with self._lock.read_locked():
+            return self._tree.ceiling(val)
+
+    def irange(self, lo: int = None, hi: int = None, inclusive: tuple = (True, True), reverse: bool = False) -> list:
+        """
+        Возвращает список значений диапазона, собранный под блокировкой чтения.
+        """
+        with self._lock.read_locked():
+            return list(self._tree.irange(lo, hi, inclusive, reverse))
+
+    def inorder_traversal(self) -> list:
+        """
+        Возвращает список значений по возрастанию.
+        """
+        with self._lock.read_locked():
+            return self._tree.inorder_traversal()
+
+    def bfs(self) -> list:
+        """
+        Возвращает список значений в порядке обхода в ширину.
+        """
+        with self._lock.read_locked():
+            return self._tree.bfs()
+
+    def validate(self) -> bool:
+        """
+        Проверяет инварианты дерева под блокировкой чтения: порядок значений,
+        высоты, размеры поддеревьев и баланс каждого узла.
+        """
+        with self._lock.read_locked():
+            tree = self._tree
+            stack = [(tree.root, None, None)]
+            while stack:
+                node, lo, hi = stack.pop()
+                if not node:
+                    continue
+                if (lo is not None and node.val <= lo) or (hi is not None and node.val >= hi):
+                    return False
+                if node.height != 1 + max(tree.get_height(node.left), tree.get_height(node.right)):
+                    return False
+                if node.size != 1 + tree.get_size(node.left) + tree.get_size(node.right):
+                    return False
+                if abs(tree.get_balance(node)) > 1:
+                    return False
+                stack.append((node.left, lo, node.val))
+                stack.append((node.right, node.val, hi))
+            return True
+
+    # =======================
+    # Запись
+    # =======================
+
+    def insert(self, val: int) -> None:
+        """
+        Вставка значения под блокировкой записи.
+        """
+        with self._lock.write_locked():
+            self._tree.insert(val)
+
+    def delete(self, val: int) -> None:
+        """
+        Удаление значения под блокировкой записи.
+        """
+        with self._lock.write_locked():
+            self._tree.delete(val)
+
+    def insert_many(self, iterable) -> None:
+        """
+        Массовая вставка за один захват блокировки записи.
+        """
+        values = list(iterable)
+        with self._lock.write_locked():
+            self._tree.insert_many(values)
+
+    def apply_batch(self, inserts=(), deletes=()) -> None:
+        """
+        Применяет пачку изменений за один захват блокировки записи:
+        сначала вставки, затем удаления. Читатели видят либо состояние
+        до пачки, либо после неё целиком.
+        """
+        inserts = list(inserts)
+        deletes = list(deletes)
+        with self._lock.write_locked():
+            if inserts:
+                self._tree.insert_many(inserts)
+            for val in deletes:
+                self._tree.delete(val)
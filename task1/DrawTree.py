@@ -1,20 +1,96 @@
-from graphviz import Digraph
-from AVLNode import Node
-
-def draw_tree(root: Node):
-    def add_nodes_edges(dot, node):
-        if node is None:
-            return
-        dot.node(str(id(node)), label=str(node.val))
-        if node.left:
-            dot.edge(str(id(node)), str(id(node.left)))
-            add_nodes_edges(dot, node.left)
-        if node.right:
-            dot.edge(str(id(node)), str(id(node.right)))
-            add_nodes_edges(dot, node.right)
-
-    dot = Digraph()
-    add_nodes_edges(dot, root)
-    dot.render('avl_tree', format='png', view=True)
-
-    
\ No newline at end of file
+from AVLNode import Node
+
+def _escape(value) -> str:
+    """
+    Экранирует значение для строки в кавычках языка DOT.
+    """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+def _height(node: Node) -> int:
+    """
+    Возвращает высоту узла или 0 для отсутствующего.
+    """
+    return node.height if node else 0
+
+def write_dot(root: Node, out, max_depth: int = None, lo=None, hi=None,
+              show_balance: bool = False, name: str = 'avl_tree') -> int:
+    """
+    Записывает дерево в формате DOT (Graphviz) в файл или текстовый поток.
+    Строки пишутся по мере обхода с явным стеком, поэтому ни размер,
+    ни глубина дерева не упираются в память или лимит рекурсии.
+    Возвращает число записанных узлов дерева (без сводных).
+
+    :param root: Корень рисуемого дерева или любого его поддерева.
+    :param out: Путь к файлу или объект с методом write.
+    :param max_depth: Глубина (корень — 1), ниже которой поддеревья сворачиваются
+                      в сводные узлы с числом узлов и высотой.
+    :param lo: Нижняя граница отрезка значений (None — без границы).
+    :param hi: Верхняя граница отрезка значений (None — без границы).
+               Рисуется поддерево, содержащее весь отрезок; узлы вне отрезка,
+               лежащие на пути к нему, выводятся пунктиром, а поддеревья
+               целиком вне отрезка опускаются.
+    :param show_balance: Добавить к подписи высоту и баланс-фактор узла.
+    :param name: Имя графа.
+    """
+    if not hasattr(out, 'write'):
+        with open(out, 'w', encoding='utf-8') as file:
+            return write_dot(root, file, max_depth, lo, hi, show_balance, name)
+
+    def below(val):
+        return lo is not None and val < lo
+
+    def above(val):
+        return hi is not None and val > hi
+
+    # Спускаемся к верхнему узлу отрезка: все узлы отрезка лежат в его поддереве
+    node = root
+    while node and (below(node.val) or above(node.val)):
+        node = node.right if below(node.val) else node.left
+
+    write = out.write
+    write(f'digraph "{_escape(name)}" {{\n')
+    count = 0
+    stack = [(node, 1)] if node else []
+    while stack:
+        node, depth = stack.pop()
+
+        if max_depth is not None and depth > max_depth:
+            write(f'  s{id(node)} [shape=box, style=dashed, '
+                  f'label="… {node.size} узл.\\nh={node.height}"];\n')
+            continue
+
+        label = _escape(node.val)
+        if show_balance:
+            label += f'\\nh={node.height} b={_height(node.left) - _height(node.right)}'
+        style = ', style=dashed, color=gray' if below(node.val) or above(node.val) else ''
+        write(f'  n{id(node)} [label="{label}"{style}];\n')
+        count += 1
+
+        # Рёбра пишем сразу в порядке «левый, правый»: Graphviz раскладывает
+        # потомков в порядке рёбер. На месте отсутствующего потомка ставим
+        # невидимую точку, чтобы единственный потомок не уезжал под родителя.
+        children = (None if below(node.val) else node.left,
+                    None if above(node.val) else node.right)
+        collapsed = max_depth is not None and depth >= max_depth
+        for side, child in zip('lr', children):
+            if child:
+                write(f'  n{id(node)} -> {"s" if collapsed else "n"}{id(child)};\n')
+            elif any(children):
+                write(f'  {side}{id(node)} [style=invis, shape=point];\n')
+                write(f'  n{id(node)} -> {side}{id(node)} [style=invis];\n')
+        stack.extend((child, depth + 1) for child in reversed(children) if child)
+
+    write('}\n')
+    return count
+
+def draw_tree(root: Node, filename: str = 'avl_tree', format: str = 'png', **options) -> str:
+    """
+    Рисует дерево в файл filename.format через Graphviz без открытия просмотрщика.
+    DOT-описание потоково пишется в filename.gv (см. write_dot, options
+    передаются туда же). Возвращает путь к готовому изображению.
+    """
+    import graphviz
+
+    dot_path = f'{filename}.gv'
+    write_dot(root, dot_path, **options)
+    return graphviz.render('dot', format, dot_path, outfile=f'{filename}.{format}')
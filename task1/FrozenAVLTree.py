@@ -0,0 +1,255 @@
+import mmap
+import sys
+from bisect import bisect_left, bisect_right
+from functools import partial
+from AVLTree import AVLTree, FILE_HEADER
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен: без него пакетный поиск идёт через bisect
+    np = None
+
+class FrozenAVLTree:
+    """
+    Неизменяемое упорядоченное множество поверх отсортированного массива ключей.
+
+    Массив — любая последовательность с индексами (list, array, memoryview).
+    FrozenAVLTree.open отображает в память файл, созданный AVLTree.save,
+    и работает прямо с отображёнными страницами: объекты узлов не создаются,
+    открытие занимает O(1), а все процессы, открывшие один файл, делят одну
+    копию в страничном кэше ОС. Поиск и соседние значения — бинарный поиск,
+    O(log n).
+    """
+
+    def __init__(self, keys):
+        """
+        keys: строго возрастающая последовательность ключей.
+        """
+        self._keys = keys
+        self._mmap = None
+        self._array = None  # Представление ключей как numpy.ndarray, создаётся лениво
+
+    @classmethod
+    def open(cls, path: str) -> 'FrozenAVLTree':
+        """
+        Отображает файл дерева в память только для чтения.
+        """
+        if sys.byteorder != 'little':
+            raise ValueError("Отображение файла поддерживается только на little-endian платформах")
+
+        with open(path, 'rb') as file:
+            count = AVLTree.read_header(file)
+            if count == 0:
+                return cls([])
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        tree = cls(cls._mapped_keys(mapped, count))
+        tree._mmap = mapped
+        return tree
+
+    @staticmethod
+    def _mapped_keys(mapped, count: int) -> memoryview:
+        return memoryview(mapped)[FILE_HEADER.size:FILE_HEADER.size + 8 * count].cast('q')
+
+    def close(self) -> None:
+        """
+        Закрывает отображение файла. После этого дерево пусто.
+        Если на ключи ещё ссылаются представления (например, массив NumPy
+        из _as_array или его срез), бросает BufferError, а дерево остаётся
+        открытым и рабочим.
+        """
+        self._array = None
+        if self._mmap is not None:
+            count = len(self._keys)
+            self._keys.release()
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Отображение ещё экспортировано: возвращаем ключи на место
+                self._keys = self._mapped_keys(self._mmap, count)
+                raise
+            self._mmap = None
+        self._keys = []
+
+    def __enter__(self) -> 'FrozenAVLTree':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def thaw(self) -> AVLTree:
+        """
+        Строит из ключей изменяемое AVLTree за O(n).
+        """
+        tree = AVLTree()
+        tree.root = tree._build(self._keys, 0, len(self._keys))
+        return tree
+
+    # =======================
+    # Поиск
+    # =======================
+
+    def search(self, val: int) -> bool:
+        """
+        Возвращает True, если значение есть в множестве, иначе False.
+        """
+        keys = self._keys
+        index = bisect_left(keys, val)
+        return index < len(keys) and keys[index] == val
+
+    def __contains__(self, val: int) -> bool:
+        """
+        Проверка вхождения значения: val in tree.
+        """
+        return self.search(val)
+
+    def __len__(self) -> int:
+        """
+        Возвращает количество ключей.
+        """
+        return len(self._keys)
+
+    def count_nodes(self) -> int:
+        """
+        Возвращает количество ключей.
+        """
+        return len(self._keys)
+
+    def floor(self, val: int) -> int:
+        """
+        Возвращает наибольшее значение, не большее val, или None.
+        """
+        index = bisect_right(self._keys, val)
+        return self._keys[index - 1] if index else None
+
+    def ceiling(self, val: int) -> int:
+        """
+        Возвращает наименьшее значение, не меньшее val, или None.
+        """
+        index = bisect_left(self._keys, val)
+        return self._keys[index] if index < len(self._keys) else None
+
+    def predecessor(self, val: int) -> int:
+        """
+        Возвращает наибольшее значение, строго меньшее val, или None.
+        """
+        index = bisect_left(self._keys, val)
+        return self._keys[index - 1] if index else None
+
+    def successor(self, val: int) -> int:
+        """
+        Возвращает наименьшее значение, строго большее val, или None.
+        """
+        index = bisect_right(self._keys, val)
+        return self._keys[index] if index < len(self._keys) else None
+
+    def rank(self, val: int) -> int:
+        """
+        Возвращает количество значений, строго меньших val.
+        """
+        return bisect_left(self._keys, val)
+
+    def select(self, k: int) -> int:
+        """
+        Возвращает k-е по возрастанию значение (нумерация с нуля).
+        """
+        return self._keys[k]
+
+    def count_range(self, lo: int, hi: int) -> int:
+        """
+        Возвращает количество значений в отрезке [lo, hi].
+        """
+        if lo > hi:
+            return 0
+        return bisect_right(self._keys, hi) - bisect_left(self._keys, lo)
+
+    # =======================
+    # Обходы
+    # =======================
+
+    def _bounds(self, lo, hi, inclusive: tuple) -> tuple:
+        """
+        Переводит границы диапазона в полуинтервал индексов [start, stop).
+        """
+        include_lo, include_hi = inclusive
+        keys = self._keys
+        start = 0 if lo is None else (bisect_left if include_lo else bisect_right)(keys, lo)
+        stop = len(keys) if hi is None else (bisect_right if include_hi else bisect_left)(keys, hi)
+        return start, max(start, stop)
+
+    def irange(self, lo: int = None, hi: int = None, inclusive: tuple = (True, True), reverse: bool = False):
+        """
+        Лениво перечисляет значения из диапазона между lo и hi (см. AVLTree.irange).
+        """
+        start, stop = self._bounds(lo, hi, inclusive)
+        keys = self._keys
+        indexes = range(stop - 1, start - 1, -1) if reverse else range(start, stop)
+        return (keys[index] for index in indexes)
+
+    def __iter__(self):
+        """
+        Лениво перечисляет значения по возрастанию.
+        """
+        return iter(self._keys)
+
+    def __reversed__(self):
+        """
+        Лениво перечисляет значения по убыванию.
+        """
+        return reversed(self._keys)
+
+    def inorder_traversal(self) -> list:
+        """
+        Возвращает список значений по возрастанию.
+        """
+        return list(self._keys)
+
+    # =======================
+    # Пакетный поиск
+    # =======================
+
+    def _as_array(self):
+        """
+        Возвращает ключи как numpy.ndarray int64. Для array и memoryview
+        (в том числе отображённого файла) массив создаётся без копирования.
+        """
+        if self._array is None:
+            if isinstance(self._keys, list):
+                self._array = np.array(self._keys, dtype=np.int64)
+            else:
+                self._array = np.frombuffer(self._keys, dtype=np.int64)
+        return self._array
+
+    def search_many(self, values):
+        """
+        Ищет пачку значений (список или numpy.ndarray) и возвращает позиции
+        в отсортированном массиве ключей (-1 для отсутствующих) в порядке входа.
+        С NumPy поиск векторизован (numpy.searchsorted) и возвращается ndarray,
+        без него — список, а каждый поиск выполняется bisect на стороне C.
+        Значения сравниваются в своём типе: дробное значение не приводится
+        к целому и, как в search, не находится.
+        """
+        keys = self._keys
+        count = len(keys)
+        if np is not None:
+            values = np.asarray(values)
+            if not count:
+                return np.full(len(values), -1, dtype=np.int64)
+            array = self._as_array()
+            positions = np.searchsorted(array, values)
+            found = array[np.minimum(positions, count - 1)] == values
+            return np.where(found, positions, -1)
+
+        positions = list(map(partial(bisect_left, keys), values))
+        return [position if position < count and keys[position] == val else -1
+                for position, val in zip(positions, values)]
+
+    def contains_many(self, values):
+        """
+        Проверяет пачку значений и возвращает массив флагов наличия
+        (numpy.ndarray bool с NumPy, иначе список bool) в порядке входа.
+        """
+        positions = self.search_many(values)
+        if np is not None:
+            return positions >= 0
+        return [position >= 0 for position in positions]
@@ -0,0 +1,169 @@
+import copy
+from AVLNode import Node
+from AVLTree import AVLTree
+from TreeStats import TreeStats
+
+class PersistentAVLTree(AVLTree):
+    """
+    Персистентное AVL-дерево с копированием пути (path copying).
+
+    Ни одна операция не меняет уже существующие узлы: перед изменением
+    копируются только узлы на пути от корня к месту вставки или удаления
+    (O(log n) штук) и узлы, участвующие в поворотах. Остальные поддеревья
+    общие у старой и новой версии дерева.
+
+    Поэтому snapshot() стоит O(1): снимок просто запоминает текущий корень.
+    Читатели снимка не блокируют писателей и видят неизменное состояние,
+    а старые версии освобождаются сборщиком мусора, когда на них не остаётся ссылок.
+    Новая версия публикуется одним присваиванием self.root, уже после того,
+    как все её узлы построены.
+    """
+
+    persistent = True
+
+    def snapshot(self) -> 'PersistentAVLTree':
+        """
+        Возвращает независимую версию дерева за O(1).
+        Дальнейшие изменения исходного дерева не видны в снимке и наоборот.
+        Статистика исходного дерева на снимок не переносится.
+        """
+        snapshot = copy.copy(self)
+        if self._stats is not None:
+            TreeStats.remove_wrappers(snapshot)
+            snapshot._stats = None
+        return snapshot
+
+    # =======================
+    # Копирование узлов
+    # =======================
+
+    def _copy(self, node: Node) -> Node:
+        """
+        Возвращает копию узла с теми же потомками, высотой и размером.
+        """
+        new_node = Node(node.val)
+        new_node.height = node.height
+        new_node.size = node.size
+        new_node.left = node.left
+        new_node.right = node.right
+        return new_node
+
+    def _copy_path(self, root: Node, val: int, to_successor: bool) -> Node:
+        """
+        Копирует узлы на пути поиска val от корня root и возвращает корень копии.
+        При to_successor=True и найденном узле с двумя потомками копируется
+        и путь до его преемника: его затронет удаление.
+        """
+        new_root = parent = None
+        went_left = False
+        node = root
+        while node:
+            new_node = self._copy(node)
+            if parent is None:
+                new_root = new_node
+            elif went_left:
+                parent.left = new_node
+            else:
+                parent.right = new_node
+            parent = new_node
+
+            if val < node.val:
+                went_left, node = True, node.left
+            elif val > node.val:
+                went_left, node = False, node.right
+            else:
+                if to_successor and node.left and node.right:
+                    parent.right = child = self._copy(node.right)
+                    while child.left:
+                        child.left = self._copy(child.left)
+                        child = child.left
+                break
+
+        return new_root
+
+    def _copy_spine(self, root: Node, go_left: bool, min_height: int = 0) -> Node:
+        """
+        Копирует левый (go_left=True) или правый край поддерева,
+        пока высота узлов больше min_height. Возвращает корень копии.
+        """
+        if self.get_height(root) <= min_height:
+            return root
+
+        new_root = parent = self._copy(root)
+        while True:
+            child = parent.left if go_left else parent.right
+            if self.get_height(child) <= min_height:
+                return new_root
+            child = self._copy(child)
+            if go_left:
+                parent.left = child
+            else:
+                parent.right = child
+            parent = child
+
+    # =======================
+    # Повороты
+    # =======================
+
+    def rotate_right(self, root: Node) -> Node:
+        """
+        Правый поворот над копиями узлов: исходные узлы могут принадлежать другим версиям.
+        """
+        root = self._copy(root)
+        root.left = self._copy(root.left)
+        return super().rotate_right(root)
+
+    def rotate_left(self, root: Node) -> Node:
+        """
+        Левый поворот над копиями узлов: исходные узлы могут принадлежать другим версиям.
+        """
+        root = self._copy(root)
+        root.right = self._copy(root.right)
+        return super().rotate_left(root)
+
+    # =======================
+    # Вставка, удаление, соединение
+    # =======================
+
+    def _insert(self, node: Node, val: int) -> Node:
+        """
+        Вставка с копированием пути. Исходное поддерево node не меняется.
+        """
+        if not node or self._search(node, val):
+            return super()._insert(node, val)
+        return super()._insert(self._copy_path(node, val, False), val)
+
+    def _delete(self, node: Node, val: int) -> Node:
+        """
+        Удаление с копированием пути. Исходное поддерево node не меняется.
+        """
+        if not self._search(node, val):
+            return node
+        return super()._delete(self._copy_path(node, val, True), val)
+
+    def _pop_min_node(self) -> Node:
+        """
+        Отрезает минимальный узел, предварительно скопировав левый край дерева.
+        """
+        self._root = self._copy_spine(self._root, True)
+        return super()._pop_min_node()
+
+    def _pop_max_node(self) -> Node:
+        """
+        Отрезает максимальный узел, предварительно скопировав правый край дерева.
+        """
+        self._root = self._copy_spine(self._root, False)
+        return super()._pop_max_node()
+
+    def join(self, left_tree: Node, node: Node, right_tree: Node) -> Node:
+        """
+        Соединение через узел node: копируются сам node и край более высокого
+        поддерева, вдоль которого идёт спуск. Исходные поддеревья не меняются.
+        """
+        left_height = self.get_height(left_tree)
+        right_height = self.get_height(right_tree)
+        if left_height > right_height + 1:
+            left_tree = self._copy_spine(left_tree, False, right_height + 1)
+        elif right_height > left_height + 1:
+            right_tree = self._copy_spine(right_tree, True, left_height + 1)
+        return super().join(left_tree, self._copy(node), right_tree)
@@ -0,0 +1,356 @@
+from operator import attrgetter
+from AVLNode import Node
+from AVLTree import AVLTree
+
+class MapNode(Node):
+    __slots__ = ('key', 'value')
+
+    def __init__(self, sort_key, key, value):
+        """
+        Узел отсортированного словаря.
+
+        :param sort_key: Ключ сравнения, хранится в поле val и определяет порядок.
+        :param key: Исходный ключ (совпадает с sort_key, если функция ключа не задана).
+        :param value: Значение, привязанное к ключу.
+        """
+        super().__init__(sort_key)
+        self.key = key
+        self.value = value
+
+class SortedMap(AVLTree):
+    """
+    Отсортированный словарь «ключ → значение» поверх AVL-дерева.
+
+    Ключи — любые попарно сравнимые объекты. Если задана функция key,
+    порядок определяется по key(ключ), а исходный ключ хранится рядом.
+    Значение лежит прямо в узле, поэтому чтение по ключу — один спуск
+    без параллельного словаря.
+    """
+
+    def __init__(self, items=None, key=None):
+        """
+        Инициализация словаря.
+        items: необязательный набор пар (ключ, значение) или словарь.
+        key: необязательная функция, задающая порядок ключей.
+        """
+        super().__init__()
+        self._key = key
+        if items:
+            self.insert_many(items.items() if hasattr(items, 'items') else items)
+
+    def _sort_key(self, key):
+        """
+        Возвращает ключ сравнения для исходного ключа.
+        """
+        return key if self._key is None else self._key(key)
+
+    def _new_node(self, val, key, value) -> MapNode:
+        """
+        Создаёт лист словаря. Наследники могут подменить тип узла.
+        """
+        return MapNode(val, key, value)
+
+    def _find_node(self, key) -> MapNode:
+        """
+        Возвращает узел с заданным ключом или None.
+        """
+        val = self._sort_key(key)
+        node = self.root
+        while node:
+            if val < node.val:
+                node = node.left
+            elif node.val < val:
+                node = node.right
+            else:
+                return node
+        return None
+
+    # =======================
+    # Операции поиска, вставки, удаления
+    # =======================
+
+    def insert(self, key, value=None) -> None:
+        """
+        Вставка пары ключ-значение. Если ключ уже есть, его значение обновляется.
+        """
+        val = self._sort_key(key)
+        if not self._root:
+            self._root = self._new_node(val, key, value)
+            self._after_insert(val)
+            return
+
+        path = []
+        node = self.root
+        while node:
+            path.append(node)
+            if val < node.val:
+                node = node.left
+            elif node.val < val:
+                node = node.right
+            else:
+                node.value = value
+                return
+
+        parent = path[-1]
+        if val < parent.val:
+            parent.left = self._new_node(val, key, value)
+        else:
+            parent.right = self._new_node(val, key, value)
+        self._root = self._rebalance_path(self._root, path)
+        self._after_insert(val)
+
+    def search(self, key) -> bool:
+        """
+        Возвращает True, если ключ есть в словаре, иначе False.
+        """
+        return self._find_node(key) is not None
+
+    def __contains__(self, key) -> bool:
+        """
+        Проверка наличия ключа: key in sorted_map (через search, как в AVLTree).
+        """
+        return self.search(key)
+
+    def get(self, key, default=None):
+        """
+        Возвращает значение по ключу или default, если ключа нет.
+        """
+        node = self._find_node(key)
+        return node.value if node else default
+
+    def __getitem__(self, key):
+        """
+        Возвращает значение по ключу; если ключа нет, вызывает KeyError.
+        """
+        node = self._find_node(key)
+        if node is None:
+            raise KeyError(key)
+        return node.value
+
+    def __setitem__(self, key, value) -> None:
+        """
+        Вставка или обновление: sorted_map[key] = value.
+        """
+        self.insert(key, value)
+
+    def delete(self, key) -> None:
+        """
+        Удаление ключа. Если ключ не найден, ничего не происходит.
+        """
+        val = self._sort_key(key)
+        self._root = self._delete(self._root, val)
+        self._after_delete(val)
+
+    def __delitem__(self, key) -> None:
+        """
+        Удаление ключа; если ключа нет, вызывает KeyError.
+        """
+        if self._find_node(key) is None:
+            raise KeyError(key)
+        self.delete(key)
+
+    def pop(self, key, *default):
+        """
+        Удаляет ключ и возвращает его значение.
+        Если ключа нет, возвращает default, а без него вызывает KeyError.
+        """
+        node = self._find_node(key)
+        if node is None:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        self.delete(key)
+        return node.value
+
+    # =======================
+    # Соседние ключи
+    # =======================
+
+    @staticmethod
+    def _item(node: MapNode):
+        """
+        Превращает узел в пару (ключ, значение); для None возвращает None.
+        """
+        return (node.key, node.value) if node else None
+
+    def floor(self, key):
+        """
+        Возвращает пару с наибольшим ключом, не большим key, или None.
+        """
+        return self._item(self._floor_node(self._sort_key(key)))
+
+    def ceiling(self, key):
+        """
+        Возвращает пару с наименьшим ключом, не меньшим key, или None.
+        """
+        return self._item(self._ceiling_node(self._sort_key(key)))
+
+    def predecessor(self, key):
+        """
+        Возвращает пару с наибольшим ключом, строго меньшим key, или None.
+        """
+        return self._item(self._floor_node(self._sort_key(key), False))
+
+    def successor(self, key):
+        """
+        Возвращает пару с наименьшим ключом, строго большим key, или None.
+        """
+        return self._item(self._ceiling_node(self._sort_key(key), False))
+
+    def peek_min(self):
+        """
+        Возвращает пару с наименьшим ключом за O(1).
+        Для пустого словаря вызывает KeyError.
+        """
+        node = self._extreme_nodes()[0]
+        if node is None:
+            raise KeyError('peek_min из пустого словаря')
+        return node.key, node.value
+
+    def peek_max(self):
+        """
+        Возвращает пару с наибольшим ключом за O(1).
+        Для пустого словаря вызывает KeyError.
+        """
+        node = self._extreme_nodes()[1]
+        if node is None:
+            raise KeyError('peek_max из пустого словаря')
+        return node.key, node.value
+
+    def pop_min_many(self, k: int) -> list:
+        """
+        Удаляет и возвращает k пар с наименьшими ключами по возрастанию.
+        """
+        return [(node.key, node.value) for node in self._pop_min_nodes(k)]
+
+    def pop_min(self):
+        """
+        Удаляет и возвращает пару с наименьшим ключом за один спуск.
+        Для пустого словаря вызывает KeyError.
+        """
+        node = self._pop_min_node()
+        if node is None:
+            raise KeyError('pop_min из пустого словаря')
+        return node.key, node.value
+
+    def pop_max(self):
+        """
+        Удаляет и возвращает пару с наибольшим ключом за один спуск.
+        Для пустого словаря вызывает KeyError.
+        """
+        node = self._pop_max_node()
+        if node is None:
+            raise KeyError('pop_max из пустого словаря')
+        return node.key, node.value
+
+    def select(self, k: int):
+        """
+        Возвращает k-й по возрастанию ключ (нумерация с нуля).
+        """
+        return self._select_node(k).key
+
+    def rank(self, key) -> int:
+        """
+        Возвращает количество ключей, строго меньших key.
+        """
+        return self._rank(self._sort_key(key), False)
+
+    def count_range(self, lo, hi) -> int:
+        """
+        Возвращает количество ключей в отрезке [lo, hi].
+        """
+        return super().count_range(self._sort_key(lo), self._sort_key(hi))
+
+    # =======================
+    # Обходы
+    # =======================
+
+    def __iter__(self):
+        """
+        Лениво перечисляет ключи по возрастанию.
+        """
+        return map(attrgetter('key'), self._iter_nodes())
+
+    def __reversed__(self):
+        """
+        Лениво перечисляет ключи по убыванию.
+        """
+        return map(attrgetter('key'), self._iter_nodes(reverse=True))
+
+    def irange(self, lo=None, hi=None, inclusive: tuple = (True, True), reverse: bool = False):
+        """
+        Лениво перечисляет ключи из диапазона между lo и hi (см. AVLTree.irange).
+        """
+        lo = None if lo is None else self._sort_key(lo)
+        hi = None if hi is None else self._sort_key(hi)
+        return map(attrgetter('key'), self._iter_nodes(lo, hi, inclusive, reverse))
+
+    def keys(self) -> list:
+        """
+        Возвращает список ключей по возрастанию.
+        """
+        return list(self)
+
+    def values(self) -> list:
+        """
+        Возвращает список значений в порядке возрастания ключей.
+        """
+        return [node.value for node in self._iter_nodes()]
+
+    def items(self) -> list:
+        """
+        Возвращает список пар (ключ, значение) по возрастанию ключей.
+        """
+        return [(node.key, node.value) for node in self._iter_nodes()]
+
+    def inorder_traversal(self) -> list:
+        """
+        Возвращает список ключей по возрастанию.
+        """
+        return self.keys()
+
+    def level_order(self):
+        """
+        Лениво перечисляет ключи по уровням (обход в ширину).
+        """
+        return map(attrgetter('key'), self._iter_level_nodes())
+
+    # =======================
+    # Массовая загрузка
+    # =======================
+
+    def insert_many(self, items) -> None:
+        """
+        Вставляет набор пар (ключ, значение). При повторе ключа побеждает
+        последняя пара. В пустой словарь пачка загружается за O(n log n)
+        одной сортировкой и построением дерева без поворотов.
+        """
+        if self.root:
+            for key, value in items:
+                self.insert(key, value)
+            return
+
+        # Устойчивая сортировка сохраняет порядок повторов, берём последний
+        entries = sorted(((self._sort_key(key), key, value) for key, value in items),
+                         key=lambda entry: entry[0])
+        unique = []
+        for entry in entries:
+            if unique and not unique[-1][0] < entry[0]:
+                unique[-1] = entry
+            else:
+                unique.append(entry)
+        self.root = self._build_items(unique, 0, len(unique))
+
+    def _build_items(self, entries: list, lo: int, hi: int) -> MapNode:
+        """
+        Строит сбалансированное поддерево из отсортированного отрезка entries[lo:hi].
+        """
+        if lo >= hi:
+            return None
+
+        mid = lo + (hi - lo) // 2
+        node = self._new_node(*entries[mid])
+        node.left = self._build_items(entries, lo, mid)
+        node.right = self._build_items(entries, mid + 1, hi)
+        self.update_height(node)
+        return node
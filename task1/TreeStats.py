@@ -0,0 +1,171 @@
+import time
+from collections import Counter
+
+class TreeStats:
+    """
+    Статистика работы AVL-дерева, включаемая по требованию.
+
+    Пока сбор выключен, дерево не делает ни одной лишней проверки: при
+    включении замеряемые методы подменяются обёртками на уровне экземпляра
+    (атрибут экземпляра закрывает метод класса), а при выключении эти
+    атрибуты удаляются и вызовы снова идут прямо в методы класса.
+
+    Собирается:
+    - число поворотов каждого вида;
+    - гистограмма длины пути поиска — число пройденных узлов при каждом
+      публичном поиске search или in (in вызывает search); внутренние
+      поиски дерева, например в issubset или вставке PersistentAVLTree, не учитываются;
+    - число вызовов и суммарное время операций из TIMED_OPERATIONS;
+      после каждой из них вызывается hook(имя операции, время в нс), если он задан;
+    - гистограмма глубин узлов — её считает as_dict обходом дерева за O(n).
+    """
+
+    ROTATIONS = ('rotate_right', 'rotate_left', 'left_right_rotate', 'right_left_rotate')
+    TIMED_OPERATIONS = ('insert', 'delete', 'search', 'pop_min', 'pop_max', 'insert_many')
+
+    def __init__(self, tree, hook=None):
+        """
+        tree: дерево, за которым ведётся статистика.
+        hook: необязательная функция hook(операция, время в нс).
+        """
+        self.tree = tree
+        self.hook = hook
+        self.enabled = False
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Обнуляет накопленные счётчики.
+        """
+        self.rotations = Counter()
+        self.search_depths = Counter()
+        self.calls = Counter()
+        self.total_ns = Counter()
+
+    # =======================
+    # Подключение обёрток
+    # =======================
+
+    def enable(self) -> None:
+        """
+        Подключает обёртки к дереву.
+        """
+        if self.enabled:
+            return
+        wrappers = {name: self._count_rotation(name, getattr(self.tree, name)) for name in self.ROTATIONS}
+        wrappers.update((name, self._time_operation(name, getattr(self.tree, name)))
+                        for name in self.TIMED_OPERATIONS if name != 'search')
+        wrappers['search'] = self._time_operation('search', self._measured_search)
+        vars(self.tree).update(wrappers)
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Отключает обёртки; накопленные счётчики сохраняются.
+        """
+        self.remove_wrappers(self.tree)
+        self.enabled = False
+
+    @classmethod
+    def remove_wrappers(cls, tree) -> None:
+        """
+        Удаляет обёртки из атрибутов экземпляра tree (например, из копии дерева).
+        """
+        attributes = vars(tree)
+        for name in (*cls.ROTATIONS, *cls.TIMED_OPERATIONS):
+            attributes.pop(name, None)
+
+    def _count_rotation(self, name: str, rotate):
+        rotations = self.rotations
+
+        def wrapper(node):
+            rotations[name] += 1
+            return rotate(node)
+        return wrapper
+
+    def _time_operation(self, name: str, operation):
+        calls, total_ns, clock = self.calls, self.total_ns, time.perf_counter_ns
+
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return operation(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                calls[name] += 1
+                total_ns[name] += elapsed
+                if self.hook is not None:
+                    self.hook(name, elapsed)
+        return wrapper
+
+    def _measured_search(self, val) -> bool:
+        """
+        Поиск как в AVLTree.search, но с подсчётом пройденных узлов.
+        У SortedMap значение сначала переводится в ключ сортировки.
+        """
+        sort_key = getattr(self.tree, '_sort_key', None)
+        if sort_key is not None:
+            val = sort_key(val)
+        node = self.tree.root
+        depth = 0
+        found = False
+        while node:
+            depth += 1
+            if val < node.val:
+                node = node.left
+            elif node.val < val:
+                node = node.right
+            else:
+                found = True
+                break
+        self.search_depths[depth] += 1
+        return found
+
+    # =======================
+    # Выгрузка
+    # =======================
+
+    def node_depths(self) -> Counter:
+        """
+        Возвращает гистограмму глубин узлов дерева (корень — глубина 1).
+        """
+        depths = Counter()
+        stack = [(self.tree.root, 1)] if self.tree.root else []
+        while stack:
+            node, depth = stack.pop()
+            depths[depth] += 1
+            if node.left:
+                stack.append((node.left, depth + 1))
+            if node.right:
+                stack.append((node.right, depth + 1))
+        return depths
+
+    def as_dict(self) -> dict:
+        """
+        Возвращает статистику обычным словарем из чисел, строк и вложенных словарей.
+        Одинарные повороты, выполненные в составе двойных, в single_* не входят.
+        """
+        rotations = self.rotations
+        double = rotations['left_right_rotate'] + rotations['right_left_rotate']
+        operations = {
+            name: {
+                'calls': self.calls[name],
+                'total_ns': self.total_ns[name],
+                'mean_ns': self.total_ns[name] / self.calls[name],
+            }
+            for name in self.TIMED_OPERATIONS if self.calls[name]
+        }
+        return {
+            'enabled': self.enabled,
+            'size': len(self.tree),
+            'height': self.tree.get_height(self.tree.root),
+            'rotations': {
+                'single_right': rotations['rotate_right'] - double,
+                'single_left': rotations['rotate_left'] - double,
+                'left_right': rotations['left_right_rotate'],
+                'right_left': rotations['right_left_rotate'],
+            },
+            'search_depth_histogram': dict(sorted(self.search_depths.items())),
+            'node_depth_histogram': dict(sorted(self.node_depths().items())),
+            'operations': operations,
+        }
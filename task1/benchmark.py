@@ -0,0 +1,119 @@
+"""
+Замеры AVL-дерева.
+
+Запуск:
+    python benchmark.py memory                       # байт на ключ при 1M и 10M ключей
+    python benchmark.py memory --sizes 100000 1000000
+    python benchmark.py concurrency --threads 1 2 4 8  # пропускная способность по числу потоков
+"""
+import argparse
+import gc
+import random
+import threading
+import time
+import tracemalloc
+from AVLTree import AVLTree
+from BTree import BTree
+from CompactAVLTree import CompactAVLTree
+from ConcurrentAVLTree import ConcurrentAVLTree
+
+# =======================
+# Память
+# =======================
+
+MEMORY_ENGINES = {
+    'AVLTree (Node со __slots__)': AVLTree,
+    'CompactAVLTree (массивы)': CompactAVLTree,
+    'BTree (B+-дерево, order=64)': BTree,
+}
+
+def measure_memory(engine, size: int) -> float:
+    """
+    Строит дерево из size ключей и возвращает число байт на ключ
+    (узлы, служебные массивы и сами объекты ключей), по данным tracemalloc.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tree = engine.from_sorted(range(1, size + 1))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(tree) == size
+    return (after - before) / size
+
+def run_memory(sizes: list) -> None:
+    """
+    Печатает таблицу «движок × размер → байт на ключ».
+    """
+    print(f"{'движок':<32}" + ''.join(f'{size:>14,}' for size in sizes))
+    for name, engine in MEMORY_ENGINES.items():
+        row = ''.join(f'{measure_memory(engine, size):>14.1f}' for size in sizes)
+        print(f'{name:<32}' + row)
+
+# =======================
+# Многопоточность
+# =======================
+
+def measure_throughput(threads: int, size: int, ops: int, read_ratio: float) -> float:
+    """
+    Запускает threads потоков над общим ConcurrentAVLTree из size ключей;
+    каждый поток делает ops операций (доля чтений — read_ratio).
+    Возвращает суммарное число операций в секунду.
+    """
+    tree = ConcurrentAVLTree(AVLTree.from_sorted(range(1, size + 1)))
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        keys = [rng.randint(1, 2 * size) for _ in range(ops)]
+        reads = [rng.random() < read_ratio for _ in range(ops)]
+        barrier.wait()
+        for key, is_read in zip(keys, reads):
+            if is_read:
+                tree.search(key)
+            elif key & 1:
+                tree.insert(key)
+            else:
+                tree.delete(key)
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    assert tree.validate()
+    return threads * ops / elapsed
+
+def run_concurrency(thread_counts: list, size: int, ops: int, read_ratio: float) -> None:
+    """
+    Печатает пропускную способность для каждого числа потоков.
+    """
+    print(f"{'потоков':>8}{'оп/с':>14}")
+    for threads in thread_counts:
+        print(f'{threads:>8}{measure_throughput(threads, size, ops, read_ratio):>14,.0f}')
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Замеры AVL-дерева')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    memory = commands.add_parser('memory', help='байт на ключ')
+    memory.add_argument('--sizes', type=int, nargs='+', default=[1_000_000, 10_000_000])
+
+    concurrency = commands.add_parser('concurrency', help='пропускная способность по числу потоков')
+    concurrency.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    concurrency.add_argument('--size', type=int, default=100_000)
+    concurrency.add_argument('--ops', type=int, default=20_000, help='операций на поток')
+    concurrency.add_argument('--read-ratio', type=float, default=0.9)
+
+    args = parser.parse_args()
+    if args.command == 'memory':
+        run_memory(args.sizes)
+    elif args.command == 'concurrency':
+        run_concurrency(args.threads, args.size, args.ops, args.read_ratio)
+
+if __name__ == '__main__':
+    main()
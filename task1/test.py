@@ -1,168 +1,915 @@
-import pytest
-from AVLTree import AVLTree
-from AVLNode import Node
-
-@pytest.fixture
-def avl_tree():
-    return AVLTree()
-
-def test_get_height(avl_tree):
-    # Тест для пустого дерева
-    assert avl_tree.get_height(None) == 0
-
-    # Тест для дерева с одним узлом
-    root = Node(10)
-    assert avl_tree.get_height(root) == 1
-    # Тест для дерева с несколькими уровнями
-    root.left = Node(5)
-    root.right = Node(15)
-    avl_tree.update_height(root)
-    assert avl_tree.get_height(root) == 2
-
-def test_update_height(avl_tree):
-    root = Node(10)
-    root.left = Node(5)
-    root.right = Node(15)
-    avl_tree.update_height(root)
-    assert root.height == 2
-
-def test_get_balance(avl_tree):
-    root = Node(10)
-    root.left = Node(5)
-    root.right = Node(15)
-
-    avl_tree.update_height(root.left)
-    avl_tree.update_height(root.right)
-    avl_tree.update_height(root)
-
-    assert avl_tree.get_balance(root) == 0
-
-    root.left.left = Node(2)
-
-    avl_tree.update_height(root.left.left)
-    avl_tree.update_height(root.left)
-    avl_tree.update_height(root)
-
-    assert avl_tree.get_balance(root) == 1
-
-def test_rotate_right(avl_tree):
-    root = Node(10)
-    root.left = Node(5)
-    root.left.left = Node(2)
-    new_root = avl_tree.rotate_right(root)
-    assert new_root.val == 5
-    assert new_root.right.val == 10
-    assert new_root.left.val == 2
-
-def test_rotate_left(avl_tree):
-    root = Node(10)
-    root.right = Node(15)
-    root.right.right = Node(20)
-    new_root = avl_tree.rotate_left(root)
-    assert new_root.val == 15
-    assert new_root.left.val == 10
-    assert new_root.right.val == 20
-
-def test_insert(avl_tree):
-    avl_tree.insert(10)
-    assert avl_tree.root.val == 10
-
-    avl_tree.insert(5)
-    assert avl_tree.root.left.val == 5
-
-    avl_tree.insert(15)
-    assert avl_tree.root.right.val == 15
-
-    avl_tree.insert(2)
-    avl_tree.insert(1)
-    assert avl_tree.root.val == 10
-    assert avl_tree.root.left.val == 2
-    assert avl_tree.root.right.val == 15
-
-def test_delete(avl_tree):
-    avl_tree.insert(10)
-    avl_tree.insert(5)
-    avl_tree.insert(15)
-    avl_tree.insert(2)
-    avl_tree.insert(7)
-
-    avl_tree.delete(5)
-    assert avl_tree.root.left.val == 7
-
-    avl_tree.delete(10)
-    assert avl_tree.root.val == 7
-
-def test_merge(avl_tree):
-    left_tree = Node(5)
-    left_tree.left = Node(2)
-    left_tree.right = Node(7)
-
-    right_tree = Node(15)
-    right_tree.left = Node(12)
-    right_tree.right = Node(20)
-
-    merged_root = avl_tree.merge(left_tree, right_tree)
-    assert merged_root.val == 12
-    assert merged_root.left.val == 5
-    assert merged_root.right.val == 15
-
-def test_split(avl_tree):
-    root = Node(10)
-    root.left = Node(5)
-    root.right = Node(15)
-    root.left.left = Node(2)
-    root.left.right = Node(7)
-    root.right.left = Node(12)
-    root.right.right = Node(20)
-
-    left_tree, right_tree = avl_tree.split(root, 10)
-    assert left_tree.val == 7
-    assert right_tree.val == 15
-
-def test_build_avl(avl_tree):
-    arr = [1, 2, 3, 4, 5, 6, 7]
-    root = avl_tree.build_avl(arr)
-    assert root.val == 4
-    assert root.left.val == 2
-    assert root.right.val == 6
-
-def test_count_nodes(avl_tree):
-    assert avl_tree.count_nodes() == 0
-
-    avl_tree.insert(10)
-    avl_tree.insert(5)
-    avl_tree.insert(15)
-    assert avl_tree.count_nodes() == 3
-
-def test_inorder_traversal(avl_tree):
-    avl_tree.insert(10)
-    avl_tree.insert(5)
-    avl_tree.insert(15)
-    assert avl_tree.inorder_traversal() == [5, 10, 15]
-
-def test_bfs(avl_tree):
-    avl_tree.insert(10)
-    avl_tree.insert(5)
-    avl_tree.insert(15)
-    avl_tree.insert(2)
-    avl_tree.insert(7)
-    assert avl_tree.bfs() == [10, 5, 15, 2, 7]
-
-def test_validate_avl(avl_tree):
-    root = Node(10)
-    root.left = Node(5)
-    root.right = Node(15)
-    avl_tree.update_height(root.left)
-    avl_tree.update_height(root.right)
-    avl_tree.update_height(root)
-
-    assert avl_tree.validate_avl(root) == True
-
-    root.left.left = Node(2)
-    root.left.left.left = Node(1)
-    avl_tree.update_height(root.left.left.left)
-    avl_tree.update_height(root.left.left)
-    avl_tree.update_height(root.left)
-    avl_tree.update_height(root)
-    
-    assert avl_tree.validate_avl(root) == False
+import io
+import random
+import threading
+import pytest
+from AVLTree import AVLTree
+from AVLNode import Node
+from AggregateMap import AggregateMap, Monoid, SUM, COUNT, MIN, MAX
+from BTree import BTree
+from CompactAVLTree import CompactAVLTree
+from ConcurrentAVLTree import ConcurrentAVLTree
+from DrawTree import write_dot
+from FrozenAVLTree import FrozenAVLTree
+from PersistentAVLTree import PersistentAVLTree
+from SortedMap import SortedMap
+
+@pytest.fixture
+def avl_tree():
+    return AVLTree()
+
+def _random_set_operations(trees, seed, steps, max_val, insert_share=0.6):
+    """
+    Случайно вставляет и удаляет значения от 1 до max_val во всех деревьях
+    trees и в множестве-образце, после каждого шага сверяя search с образцом.
+    Возвращает образец.
+    """
+    rng = random.Random(seed)
+    expected = set()
+    for _ in range(steps):
+        val = rng.randint(1, max_val)
+        if rng.random() < insert_share:
+            for tree in trees:
+                tree.insert(val)
+            expected.add(val)
+        else:
+            for tree in trees:
+                tree.delete(val)
+            expected.discard(val)
+        for tree in trees:
+            assert tree.search(val) == (val in expected)
+    return expected
+
+def test_get_height(avl_tree):
+    # Тест для пустого дерева
+    assert avl_tree.get_height(None) == 0
+
+    # Тест для дерева с одним узлом
+    root = Node(10)
+    assert avl_tree.get_height(root) == 1
+    # Тест для дерева с несколькими уровнями
+    root.left = Node(5)
+    root.right = Node(15)
+    avl_tree.update_height(root)
+    assert avl_tree.get_height(root) == 2
+
+def test_update_height(avl_tree):
+    root = Node(10)
+    root.left = Node(5)
+    root.right = Node(15)
+    avl_tree.update_height(root)
+    assert root.height == 2
+
+def test_get_balance(avl_tree):
+    root = Node(10)
+    root.left = Node(5)
+    root.right = Node(15)
+
+    avl_tree.update_height(root.left)
+    avl_tree.update_height(root.right)
+    avl_tree.update_height(root)
+
+    assert avl_tree.get_balance(root) == 0
+
+    root.left.left = Node(2)
+
+    avl_tree.update_height(root.left.left)
+    avl_tree.update_height(root.left)
+    avl_tree.update_height(root)
+
+    assert avl_tree.get_balance(root) == 1
+
+def test_rotate_right(avl_tree):
+    root = Node(10)
+    root.left = Node(5)
+    root.left.left = Node(2)
+    new_root = avl_tree.rotate_right(root)
+    assert new_root.val == 5
+    assert new_root.right.val == 10
+    assert new_root.left.val == 2
+
+def test_rotate_left(avl_tree):
+    root = Node(10)
+    root.right = Node(15)
+    root.right.right = Node(20)
+    new_root = avl_tree.rotate_left(root)
+    assert new_root.val == 15
+    assert new_root.left.val == 10
+    assert new_root.right.val == 20
+
+def test_insert(avl_tree):
+    avl_tree.insert(10)
+    assert avl_tree.root.val == 10
+
+    avl_tree.insert(5)
+    assert avl_tree.root.left.val == 5
+
+    avl_tree.insert(15)
+    assert avl_tree.root.right.val == 15
+
+    avl_tree.insert(2)
+    avl_tree.insert(1)
+    assert avl_tree.root.val == 10
+    assert avl_tree.root.left.val == 2
+    assert avl_tree.root.right.val == 15
+
+def test_delete(avl_tree):
+    avl_tree.insert(10)
+    avl_tree.insert(5)
+    avl_tree.insert(15)
+    avl_tree.insert(2)
+    avl_tree.insert(7)
+
+    avl_tree.delete(5)
+    assert avl_tree.root.left.val == 7
+
+    avl_tree.delete(10)
+    assert avl_tree.root.val == 7
+
+def test_merge(avl_tree):
+    left_tree = Node(5)
+    left_tree.left = Node(2)
+    left_tree.right = Node(7)
+
+    right_tree = Node(15)
+    right_tree.left = Node(12)
+    right_tree.right = Node(20)
+
+    merged_root = avl_tree.merge(left_tree, right_tree)
+    assert merged_root.val == 12
+    assert merged_root.left.val == 5
+    assert merged_root.right.val == 15
+
+def test_split(avl_tree):
+    root = Node(10)
+    root.left = Node(5)
+    root.right = Node(15)
+    root.left.left = Node(2)
+    root.left.right = Node(7)
+    root.right.left = Node(12)
+    root.right.right = Node(20)
+
+    left_tree, right_tree = avl_tree.split(root, 10)
+    left_values, right_values = [], []
+    avl_tree._inorder_traversal(left_tree, left_values)
+    avl_tree._inorder_traversal(right_tree, right_values)
+    assert left_values == [2, 5, 7, 10]
+    assert right_values == [12, 15, 20]
+    assert right_tree.val == 15
+    assert avl_tree.validate_avl(left_tree) == True
+
+def test_build_avl(avl_tree):
+    arr = [1, 2, 3, 4, 5, 6, 7]
+    root = avl_tree.build_avl(arr)
+    assert root.val == 4
+    assert root.left.val == 2
+    assert root.right.val == 6
+
+def test_count_nodes(avl_tree):
+    assert avl_tree.count_nodes() == 0
+
+    avl_tree.insert(10)
+    avl_tree.insert(5)
+    avl_tree.insert(15)
+    assert avl_tree.count_nodes() == 3
+
+def test_inorder_traversal(avl_tree):
+    avl_tree.insert(10)
+    avl_tree.insert(5)
+    avl_tree.insert(15)
+    assert avl_tree.inorder_traversal() == [5, 10, 15]
+
+def test_bfs(avl_tree):
+    avl_tree.insert(10)
+    avl_tree.insert(5)
+    avl_tree.insert(15)
+    avl_tree.insert(2)
+    avl_tree.insert(7)
+    assert avl_tree.bfs() == [10, 5, 15, 2, 7]
+
+def test_validate_avl(avl_tree):
+    root = Node(10)
+    root.left = Node(5)
+    root.right = Node(15)
+    avl_tree.update_height(root.left)
+    avl_tree.update_height(root.right)
+    avl_tree.update_height(root)
+
+    assert avl_tree.validate_avl(root) == True
+
+    root.left.left = Node(2)
+    root.left.left.left = Node(1)
+    avl_tree.update_height(root.left.left.left)
+    avl_tree.update_height(root.left.left)
+    avl_tree.update_height(root.left)
+    avl_tree.update_height(root)
+    
+    assert avl_tree.validate_avl(root) == False
+
+def test_random_operations_match_set(avl_tree):
+    expected = _random_set_operations([avl_tree], seed=1, steps=3000, max_val=500)
+
+    assert avl_tree.inorder_traversal() == sorted(expected)
+    assert avl_tree.count_nodes() == len(expected)
+    assert avl_tree.validate_avl(avl_tree.root) == True
+
+def test_delete_keeps_heights(avl_tree):
+    for val in range(1, 64):
+        avl_tree.insert(val)
+    for val in range(1, 64, 2):
+        avl_tree.delete(val)
+
+    stack = [avl_tree.root]
+    while stack:
+        node = stack.pop()
+        if node:
+            assert node.height == 1 + max(avl_tree.get_height(node.left), avl_tree.get_height(node.right))
+            stack.extend((node.left, node.right))
+
+def test_from_sorted():
+    tree = AVLTree.from_sorted(val for val in range(1, 1001))
+    assert tree.inorder_traversal() == list(range(1, 1001))
+    assert tree.validate_avl(tree.root) == True
+
+    tree = AVLTree.from_sorted([5, 3, 9, 3, 1])
+    assert tree.inorder_traversal() == [1, 3, 5, 9]
+
+    with pytest.raises(ValueError):
+        AVLTree.from_sorted([0, 1, 2])
+
+def test_insert_many(avl_tree):
+    for val in range(1, 100, 3):
+        avl_tree.insert(val)
+
+    avl_tree.insert_many(range(50, 500))
+    assert avl_tree.inorder_traversal() == sorted(set(range(1, 100, 3)) | set(range(50, 500)))
+    assert avl_tree.validate_avl(avl_tree.root) == True
+
+    avl_tree.insert_many([1000, 2])
+    assert avl_tree.search(1000) and avl_tree.search(2)
+
+def test_split_and_join_large(avl_tree):
+    rng = random.Random(3)
+    for _ in range(50):
+        values = sorted(rng.sample(range(1, 10000), rng.randint(0, 300)))
+        pivot = rng.randint(0, 10000)
+        root = avl_tree.build_avl(values)
+
+        left_tree, right_tree = avl_tree.split(root, pivot)
+        left_values, right_values = [], []
+        avl_tree._inorder_traversal(left_tree, left_values)
+        avl_tree._inorder_traversal(right_tree, right_values)
+        assert left_values == [val for val in values if val <= pivot]
+        assert right_values == [val for val in values if val > pivot]
+        assert avl_tree.validate_avl(left_tree) and avl_tree.validate_avl(right_tree)
+
+        merged = avl_tree.merge(left_tree, right_tree)
+        merged_values = []
+        avl_tree._inorder_traversal(merged, merged_values)
+        assert merged_values == values
+        assert avl_tree.validate_avl(merged) == True
+
+def test_join_different_heights(avl_tree):
+    small = avl_tree.build_avl([1, 2])
+    large = avl_tree.build_avl(range(10, 1000))
+
+    root = avl_tree.join(small, Node(5), large)
+    values = []
+    avl_tree._inorder_traversal(root, values)
+    assert values == [1, 2, 5] + list(range(10, 1000))
+    assert avl_tree.validate_avl(root) == True
+
+def test_subtree_sizes(avl_tree):
+    _random_set_operations([avl_tree], seed=7, steps=2000, max_val=300)
+
+    stack = [avl_tree.root]
+    while stack:
+        node = stack.pop()
+        if node:
+            assert node.size == 1 + avl_tree.get_size(node.left) + avl_tree.get_size(node.right)
+            stack.extend((node.left, node.right))
+    assert len(avl_tree) == avl_tree.count_nodes() == len(avl_tree.inorder_traversal())
+
+def test_rotation_keeps_sizes(avl_tree):
+    root = Node(10)
+    root.left = Node(5)
+    root.left.left = Node(2)
+    avl_tree.update_height(root.left)
+    avl_tree.update_height(root)
+    assert root.size == 3
+
+    new_root = avl_tree.rotate_right(root)
+    assert new_root.size == 3
+    assert new_root.right.size == 1
+
+def test_rank_select_count_range(avl_tree):
+    values = list(range(10, 1000, 10))
+    for val in values:
+        avl_tree.insert(val)
+
+    assert avl_tree.rank(10) == 0
+    assert avl_tree.rank(15) == 1
+    assert avl_tree.rank(5000) == len(values)
+    assert [avl_tree.select(k) for k in range(len(values))] == values
+    assert avl_tree.select(-1) == 990
+    with pytest.raises(IndexError):
+        avl_tree.select(len(values))
+
+    assert avl_tree.count_range(100, 200) == 11
+    assert avl_tree.count_range(101, 109) == 0
+    assert avl_tree.count_range(200, 100) == 0
+
+def test_iterators(avl_tree):
+    for val in [50, 20, 80, 10, 30, 70, 90]:
+        avl_tree.insert(val)
+
+    assert list(avl_tree) == [10, 20, 30, 50, 70, 80, 90]
+    assert list(reversed(avl_tree)) == [90, 80, 70, 50, 30, 20, 10]
+    assert list(avl_tree.level_order()) == avl_tree.bfs()
+    assert list(AVLTree()) == []
+
+def test_irange(avl_tree):
+    for val in range(10, 101, 10):
+        avl_tree.insert(val)
+
+    assert list(avl_tree.irange(30, 60)) == [30, 40, 50, 60]
+    assert list(avl_tree.irange(30, 60, inclusive=(False, False))) == [40, 50]
+    assert list(avl_tree.irange(25, 65, reverse=True)) == [60, 50, 40, 30]
+    assert list(avl_tree.irange(30, 60, inclusive=(False, True), reverse=True)) == [60, 50, 40]
+    assert list(avl_tree.irange(hi=20)) == [10, 20]
+    assert list(avl_tree.irange(lo=95)) == [100]
+    assert list(avl_tree.irange(61, 69)) == []
+
+    iterator = avl_tree.irange(20)
+    assert next(iterator) == 20
+    assert next(iterator) == 30
+
+def test_compact_tree_matches_avl_tree(avl_tree):
+    compact = CompactAVLTree()
+    _random_set_operations([avl_tree, compact], seed=11, steps=3000, max_val=400)
+
+    assert compact.inorder_traversal() == avl_tree.inorder_traversal()
+    assert compact.bfs() == avl_tree.bfs()
+    assert list(reversed(compact)) == list(reversed(avl_tree))
+    assert len(compact) == len(avl_tree)
+    assert compact.validate_avl() == True
+    if len(avl_tree):
+        assert compact.select(len(avl_tree) // 2) == avl_tree.select(len(avl_tree) // 2)
+        assert compact.rank(200) == avl_tree.rank(200)
+
+    assert compact.validate_avl(compact.root) == True
+    for val in range(0, 402, 7):
+        assert compact.floor(val) == avl_tree.floor(val) and compact.ceiling(val) == avl_tree.ceiling(val)
+        assert compact.predecessor(val) == avl_tree.predecessor(val)
+        assert compact.successor(val) == avl_tree.successor(val)
+        assert compact.count_range(val, val + 50) == avl_tree.count_range(val, val + 50)
+        for inclusive in ((True, True), (False, False), (True, False)):
+            for reverse in (False, True):
+                assert (list(compact.irange(val, val + 40, inclusive, reverse))
+                        == list(avl_tree.irange(val, val + 40, inclusive, reverse)))
+    assert list(compact.irange(hi=30)) == list(avl_tree.irange(hi=30))
+    assert list(compact.irange(370, reverse=True)) == list(avl_tree.irange(370, reverse=True))
+    with pytest.raises(NotImplementedError, match="split"):
+        compact.split(compact.root, 100)
+
+def test_compact_tree_reuses_free_slots():
+    compact = CompactAVLTree.from_sorted(range(1, 101))
+    capacity = len(compact._keys)
+
+    for val in range(1, 51):
+        compact.delete(val)
+    for val in range(1000, 1050):
+        compact.insert(val)
+
+    assert len(compact._keys) == capacity
+    assert len(compact) == 100
+    assert compact.validate_avl() == True
+
+def test_node_has_no_dict():
+    assert not hasattr(Node(1), '__dict__')
+
+def test_sorted_map_basic_operations():
+    sorted_map = SortedMap({'pear': 3, 'apple': 1})
+    sorted_map['fig'] = 2
+    sorted_map.insert('apple', 10)
+
+    assert sorted_map['apple'] == 10
+    assert sorted_map.get('kiwi') is None
+    assert 'fig' in sorted_map and 'kiwi' not in sorted_map
+    assert sorted_map.items() == [('apple', 10), ('fig', 2), ('pear', 3)]
+    assert len(sorted_map) == 3
+
+    del sorted_map['fig']
+    assert sorted_map.keys() == ['apple', 'pear']
+    with pytest.raises(KeyError):
+        del sorted_map['fig']
+    assert sorted_map.pop('kiwi', 0) == 0
+
+def test_sorted_map_neighbours():
+    sorted_map = SortedMap((val, str(val)) for val in range(0, 100, 10))
+
+    assert sorted_map.floor(35) == (30, '30')
+    assert sorted_map.floor(30) == (30, '30')
+    assert sorted_map.ceiling(35) == (40, '40')
+    assert sorted_map.predecessor(30) == (20, '20')
+    assert sorted_map.successor(30) == (40, '40')
+    assert sorted_map.floor(-1) is None
+    assert sorted_map.successor(90) is None
+
+    assert sorted_map.pop_min() == (0, '0')
+    assert sorted_map.pop_max() == (90, '90')
+    assert sorted_map.keys() == list(range(10, 90, 10))
+    assert sorted_map.validate_avl(sorted_map.root) == True
+
+def test_sorted_map_key_function():
+    sorted_map = SortedMap(key=str.lower)
+    sorted_map['Banana'] = 1
+    sorted_map['apple'] = 2
+    sorted_map['BANANA'] = 3
+
+    assert sorted_map.items() == [('apple', 2), ('Banana', 3)]
+    assert sorted_map['banana'] == 3
+    assert list(sorted_map.irange('B', 'z')) == ['Banana']
+
+def test_sorted_map_delete_keeps_payloads():
+    sorted_map = SortedMap()
+    expected = {}
+    rng = random.Random(5)
+    for _ in range(2000):
+        key = rng.randint(1, 200)
+        if rng.random() < 0.6:
+            sorted_map[key] = key * 2
+            expected[key] = key * 2
+        else:
+            sorted_map.delete(key)
+            expected.pop(key, None)
+
+    assert sorted_map.items() == sorted(expected.items())
+    assert sorted_map.validate_avl(sorted_map.root) == True
+
+def test_floor_and_ceiling(avl_tree):
+    for val in [10, 20, 30]:
+        avl_tree.insert(val)
+    assert avl_tree.floor(25) == 20
+    assert avl_tree.ceiling(25) == 30
+    assert avl_tree.predecessor(10) is None
+    assert avl_tree.successor(20) == 30
+    assert 20 in avl_tree
+
+def test_persistent_snapshots_are_isolated():
+    tree = PersistentAVLTree()
+    expected = set()
+    snapshots = []
+    rng = random.Random(13)
+    for step in range(2000):
+        val = rng.randint(1, 300)
+        if rng.random() < 0.6:
+            tree.insert(val)
+            expected.add(val)
+        else:
+            tree.delete(val)
+            expected.discard(val)
+        if step % 200 == 0:
+            snapshots.append((tree.snapshot(), sorted(expected)))
+
+    assert tree.inorder_traversal() == sorted(expected)
+    for snapshot, values in snapshots:
+        assert snapshot.inorder_traversal() == values
+        assert len(snapshot) == len(values)
+        assert snapshot.validate_avl(snapshot.root) == True
+
+def test_persistent_insert_copies_only_path():
+    tree = PersistentAVLTree.from_sorted(range(1, 1025))
+    snapshot = tree.snapshot()
+    old_nodes = {id(node) for node in snapshot._iter_nodes()}
+
+    tree.insert(2000)
+    tree.delete(512)
+    new_nodes = [node for node in tree._iter_nodes() if id(node) not in old_nodes]
+    assert len(new_nodes) <= 4 * tree.get_height(tree.root)
+    assert snapshot.inorder_traversal() == list(range(1, 1025))
+
+def test_persistent_split_and_merge_keep_source():
+    tree = PersistentAVLTree.from_sorted(range(1, 200))
+    left_tree, right_tree = tree.split(tree.root, 77)
+
+    left_values, right_values = [], []
+    tree._inorder_traversal(left_tree, left_values)
+    tree._inorder_traversal(right_tree, right_values)
+    assert left_values == list(range(1, 78))
+    assert right_values == list(range(78, 200))
+    assert tree.inorder_traversal() == list(range(1, 200))
+
+    merged = tree.merge(left_tree, right_tree)
+    merged_values = []
+    tree._inorder_traversal(merged, merged_values)
+    assert merged_values == list(range(1, 200))
+    left_values = []
+    tree._inorder_traversal(left_tree, left_values)
+    assert left_values == list(range(1, 78))
+
+def test_concurrent_tree_stress():
+    tree = ConcurrentAVLTree()
+    thread_count = 8
+    expected = [set() for _ in range(thread_count)]
+
+    def worker(index):
+        rng = random.Random(index)
+        base = index * 10000
+        for _ in range(1500):
+            val = base + rng.randint(1, 500)
+            action = rng.random()
+            if action < 0.5:
+                tree.insert(val)
+                expected[index].add(val)
+            elif action < 0.8:
+                tree.delete(val)
+                expected[index].discard(val)
+            elif action < 0.9:
+                tree.apply_batch(inserts=[val, val + 1], deletes=[val])
+                expected[index].add(val + 1)
+                expected[index].discard(val)
+            else:
+                assert tree.search(val) == (val in expected[index])
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tree.validate() == True
+    assert tree.inorder_traversal() == sorted(set().union(*expected))
+    assert len(tree) == sum(len(values) for values in expected)
+
+def test_aggregate_map_matches_brute_force():
+    rng = random.Random(17)
+    for monoid, function in ((SUM, sum), (COUNT, len), (MIN, min), (MAX, max)):
+        aggregate_map = AggregateMap(monoid=monoid)
+        expected = {}
+        for _ in range(1500):
+            key = rng.randint(1, 200)
+            action = rng.random()
+            if action < 0.6:
+                value = rng.randint(-50, 50)
+                aggregate_map[key] = value
+                expected[key] = value
+            elif action < 0.9:
+                aggregate_map.delete(key)
+                expected.pop(key, None)
+            elif expected:
+                assert aggregate_map.pop_min() == min(expected.items())
+                del expected[min(expected)]
+
+            lo, hi = sorted((rng.randint(0, 210), rng.randint(0, 210)))
+            values = [value for key, value in expected.items() if lo <= key <= hi]
+            if function is len:
+                assert aggregate_map.aggregate(lo, hi) == len(values)
+            elif values or function is sum:
+                assert aggregate_map.aggregate(lo, hi) == function(values)
+            else:
+                assert aggregate_map.aggregate(lo, hi) is None
+
+        assert aggregate_map.validate_avl(aggregate_map.root) == True
+
+def test_aggregate_map_unbounded_and_custom_monoid():
+    product = Monoid(1, lambda a, b: a * b, lambda key, value: value)
+    aggregate_map = AggregateMap({key: key for key in range(1, 11)}, monoid=product)
+
+    assert aggregate_map.aggregate() == 3628800
+    assert aggregate_map.aggregate(hi=4) == 24
+    assert aggregate_map.aggregate(lo=9) == 90
+    assert aggregate_map.aggregate(20, 30) == 1
+
+def test_save_and_load(tmp_path, avl_tree):
+    for val in [50, 20, 80, 10, 30, 70, 90]:
+        avl_tree.insert(val)
+    path = tmp_path / 'tree.avl'
+    avl_tree.save(path)
+
+    assert path.stat().st_size == 16 + 8 * 7
+    loaded = AVLTree.load(path)
+    assert loaded.inorder_traversal() == [10, 20, 30, 50, 70, 80, 90]
+    assert loaded.validate_avl(loaded.root) == True
+
+    path.write_bytes(b'garbage')
+    with pytest.raises(ValueError):
+        AVLTree.load(path)
+
+def test_frozen_tree_from_mapped_file(tmp_path):
+    path = tmp_path / 'tree.avl'
+    AVLTree.from_sorted(range(10, 1000, 10)).save(path)
+
+    with FrozenAVLTree.open(path) as frozen:
+        assert len(frozen) == 99
+        assert frozen.search(500) and not frozen.search(505)
+        assert frozen.floor(505) == 500 and frozen.ceiling(505) == 510
+        assert frozen.predecessor(10) is None and frozen.successor(990) is None
+        assert list(frozen.irange(100, 140)) == [100, 110, 120, 130, 140]
+        assert list(frozen.irange(100, 140, inclusive=(False, False), reverse=True)) == [130, 120, 110]
+        assert frozen.count_range(15, 45) == 3
+        assert frozen.rank(100) == 9 and frozen.select(9) == 100
+        assert frozen.thaw().inorder_traversal() == list(range(10, 1000, 10))
+    assert len(frozen) == 0
+
+    AVLTree().save(path)
+    assert len(FrozenAVLTree.open(path)) == 0
+
+def test_frozen_tree_close_with_live_view(tmp_path):
+    pytest.importorskip('numpy')
+    path = tmp_path / 'tree.avl'
+    AVLTree.from_sorted(range(1, 100)).save(path)
+    frozen = FrozenAVLTree.open(path)
+    view = frozen._as_array()[10:20]
+    with pytest.raises(BufferError):
+        frozen.close()  # Срез массива ещё держит отображение
+    assert list(frozen) == list(range(1, 100)) and frozen.search(50)
+    assert list(frozen.search_many([11, 0])) == [10, -1]
+
+    del view
+    frozen.close()
+    assert len(frozen) == 0
+
+def test_frozen_batch_lookups(avl_tree):
+    for val in range(2, 200, 2):
+        avl_tree.insert(val)
+    frozen = avl_tree.freeze()
+
+    queries = [4, 5, 198, 199, 0, 2]
+    assert list(frozen.contains_many(queries)) == [True, False, True, False, False, True]
+    assert list(frozen.search_many(queries)) == [1, -1, 98, -1, -1, 0]
+    assert list(AVLTree().freeze().contains_many([1, 2])) == [False, False]
+    assert list(frozen.contains_many([2.5, 4.0, 3.9])) == [False, True, False]  # Дробные не усекаются
+    assert list(frozen.search_many([2.5, 4.0])) == [-1, 1]
+
+def test_set_operations():
+    rng = random.Random(19)
+    for _ in range(30):
+        first = set(rng.sample(range(1, 2000), rng.randint(0, 300)))
+        second = set(rng.sample(range(1, 2000), rng.randint(0, 30)))
+        for operation, expected in (('union', first | second),
+                                    ('intersection', first & second),
+                                    ('difference', first - second)):
+            left, right = AVLTree.from_sorted(first), AVLTree.from_sorted(second)
+            result = getattr(left, operation)(right)
+            assert result.inorder_traversal() == sorted(expected)
+            assert result.validate_avl(result.root) == True
+            assert len(result) == len(expected)
+            assert left.inorder_traversal() == sorted(first) and right.inorder_traversal() == sorted(second)
+
+            result.insert(5000)  # Узлы результата не общие с операндами
+            assert 5000 not in left and 5000 not in right
+
+            consumed = getattr(left, operation)(right, consume=True)
+            assert consumed.inorder_traversal() == sorted(expected)
+            assert len(left) == 0 and len(right) == (len(second) if operation == 'difference' else 0)
+
+        assert AVLTree.from_sorted(second).issubset(AVLTree.from_sorted(first)) == (second <= first)
+        assert AVLTree.from_sorted(first & second).issubset(AVLTree.from_sorted(first)) == True
+
+def test_issubset_uses_sort_key():
+    small = SortedMap({1: 'a', 2: 'b'}, key=lambda k: -k)
+    large = SortedMap({k: k for k in range(1, 100)}, key=lambda k: -k)
+    assert small.issubset(large) and not large.issubset(small)
+    assert SortedMap({k: k for k in range(1, 60)}, key=lambda k: -k).issubset(large)  # Совместный проход
+    assert not SortedMap({k: k for k in range(50, 101)}, key=lambda k: -k).issubset(large)
+    assert SortedMap({3: 'c'}).issubset(large) and not SortedMap({0: 'z'}).issubset(large)
+
+def test_set_operations_keep_persistent_operands():
+    left = PersistentAVLTree.from_sorted(range(1, 300, 2))
+    right = PersistentAVLTree.from_sorted(range(1, 300, 3))
+
+    assert left.union(right).inorder_traversal() == sorted(set(range(1, 300, 2)) | set(range(1, 300, 3)))
+    assert left.difference(right).inorder_traversal() == sorted(set(range(1, 300, 2)) - set(range(1, 300, 3)))
+    assert left.inorder_traversal() == list(range(1, 300, 2))
+    assert right.inorder_traversal() == list(range(1, 300, 3))
+
+def test_parallel_set_operation(monkeypatch):
+    monkeypatch.setattr('AVLTree.PARALLEL_THRESHOLD', 10)
+    left = AVLTree.from_sorted(range(1, 500, 2))
+    right = AVLTree.from_sorted(range(1, 500, 5))
+
+    result = left.intersection(right, processes=2)
+    assert result.inorder_traversal() == sorted(set(range(1, 500, 2)) & set(range(1, 500, 5)))
+    assert left.inorder_traversal() == list(range(1, 500, 2))  # Узлы не переиспользуются — операнды целы
+    assert right.inorder_traversal() == list(range(1, 500, 5))
+
+def test_priority_queue_mode():
+    tree = AVLTree()
+    with pytest.raises(IndexError):
+        tree.peek_min()
+    with pytest.raises(IndexError):
+        tree.pop_max()
+
+    values = [(i * 7919) % 1000 + 1 for i in range(500)]
+    for i, val in enumerate(values):
+        tree.insert(val)
+        assert tree.peek_min() == min(values[:i + 1])
+        assert tree.peek_max() == max(values[:i + 1])
+
+    remaining = sorted(values)
+    assert tree.pop_min() == remaining.pop(0)
+    assert tree.pop_max() == remaining.pop()
+    assert tree.pop_min_many(10) == remaining[:10]
+    del remaining[:10]
+    assert tree.peek_min() == remaining[0] and tree.peek_max() == remaining[-1]
+    assert tree.validate_avl(tree.root) == True
+
+    # decrease-key через delete + insert
+    tree.delete(remaining[5])
+    tree.insert(remaining[0] - 1)
+    assert tree.peek_min() == remaining[0] - 1
+
+    tree.delete(remaining[-1])
+    assert tree.peek_max() == tree.select(-1)
+    expected = tree.inorder_traversal()
+    assert tree.pop_min_many(len(tree) + 5) == expected
+    assert len(tree) == 0
+    with pytest.raises(IndexError):
+        tree.peek_max()
+
+def test_priority_queue_on_sorted_map_and_persistent_tree():
+    sorted_map = SortedMap({5: 'e', 1: 'a', 3: 'c', 9: 'i'})
+    assert sorted_map.peek_min() == (1, 'a')
+    sorted_map[0] = 'z'
+    assert sorted_map.peek_min() == (0, 'z')
+    assert sorted_map.pop_min_many(2) == [(0, 'z'), (1, 'a')]
+    del sorted_map[9]
+    assert sorted_map.peek_max() == (5, 'e')
+
+    reversed_map = SortedMap([(i, str(i)) for i in range(10)], key=lambda k: -k)
+    assert reversed_map.pop_min_many(3) == [(9, '9'), (8, '8'), (7, '7')]  # split по ключу сортировки
+    assert len(reversed_map) == 7 and reversed_map.peek_min() == (6, '6')
+
+    tree = PersistentAVLTree.from_sorted(range(1, 50))
+    snapshot = tree.snapshot()
+    assert tree.pop_min() == 1 and tree.pop_max() == 49
+    assert tree.peek_min() == 2 and tree.peek_max() == 48
+    assert snapshot.peek_min() == 1 and snapshot.peek_max() == 49
+
+@pytest.fixture(params=['avl', 'btree-3', 'btree-64'])
+def ordered_set(request):
+    if request.param == 'avl':
+        return AVLTree()
+    return BTree(order=int(request.param.split('-')[1]))
+
+def _validate(tree, root):
+    return tree.validate_avl(root) if isinstance(tree, AVLTree) else tree.validate_btree(root)
+
+def test_engines_basic_operations(ordered_set):
+    expected = sorted(_random_set_operations([ordered_set], seed=15, steps=3000, max_val=500))
+    assert _validate(ordered_set, ordered_set.root) == True
+    assert ordered_set.inorder_traversal() == list(ordered_set) == expected
+    assert list(reversed(ordered_set)) == expected[::-1]
+    assert ordered_set.count_nodes() == len(ordered_set) == len(expected)
+    assert sorted(ordered_set.bfs())[-1] == expected[-1]
+    assert [ordered_set.select(k) for k in range(len(expected))] == expected
+    assert ordered_set.rank(250) == sum(val < 250 for val in expected)
+    assert list(ordered_set.irange(100, 200, inclusive=(False, True))) == [val for val in expected if 100 < val <= 200]
+    assert list(ordered_set.irange(100, 200, reverse=True)) == [val for val in reversed(expected) if 100 <= val <= 200]
+
+    with pytest.raises(ValueError):
+        ordered_set.insert(0)
+
+def test_engines_split_and_merge(ordered_set):
+    values = list(range(1, 400, 3))
+    ordered_set.insert_many(values)
+
+    tree = ordered_set
+    for pivot in (0, 1, 100, 200, 398, 500):
+        left_tree, right_tree = tree.split(tree.root, pivot)
+        assert _validate(tree, left_tree) == True
+        assert _validate(tree, right_tree) == True
+
+        left_values, right_values = [], []
+        tree._inorder_traversal(left_tree, left_values)
+        tree._inorder_traversal(right_tree, right_values)
+        assert left_values == [val for val in values if val <= pivot]
+        assert right_values == [val for val in values if val > pivot]
+
+        tree.root = tree.merge(left_tree, right_tree)
+        assert _validate(tree, tree.root) == True
+        assert tree.inorder_traversal() == values
+        assert len(tree) == len(values)
+
+def test_engines_agree():
+    avl, btree = AVLTree(), BTree(order=4)
+    expected = _random_set_operations([avl, btree], seed=150, steps=5000, max_val=1000, insert_share=0.5)
+    assert len(avl) == len(btree) == len(expected)
+    assert avl.inorder_traversal() == btree.inorder_traversal()
+    assert btree.validate_btree(btree.root) == True
+
+def test_btree_structure():
+    with pytest.raises(ValueError):
+        BTree(order=2)
+
+    tree = BTree.from_sorted(range(1, 10_001), order=8)
+    assert tree.validate_btree(tree.root) == True
+    assert tree.get_height(tree.root) <= 6
+
+    for val in range(1, 10_001, 2):
+        tree.delete(val)
+    assert tree.validate_btree(tree.root) == True
+    assert tree.inorder_traversal() == list(range(2, 10_001, 2))
+
+    for val in range(2, 10_001, 2):
+        tree.delete(val)
+    assert tree.root is None and len(tree) == 0
+
+    # Слияние деревьев сильно разной высоты
+    small, large = BTree.from_sorted([1, 2], order=4), BTree.from_sorted(range(3, 3000), order=4)
+    merged = small.merge(small.root, large.root)
+    assert small.validate_btree(merged) == True
+    values = []
+    small._inorder_traversal(merged, values)
+    assert values == list(range(1, 3000))
+
+def test_tree_stats(avl_tree):
+    assert avl_tree.stats() == {}
+    events = []
+    stats = avl_tree.enable_stats(hook=lambda name, elapsed: events.append(name))
+
+    for val in range(1, 101):
+        avl_tree.insert(val)
+    for val in (1, 50, 1000):
+        avl_tree.search(val)
+    assert 25 in avl_tree
+    avl_tree.delete(100)
+
+    result = avl_tree.stats()
+    assert result['size'] == 99
+    assert result['rotations']['single_left'] > 0
+    assert result['rotations']['single_right'] == result['rotations']['left_right'] == 0
+    assert sum(result['search_depth_histogram'].values()) == 4
+    assert sum(result['node_depth_histogram'].values()) == 99
+    assert max(result['node_depth_histogram']) == result['height']
+    assert result['operations']['insert']['calls'] == 100
+    assert result['operations']['search']['calls'] == 4  # in идёт через search
+    assert events.count('insert') == 100 and events[-1] == 'delete'
+
+    # После выключения обёрток на экземпляре не остаётся, счётчики сохраняются
+    avl_tree.disable_stats()
+    assert 'insert' not in vars(avl_tree) and 'rotate_left' not in vars(avl_tree)
+    avl_tree.insert(1000)
+    assert avl_tree.stats()['operations']['insert']['calls'] == 100
+    stats.reset()
+    assert avl_tree.stats()['operations'] == {}
+
+def test_tree_stats_count_public_searches_only():
+    tree = PersistentAVLTree.from_sorted(range(1, 8))
+    stats = tree.enable_stats()
+    tree.insert(100)  # Внутри вызывает _search
+    tree.delete(3)
+    assert AVLTree.from_sorted([1, 2]).issubset(tree)
+    assert stats.search_depths == {}
+    assert 7 in tree and not tree.search(50)
+    assert sum(stats.search_depths.values()) == 2
+
+    sorted_map = SortedMap({i: str(i) for i in range(7)}, key=lambda k: -k)
+    stats = sorted_map.enable_stats()
+    assert 6 in sorted_map and 10 not in sorted_map and 3 in sorted_map
+    assert stats.search_depths == {3: 2, 1: 1}  # Путь по ключам сортировки: 3 — корень
+
+def test_tree_stats_not_shared_with_snapshot():
+    tree = PersistentAVLTree.from_sorted(range(1, 50))
+    tree.enable_stats()
+    snapshot = tree.snapshot()
+    snapshot.insert(100)
+    assert tree.stats()['operations'] == {}
+    assert snapshot.stats() == {}
+    assert 100 in snapshot and 100 not in tree
+
+def test_write_dot():
+    tree = AVLTree.from_sorted(range(1, 2 ** 12))
+
+    out = io.StringIO()
+    assert write_dot(tree.root, out) == len(tree)
+    text = out.getvalue()
+    assert text.startswith('digraph "avl_tree" {') and text.endswith('}\n')
+    assert text.count(' -> n') == len(tree) - 1
+
+    # Сворачивание глубоких поддеревьев и подписи с балансом
+    out = io.StringIO()
+    assert write_dot(tree.root, out, max_depth=3, show_balance=True) == 7
+    text = out.getvalue()
+    assert text.count('shape=box') == 8
+    assert f'… {2 ** 9 - 1} узл.\\nh=9' in text
+    assert 'label="2048\\nh=12 b=0"' in text
+
+    # Отрезок значений: рисуются только узлы отрезка и серые узлы на пути к ним
+    out = io.StringIO()
+    write_dot(tree.root, out, lo=100, hi=120)
+    lines = [line for line in out.getvalue().splitlines() if 'label=' in line]
+    inside = {int(line.split('"')[1]) for line in lines if 'gray' not in line}
+    outside = {int(line.split('"')[1]) for line in lines if 'gray' in line}
+    assert inside == set(range(100, 121))
+    assert outside and all(val < 100 or val > 120 for val in outside)
+
+    # Поддерево и запись в файл без рекурсии на вырожденной глубине
+    chain = Node(1)
+    node = chain
+    for val in range(2, 5001):
+        node.right = Node(val)
+        node = node.right
+    out = io.StringIO()
+    assert write_dot(chain, out) == 5000
+    assert write_dot(tree.root.left, io.StringIO()) == len(tree) // 2
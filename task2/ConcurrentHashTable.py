@@ -0,0 +1,214 @@
+import threading
+
+def _mix(h):
+    """
+    Подмешивает старшие биты хэша в младшие. У int hash(i) == i, и ключи,
+    кратные числу полос (0, 16, 32, ...), без этого попали бы в одну полосу.
+    Одного сдвига на 16 мало: у ключей меньше 2**16 он ничего не меняет.
+    """
+    h ^= h >> 16
+    h ^= h >> 8
+    return h ^ (h >> 4)
+
+class ConcurrentHashTable:
+    """
+    Потокобезопасная хэш-таблица с блокировками по полосам (lock striping).
+
+    Ячейки поделены на stripes полос: ячейка с индексом i принадлежит полосе
+    i % stripes, и у каждой полосы своя блокировка. Индекс ячейки и полоса
+    считаются по перемешанному хэшу (_mix). Размер таблицы всегда кратен
+    числу полос, поэтому полоса ключа (_mix(hash) % stripes) не меняется при
+    росте таблицы, и операции над ключами разных полос идут параллельно.
+
+    Каждая полоса считает свои пары сама. Когда в полосе пар становится
+    больше max_load_factor на её ячейку, таблица удваивается: рост захватывает
+    блокировки всех полос по порядку номеров и перестраивает таблицу целиком,
+    пока ни одна операция не может в неё заглянуть.
+    """
+
+    def __init__(self, size=16, stripes=16, max_load_factor=2.0):
+        """
+        Инициализация таблицы.
+        size: начальное количество ячеек (округляется вверх до кратного stripes).
+        stripes: число полос, то есть независимых блокировок.
+        max_load_factor: при большем среднем числе пар на ячейку полосы таблица растёт вдвое.
+        """
+        if size < 1 or stripes < 1:
+            raise ValueError("Размер таблицы и число полос должны быть положительными")
+        self.stripes = stripes
+        self.size = -(-size // stripes) * stripes
+        self.max_load_factor = max_load_factor
+        self.table = [[] for _ in range(self.size)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._counts = [0] * stripes  # Пары в каждой полосе; меняются под её блокировкой
+
+    # =======================
+    # Изменение размера
+    # =======================
+
+    def _resize(self, seen_size):
+        """
+        Удваивает таблицу под блокировками всех полос, если её размер всё ещё
+        seen_size (иначе её уже увеличил другой поток).
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            if self.size != seen_size:
+                return
+            size = self.size * 2
+            table = [[] for _ in range(size)]
+            for bucket in self.table:
+                for pair in bucket:
+                    table[_mix(hash(pair[0])) % size].append(pair)
+            self.table, self.size = table, size
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+    def _added(self, stripe):
+        """
+        Учитывает новую пару в полосе (под её блокировкой).
+        Возвращает размер таблицы, который пора удвоить, или None.
+        """
+        self._counts[stripe] += 1
+        if self._counts[stripe] > self.max_load_factor * self.size / self.stripes:
+            return self.size
+        return None
+
+    # =======================
+    # Основные операции
+    # =======================
+
+    def insert(self, key, value):
+        """
+        Вставка пары ключ-значение. Если ключ уже существует, его значение обновляется.
+        """
+        h = _mix(hash(key))
+        stripe = h % self.stripes
+        grow = None
+        with self._locks[stripe]:
+            bucket = self.table[h % self.size]
+            for i, (k, v) in enumerate(bucket):
+                if k == key:
+                    bucket[i] = (key, value)
+                    return
+            bucket.append((key, value))
+            grow = self._added(stripe)
+        # Рост берёт все блокировки по порядку, поэтому свою нужно сначала отпустить
+        if grow is not None:
+            self._resize(grow)
+
+    def get(self, key):
+        """
+        Получение значения по ключу. Возвращает значение, если ключ найден, иначе None.
+        """
+        h = _mix(hash(key))
+        with self._locks[h % self.stripes]:
+            for k, v in self.table[h % self.size]:
+                if k == key:
+                    return v
+        return None
+
+    def delete(self, key):
+        """
+        Удаление пары по ключу. Если ключ не найден, ничего не происходит.
+        """
+        h = _mix(hash(key))
+        stripe = h % self.stripes
+        with self._locks[stripe]:
+            bucket = self.table[h % self.size]
+            for i, (k, v) in enumerate(bucket):
+                if k == key:
+                    del bucket[i]
+                    self._counts[stripe] -= 1
+                    return
+
+    def contains(self, key):
+        """
+        Проверка наличия ключа. Возвращает True, если ключ есть в таблице.
+        """
+        h = _mix(hash(key))
+        with self._locks[h % self.stripes]:
+            return any(k == key for k, v in self.table[h % self.size])
+
+    def __contains__(self, key):
+        """
+        Проверка наличия ключа: key in table.
+        """
+        return self.contains(key)
+
+    # =======================
+    # Атомарные операции
+    # =======================
+
+    def get_or_insert(self, key, value):
+        """
+        Атомарно возвращает значение ключа, а если ключа нет — вставляет value
+        и возвращает его. Из нескольких потоков, одновременно вставляющих
+        один ключ, вставит только один, а остальные получат его значение.
+        """
+        h = _mix(hash(key))
+        stripe = h % self.stripes
+        with self._locks[stripe]:
+            bucket = self.table[h % self.size]
+            for k, v in bucket:
+                if k == key:
+                    return v
+            bucket.append((key, value))
+            grow = self._added(stripe)
+        if grow is not None:
+            self._resize(grow)
+        return value
+
+    def compare_and_set(self, key, expected, value):
+        """
+        Атомарно заменяет значение ключа на value, если ключ есть и его текущее
+        значение равно expected. Возвращает True, если замена произошла.
+        """
+        h = _mix(hash(key))
+        with self._locks[h % self.stripes]:
+            bucket = self.table[h % self.size]
+            for i, (k, v) in enumerate(bucket):
+                if k == key:
+                    if v != expected:
+                        return False
+                    bucket[i] = (key, value)
+                    return True
+        return False
+
+    # =======================
+    # Вся таблица
+    # =======================
+
+    def count(self):
+        """
+        Возвращает количество пар в таблице (сумма счётчиков полос без блокировок:
+        при одновременных изменениях это значение на какой-то момент между ними).
+        """
+        return sum(self._counts)
+
+    def __len__(self):
+        """
+        Возвращает количество пар в таблице.
+        """
+        return self.count()
+
+    def load_factor(self):
+        """
+        Возвращает коэффициент заполнения: среднее число пар на ячейку.
+        """
+        return self.count() / self.size
+
+    def items(self):
+        """
+        Возвращает список всех пар, собранный под блокировками всех полос
+        (согласованный снимок таблицы).
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            return [pair for bucket in self.table for pair in bucket]
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
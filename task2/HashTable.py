@@ -1,70 +1,396 @@
-class HashTable:
-    def __init__(self, size=10):
-        """
-        Инициализация хэш-таблицы.
-        size: размер таблицы (количество ячеек).
-        """
-        self.size = size
-        self.table = [[] for _ in range(size)]
-
-    def _hash(self, key):
-        """
-        Хэш-функция для вычисления индекса в таблице.
-        key: ключ, для которого вычисляется хэш.
-        Возвращает индекс в таблице.
-        """
-        return hash(key) % self.size
-
-    def insert(self, key, value):
-        """
-        Вставка пары ключ-значение в хэш-таблицу.
-        key: ключ.
-        value: значение.
-        Если ключ уже существует, его значение обновляется.
-        """
-        index = self._hash(key)
-        bucket = self.table[index]
-        
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
-                bucket[i] = (key, value)
-                return
-        
-        bucket.append((key, value))
-
-    def get(self, key):
-        """
-        Получение значения по ключу.
-        key: ключ, для которого нужно получить значение.
-        Возвращает значение, если ключ найден, иначе None.
-        """
-        index = self._hash(key)
-        bucket = self.table[index]
-        
-        for k, v in bucket:
-            if k == key:
-                return v
-        
-        return None
-
-    def delete(self, key):
-        """
-        Удаление пары ключ-значение по ключу.
-        key: ключ, который нужно удалить.
-        Если ключ не найден, ничего не происходит.
-        """
-        index = self._hash(key)
-        bucket = self.table[index]
-        
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
-                del bucket[i]
-                return
-
-    def __str__(self):
-        """
-        Возвращает строковое представление хэш-таблицы.
-        Каждая ячейка выводится с его индексом и содержимым.
-        """
-        return '\n'.join([f'{i}: {bucket}' for i, bucket in enumerate(self.table)])
-
+from TableStats import TableStats
+from TreeBucket import TreeBucket
+
+# Сколько ячеек старой таблицы переносится в новую за одну операцию
+REHASH_STEP = 4
+
+# Ячейка длиннее TREEIFY_THRESHOLD пар становится AVL-деревом (TreeBucket),
+# а дерево, в котором осталось UNTREEIFY_THRESHOLD пар или меньше, — снова списком.
+# Разрыв между порогами не даёт ячейке перестраиваться на каждой вставке и удалении.
+TREEIFY_THRESHOLD = 8
+UNTREEIFY_THRESHOLD = 6
+
+class HashTable:
+    def __init__(self, size=10, max_load_factor=2.0, min_load_factor=None):
+        """
+        Инициализация хэш-таблицы.
+        size: начальный размер таблицы (количество ячеек).
+        max_load_factor: при большем среднем числе пар на ячейку таблица растёт вдвое.
+        min_load_factor: при меньшем — сжимается вдвое, но не меньше начального
+        размера (None — не сжимается). Должен быть меньше max_load_factor / 4,
+        иначе таблица будет то расти, то сжиматься.
+        """
+        if size < 1:
+            raise ValueError("Размер таблицы должен быть положительным")
+        if min_load_factor is not None and min_load_factor * 4 >= max_load_factor:
+            raise ValueError("min_load_factor должен быть меньше max_load_factor / 4")
+        self.size = size
+        self.table = [[] for _ in range(size)]
+        self.max_load_factor = max_load_factor
+        self.min_load_factor = min_load_factor
+        self._initial_size = size
+        self._count = 0
+
+        # Постепенное перехеширование: пока _old_table не None, ячейки старой
+        # таблицы с индексами от _rehash_index ещё не перенесены в table
+        self._old_table = None
+        self._old_size = 0
+        self._rehash_index = 0
+
+        self._stats = None  # TableStats появляется только после enable_stats
+
+    def _hash(self, key):
+        """
+        Хэш-функция для вычисления индекса в таблице.
+        key: ключ, для которого вычисляется хэш.
+        Возвращает индекс в таблице.
+        """
+        return hash(key) % self.size
+
+    def _locate(self, key):
+        """
+        Возвращает таблицу и индекс ячейки, в которой лежит (или должен лежать) ключ:
+        во время перехеширования это может быть ещё не перенесённая ячейка старой таблицы.
+        """
+        if self._old_table is not None:
+            index = hash(key) % self._old_size
+            if index >= self._rehash_index:
+                return self._old_table, index
+        return self.table, self._hash(key)
+
+    def _bucket(self, key):
+        """
+        Возвращает ячейку ключа: список пар или TreeBucket.
+        """
+        table, index = self._locate(key)
+        return table[index]
+
+    @staticmethod
+    def _add(table, index, pair):
+        """
+        Добавляет в ячейку пару с новым для неё ключом,
+        превращая переполненный список в дерево.
+        """
+        bucket = table[index]
+        if type(bucket) is TreeBucket:
+            bucket.insert(pair[0], pair[1], hash(pair[0]))
+            return
+        bucket.append(pair)
+        if len(bucket) > TREEIFY_THRESHOLD:
+            table[index] = TreeBucket(bucket)
+
+    def _buckets(self):
+        """
+        Перечисляет все ячейки с данными: новой таблицы и ещё не перенесённые старой.
+        """
+        yield from self.table
+        if self._old_table is not None:
+            yield from self._old_table[self._rehash_index:]
+
+    # =======================
+    # Изменение размера
+    # =======================
+
+    def _rehash_step(self):
+        """
+        Переносит следующие REHASH_STEP ячеек старой таблицы в новую.
+        """
+        old_table = self._old_table
+        table, size = self.table, self.size
+        end = min(self._rehash_index + REHASH_STEP, self._old_size)
+        for index in range(self._rehash_index, end):
+            for pair in old_table[index]:
+                self._add(table, hash(pair[0]) % size, pair)
+            old_table[index] = None
+        self._rehash_index = end
+        if end == self._old_size:
+            self._old_table = None
+
+    def _finish_rehash(self):
+        """
+        Дописывает начатое перехеширование целиком.
+        """
+        while self._old_table is not None:
+            self._rehash_step()
+
+    def _resize(self, new_size):
+        """
+        Начинает перенос данных в таблицу из new_size ячеек. Сами пары переносятся
+        постепенно, по REHASH_STEP ячеек за операцию: пока перенос не закончен,
+        поиск смотрит в старую ячейку, если она ещё не перенесена.
+        """
+        self._finish_rehash()
+        self._old_table, self._old_size = self.table, self.size
+        self._rehash_index = 0
+        self.table = [[] for _ in range(new_size)]
+        self.size = new_size
+
+    def insert(self, key, value):
+        """
+        Вставка пары ключ-значение в хэш-таблицу.
+        key: ключ.
+        value: значение.
+        Если ключ уже существует, его значение обновляется.
+        """
+        if self._old_table is not None:
+            self._rehash_step()
+        table, index = self._locate(key)
+        bucket = table[index]
+
+        if type(bucket) is TreeBucket:
+            if not bucket.insert(key, value, hash(key)):
+                return
+        else:
+            for i, (k, v) in enumerate(bucket):
+                if k == key:
+                    bucket[i] = (key, value)
+                    return
+            self._add(table, index, (key, value))
+
+        self._count += 1
+        if self._count > self.max_load_factor * self.size:
+            self._resize(self.size * 2)
+
+    def get(self, key):
+        """
+        Получение значения по ключу.
+        key: ключ, для которого нужно получить значение.
+        Возвращает значение, если ключ найден, иначе None.
+        """
+        if self._old_table is not None:
+            self._rehash_step()
+        bucket = self._bucket(key)
+        if type(bucket) is TreeBucket:
+            return bucket.get(key, hash(key))
+
+        for k, v in bucket:
+            if k == key:
+                return v
+        
+        return None
+
+    def delete(self, key):
+        """
+        Удаление пары ключ-значение по ключу.
+        key: ключ, который нужно удалить.
+        Если ключ не найден, ничего не происходит.
+        """
+        if self._old_table is not None:
+            self._rehash_step()
+        table, index = self._locate(key)
+        bucket = table[index]
+
+        if type(bucket) is TreeBucket:
+            if not bucket.delete(key, hash(key)):
+                return
+            if len(bucket) <= UNTREEIFY_THRESHOLD:
+                table[index] = list(bucket)
+        else:
+            for i, (k, v) in enumerate(bucket):
+                if k == key:
+                    del bucket[i]
+                    break
+            else:
+                return
+
+        self._count -= 1
+        if (self.min_load_factor is not None and self.size > self._initial_size
+                and self._count < self.min_load_factor * self.size):
+            self._resize(max(self._initial_size, self.size // 2))
+
+    # =======================
+    # Пакетные операции
+    # =======================
+
+    def insert_many(self, pairs):
+        """
+        Вставка пар (ключ, значение) пачкой; повторный ключ получает последнее значение.
+        Таблица сразу растёт до размера, рассчитанного на всю пачку, а цикл
+        по парам обходится без вызова insert. Перехеширование продвигается
+        на столько шагов, сколько пар в пачке, — как при вставке по одной,
+        но одним куском до цикла; не перенесённые ещё ячейки старой таблицы
+        пополняются на месте, как в insert.
+        """
+        pairs = list(pairs)
+        size = self.size
+        while self._count + len(pairs) > self.max_load_factor * size:
+            size *= 2
+        if size != self.size:
+            self._resize(size)
+        for _ in range(len(pairs)):
+            if self._old_table is None:
+                break
+            self._rehash_step()
+
+        table, size = self.table, self.size
+        old_table, old_size, rehash_index = self._old_table, self._old_size, self._rehash_index
+        added = 0
+        for key, value in pairs:
+            h = hash(key)
+            target, index = table, h % size
+            if old_table is not None:
+                old_index = h % old_size
+                if old_index >= rehash_index:
+                    target, index = old_table, old_index
+            bucket = target[index]
+            if type(bucket) is TreeBucket:
+                added += bucket.insert(key, value, h)
+                continue
+            for i, (k, v) in enumerate(bucket):
+                if k == key:
+                    bucket[i] = (key, value)
+                    break
+            else:
+                self._add(target, index, (key, value))
+                added += 1
+        self._count += added
+
+    def update(self, mapping):
+        """
+        Вставка всех пар из словаря (или другой таблицы с методом items)
+        либо из последовательности пар, как у dict.update.
+        """
+        self.insert_many(mapping.items() if hasattr(mapping, 'items') else mapping)
+
+    def get_many(self, keys):
+        """
+        Получение значений по списку ключей.
+        Возвращает список значений (None для отсутствующих) в порядке ключей.
+        Чтение не двигает перехеширование: ключ ищется в старой таблице,
+        если его ячейка ещё не перенесена, как в get.
+        """
+        table, size = self.table, self.size
+        old_table, old_size, rehash_index = self._old_table, self._old_size, self._rehash_index
+        values = []
+        for key in keys:
+            h = hash(key)
+            bucket = None
+            if old_table is not None:
+                index = h % old_size
+                if index >= rehash_index:
+                    bucket = old_table[index]
+            if bucket is None:
+                bucket = table[h % size]
+            if type(bucket) is TreeBucket:
+                values.append(bucket.get(key, h))
+                continue
+            for k, v in bucket:
+                if k == key:
+                    values.append(v)
+                    break
+            else:
+                values.append(None)
+        return values
+
+    def delete_many(self, keys):
+        """
+        Удаление пар по списку ключей; отсутствующие ключи пропускаются.
+        Незаконченное перехеширование не дописывается: ячейка каждого ключа
+        находится через _locate. Сжатие таблицы (при min_load_factor)
+        выполняется один раз на всю пачку. Возвращает число удалённых пар.
+        """
+        locate = self._locate
+        removed = 0
+        for key in keys:
+            table, index = locate(key)
+            bucket = table[index]
+            if type(bucket) is TreeBucket:
+                if bucket.delete(key, hash(key)):
+                    removed += 1
+                    if len(bucket) <= UNTREEIFY_THRESHOLD:
+                        table[index] = list(bucket)
+                continue
+            for i, (k, v) in enumerate(bucket):
+                if k == key:
+                    del bucket[i]
+                    removed += 1
+                    break
+
+        self._count -= removed
+        if self.min_load_factor is not None:
+            size = self.size
+            while size > self._initial_size and self._count < self.min_load_factor * size:
+                size = max(self._initial_size, size // 2)
+            if size != self.size:
+                self._resize(size)
+        return removed
+
+    def contains(self, key):
+        """
+        Проверка наличия ключа. Возвращает True, если ключ есть в таблице.
+        """
+        bucket = self._bucket(key)
+        if type(bucket) is TreeBucket:
+            return bucket.contains(key, hash(key))
+        return any(k == key for k, v in bucket)
+
+    def __contains__(self, key):
+        """
+        Проверка наличия ключа: key in table.
+        """
+        return self.contains(key)
+
+    def count(self):
+        """
+        Возвращает количество пар в таблице за O(1).
+        """
+        return self._count
+
+    def __len__(self):
+        """
+        Возвращает количество пар в таблице за O(1).
+        """
+        return self._count
+
+    def load_factor(self):
+        """
+        Возвращает коэффициент заполнения: среднее число пар на ячейку.
+        """
+        return self._count / self.size
+
+    def _probe_count(self, key):
+        """
+        Возвращает число пар, которые сравнит поиск ключа:
+        позицию ключа в ячейке (начиная с 1) или длину ячейки, если ключа нет.
+        Для ячейки-дерева — число сравнений по TreeBucket.probes.
+        """
+        bucket = self._bucket(key)
+        if type(bucket) is TreeBucket:
+            return bucket.probes(key, hash(key))
+        for i, (k, v) in enumerate(bucket, 1):
+            if k == key:
+                return i
+        return len(bucket)
+
+    def enable_stats(self):
+        """
+        Включает сбор статистики (пробы на get/insert/delete, занятость ячеек)
+        и возвращает её объект. Пока сбор не включён, он ничего не стоит.
+        """
+        if self._stats is None:
+            self._stats = TableStats(self)
+        self._stats.enable()
+        return self._stats
+
+    def disable_stats(self):
+        """
+        Выключает сбор статистики, сохраняя накопленные значения.
+        """
+        if self._stats is not None:
+            self._stats.disable()
+
+    def stats(self):
+        """
+        Возвращает статистику словарём (пустым, если сбор ни разу не включали).
+        """
+        return self._stats.as_dict() if self._stats is not None else {}
+
+    def __str__(self):
+        """
+        Возвращает строковое представление хэш-таблицы.
+        Каждая ячейка выводится с его индексом и содержимым.
+        Начатое перехеширование перед выводом завершается.
+        """
+        self._finish_rehash()
+        return '\n'.join([f'{i}: {bucket}' for i, bucket in enumerate(self.table)])
+
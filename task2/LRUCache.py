@@ -0,0 +1,218 @@
+import sys
+import time
+from HashTable import HashTable
+
+class _Entry:
+    # Запись кэша — одновременно узел двусвязного списка порядка использования
+    __slots__ = ('key', 'value', 'size', 'expires', 'prev', 'next')
+
+    def __init__(self, key=None, value=None, size=0, expires=None):
+        self.key = key
+        self.value = value
+        self.size = size
+        self.expires = expires
+        self.prev = self
+        self.next = self
+
+def _default_sizeof(key, value) -> int:
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+class LRUCache:
+    """
+    Кэш ограниченного размера поверх HashTable с вытеснением давно не использованных записей.
+
+    Таблица отображает ключ в запись, а записи связаны в кольцевой двусвязный
+    список с фиктивной головой: свежие — сразу за головой, самая старая — перед ней.
+    Поэтому обращение (перенос записи в начало) и вытеснение (снятие последней)
+    стоят O(1) и никогда не обходят ячейки таблицы.
+
+    Ограничение — число записей max_entries, суммарный размер max_bytes
+    (размер записи считает sizeof(key, value)) или оба сразу. У записи может
+    быть срок жизни: просроченная запись удаляется, когда на неё попадает get,
+    а до того остаётся на своём месте в списке и занимает место в кэше, пока
+    не будет вытеснена в обычном порядке, дойдя до его конца.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, ttl=None, sizeof=None, clock=time.monotonic):
+        """
+        max_entries: наибольшее число записей (None — без ограничения).
+        max_bytes: наибольший суммарный размер записей (None — без ограничения).
+        ttl: срок жизни записи по умолчанию в секундах (None — бессрочно).
+        sizeof: функция sizeof(key, value), размер записи для max_bytes
+                (по умолчанию сумма sys.getsizeof ключа и значения).
+        clock: источник времени в секундах для сроков жизни.
+        """
+        if max_entries is None and max_bytes is None:
+            raise ValueError("Нужно задать max_entries или max_bytes")
+        if (max_entries is not None and max_entries < 1) or (max_bytes is not None and max_bytes < 1):
+            raise ValueError("Ограничения кэша должны быть положительными")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof or _default_sizeof
+        self._clock = clock
+
+        self._table = HashTable()
+        self._head = _Entry()  # Фиктивная голова кольцевого списка
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # =======================
+    # Список порядка использования
+    # =======================
+
+    def _link_front(self, entry):
+        head = self._head
+        entry.prev, entry.next = head, head.next
+        head.next.prev = entry
+        head.next = entry
+
+    @staticmethod
+    def _unlink(entry):
+        entry.prev.next = entry.next
+        entry.next.prev = entry.prev
+
+    def _remove(self, entry):
+        """
+        Удаляет запись из списка и таблицы.
+        """
+        self._unlink(entry)
+        self._table.delete(entry.key)
+        self._bytes -= entry.size
+
+    def _evict(self):
+        """
+        Вытесняет записи с конца списка, пока кэш не уложится в ограничения.
+        """
+        head = self._head
+        while head.prev is not head and (
+                (self.max_entries is not None and len(self._table) > self.max_entries)
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            self._remove(head.prev)
+            self.evictions += 1
+
+    def _live_entry(self, key):
+        """
+        Возвращает непросроченную запись ключа или None; просроченную удаляет.
+        """
+        entry = self._table.get(key)
+        if entry is not None and entry.expires is not None and self._clock() >= entry.expires:
+            self._remove(entry)
+            self.expirations += 1
+            return None
+        return entry
+
+    # =======================
+    # Основные операции
+    # =======================
+
+    def put(self, key, value, ttl=None):
+        """
+        Кладёт значение в кэш и делает запись самой свежей.
+        ttl: срок жизни этой записи в секундах (None — срок по умолчанию).
+        Значение, которое одно больше max_bytes, в кэш не кладётся, а прежнее
+        значение ключа удаляется — остальные записи ради него не вытесняются.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires = self._clock() + ttl if ttl is not None else None
+        size = self._sizeof(key, value)
+
+        entry = self._table.get(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            if entry is not None:
+                self._remove(entry)
+            return
+        if entry is None:
+            entry = _Entry(key, value, size, expires)
+            self._table.insert(key, entry)
+        else:
+            self._unlink(entry)
+            self._bytes -= entry.size
+            entry.value, entry.size, entry.expires = value, size, expires
+        self._link_front(entry)
+        self._bytes += size
+        self._evict()
+
+    def get(self, key, default=None):
+        """
+        Возвращает значение по ключу и делает запись самой свежей.
+        Если ключа нет или срок его записи истёк, возвращает default.
+        """
+        entry = self._live_entry(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._unlink(entry)
+        self._link_front(entry)
+        return entry.value
+
+    def get_or_load(self, key, loader, ttl=None):
+        """
+        Возвращает значение из кэша, а при промахе — loader(key), положенный в кэш.
+        При промахе ключ ищется в таблице дважды (здесь и в put, который
+        вставляет значение): loader может сам положить ключ в кэш, и put
+        тогда обновит эту запись, а не создаст вторую.
+        """
+        entry = self._live_entry(key)
+        if entry is not None:
+            self.hits += 1
+            self._unlink(entry)
+            self._link_front(entry)
+            return entry.value
+        self.misses += 1
+        value = loader(key)
+        self.put(key, value, ttl)
+        return value
+
+    def delete(self, key):
+        """
+        Удаляет запись по ключу. Если ключа нет, ничего не происходит.
+        """
+        entry = self._table.get(key)
+        if entry is not None:
+            self._remove(entry)
+
+    def __contains__(self, key):
+        """
+        Проверка наличия непросроченной записи: key in cache.
+        Порядок использования и счётчики не меняются.
+        """
+        entry = self._table.get(key)
+        return entry is not None and (entry.expires is None or self._clock() < entry.expires)
+
+    def __len__(self):
+        """
+        Возвращает число записей, включая просроченные, но ещё не удалённые.
+        """
+        return len(self._table)
+
+    def keys(self):
+        """
+        Возвращает ключи от самого свежего к самому старому.
+        """
+        keys = []
+        entry = self._head.next
+        while entry is not self._head:
+            keys.append(entry.key)
+            entry = entry.next
+        return keys
+
+    def stats(self):
+        """
+        Возвращает счётчики кэша словарём.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._table),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
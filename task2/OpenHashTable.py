@@ -0,0 +1,203 @@
+from array import array
+
+# Метки свободной ячейки и надгробия (ячейки, из которой удалили ключ)
+_EMPTY = object()
+_DELETED = object()
+
+class OpenHashTable:
+    """
+    Хэш-таблица с открытой адресацией и линейным пробированием.
+
+    Вместо списка на ячейку и кортежа на пару данные лежат в трёх
+    параллельных массивах: ключи, значения и закэшированные хэши (array('q')).
+    Размер таблицы — степень двойки, поэтому индекс получается маской,
+    а не делением; перед маской старшие биты хэша подмешиваются к младшим
+    (h ^ (h >> 16)), чтобы ключи с одинаковыми младшими битами, например
+    кратные размеру таблицы, не сбивались в одну цепочку. Ключ ищется
+    с начальной ячейки и дальше подряд до совпадения или до пустой
+    ячейки; закэшированный хэш позволяет сравнивать сами ключи только
+    при совпадении хэшей и перестраивать таблицу без повторного вызова hash.
+
+    Удалённый ключ оставляет надгробие, чтобы не разорвать цепочку
+    пробирования; надгробия переиспользуются вставкой и исчезают при перестройке.
+    """
+
+    def __init__(self, size=8, max_load_factor=0.7):
+        """
+        Инициализация хэш-таблицы.
+        size: начальная вместимость (округляется вверх до степени двойки).
+        max_load_factor: доля занятых ячеек (вместе с надгробиями), при
+        превышении которой таблица перестраивается.
+        """
+        if not 0 < max_load_factor < 1:
+            raise ValueError("max_load_factor должен быть между 0 и 1")
+        capacity = 8
+        while capacity < size:
+            capacity *= 2
+        self.max_load_factor = max_load_factor
+        self._initial_size = capacity
+        self._count = 0  # Живые пары
+        self._used = 0   # Живые пары и надгробия
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """
+        Создаёт пустые массивы на capacity ячеек.
+        """
+        self.size = capacity
+        self._mask = capacity - 1
+        self._keys = [_EMPTY] * capacity
+        self._values = [None] * capacity
+        self._hashes = array('q', [0]) * capacity
+
+    def _find(self, key, h):
+        """
+        Возвращает индекс ячейки с ключом или -1, если ключа нет.
+        """
+        keys, hashes, mask = self._keys, self._hashes, self._mask
+        index = (h ^ (h >> 16)) & mask
+        while True:
+            k = keys[index]
+            if k is key:
+                return index
+            if k is _EMPTY:
+                return -1
+            if hashes[index] == h and k is not _DELETED and k == key:
+                return index
+            index = (index + 1) & mask
+
+    def _rebuild(self):
+        """
+        Переносит живые пары в новые массивы, выбрасывая надгробия.
+        Вместимость подбирается так, чтобы заполнение стало не больше двух третей
+        допустимого: переполненная таблица растёт вдвое, а таблица, забитая
+        надгробиями, остаётся прежней или сжимается.
+        """
+        capacity = self._initial_size
+        while self._count * 3 > self.max_load_factor * capacity * 2:
+            capacity *= 2
+
+        old_keys, old_values, old_hashes = self._keys, self._values, self._hashes
+        self._allocate(capacity)
+        keys, values, hashes, mask = self._keys, self._values, self._hashes, self._mask
+        for i, k in enumerate(old_keys):
+            if k is _EMPTY or k is _DELETED:
+                continue
+            h = old_hashes[i]
+            index = (h ^ (h >> 16)) & mask
+            while keys[index] is not _EMPTY:
+                index = (index + 1) & mask
+            keys[index] = k
+            values[index] = old_values[i]
+            hashes[index] = h
+        self._used = self._count
+
+    # =======================
+    # Основные операции
+    # =======================
+
+    def insert(self, key, value):
+        """
+        Вставка пары ключ-значение. Если ключ уже существует,
+        меняется только значение в его ячейке.
+        """
+        h = hash(key)
+        keys, hashes, mask = self._keys, self._hashes, self._mask
+        index = (h ^ (h >> 16)) & mask
+        tombstone = -1
+        while True:
+            k = keys[index]
+            if k is _EMPTY:
+                break
+            if k is _DELETED:
+                if tombstone < 0:
+                    tombstone = index
+            elif k is key or (hashes[index] == h and k == key):
+                self._values[index] = value
+                return
+            index = (index + 1) & mask
+
+        if tombstone >= 0:
+            index = tombstone
+        else:
+            self._used += 1
+        keys[index] = key
+        self._values[index] = value
+        hashes[index] = h
+        self._count += 1
+        if self._used > self.max_load_factor * self.size:
+            self._rebuild()
+
+    def get(self, key):
+        """
+        Получение значения по ключу. Возвращает значение, если ключ найден, иначе None.
+        """
+        # Цикл _find повторён здесь: get — самая частая операция
+        h = hash(key)
+        keys, hashes, mask = self._keys, self._hashes, self._mask
+        index = (h ^ (h >> 16)) & mask
+        while True:
+            k = keys[index]
+            if k is key:
+                return self._values[index]
+            if k is _EMPTY:
+                return None
+            if hashes[index] == h and k is not _DELETED and k == key:
+                return self._values[index]
+            index = (index + 1) & mask
+
+    def delete(self, key):
+        """
+        Удаление пары по ключу. Если ключ не найден, ничего не происходит.
+        """
+        index = self._find(key, hash(key))
+        if index < 0:
+            return
+
+        keys, mask = self._keys, self._mask
+        keys[index] = _DELETED
+        self._values[index] = None
+        self._count -= 1
+
+        # Если следом идёт пустая ячейка, надгробия в конце цепочки не нужны
+        while keys[index] is _DELETED and keys[(index + 1) & mask] is _EMPTY:
+            keys[index] = _EMPTY
+            self._used -= 1
+            index = (index - 1) & mask
+
+    def contains(self, key):
+        """
+        Проверка наличия ключа. Возвращает True, если ключ есть в таблице.
+        """
+        return self._find(key, hash(key)) >= 0
+
+    def __contains__(self, key):
+        """
+        Проверка наличия ключа: key in table.
+        """
+        return self._find(key, hash(key)) >= 0
+
+    def count(self):
+        """
+        Возвращает количество пар в таблице за O(1).
+        """
+        return self._count
+
+    def __len__(self):
+        """
+        Возвращает количество пар в таблице за O(1).
+        """
+        return self._count
+
+    def load_factor(self):
+        """
+        Возвращает долю ячеек, занятых живыми парами.
+        """
+        return self._count / self.size
+
+    def __str__(self):
+        """
+        Возвращает строковое представление таблицы: занятые ячейки с индексами.
+        """
+        return '\n'.join(f'{i}: {(k, self._values[i])}' for i, k in enumerate(self._keys)
+                         if k is not _EMPTY and k is not _DELETED)
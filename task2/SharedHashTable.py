@@ -0,0 +1,431 @@
+import mmap
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировка байта файла через msvcrt
+    fcntl = None
+    import msvcrt
+
+FILE_MAGIC = b'SHTB'
+FILE_VERSION = 1
+
+# Заголовок: метка, версия, резерв, число ячеек, живые пары, занятые ячейки
+# (с надгробиями), размер области байтов, занятая её часть, счётчик записей
+HEADER = struct.Struct('<4sHHQQQQQQ')
+_SLOTS, _COUNT, _USED, _HEAP_SIZE, _HEAP_TOP, _SEQ = range(3, 9)
+
+# Ячейка: смещения ключа и значения в области байтов, их длины, хэш ключа и состояние
+SLOT = struct.Struct('<QQIIIB3x')
+_STATE_OFFSET = 28
+_EMPTY, _FILLED, _DELETED = 0, 1, 2
+
+# Доля ячеек (вместе с надгробиями), после которой вставка новых ключей запрещена
+MAX_LOAD_FACTOR = 0.75
+
+# Вставка, которой не хватило места, сначала уплотняет таблицу, если это вернёт
+# хотя бы такую долю ячеек (надгробия) или области байтов (устаревшие значения);
+# иначе таблица считается заполненной — так почти полная таблица не уплотняется
+# заново на каждой вставке
+COMPACT_MIN_SHARE = 0.25
+
+# Сколько раз читатель повторяет поиск без блокировки, прежде чем
+# взять разделяемую блокировку файла и дождаться писателя
+READ_RETRIES = 100
+
+class SharedTableFullError(Exception):
+    """
+    В файле таблицы не осталось свободных ячеек или места в области байтов.
+    """
+
+def _lock_file(file, shared=False):
+    """
+    Захватывает блокировку файла: разделяемую (для чтения) или исключительную.
+    """
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        return
+    # msvcrt блокирует байты от текущей позиции и не знает разделяемых блокировок
+    file.seek(0)
+    while True:
+        try:
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:  # LK_LOCK сдаётся после десяти попыток раз в секунду
+            pass
+
+def _unlock_file(file):
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+        return
+    file.seek(0)
+    msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+class SharedHashTable:
+    """
+    Хэш-таблица в отображённом в память файле, общая для нескольких процессов.
+
+    Файл состоит из заголовка, массива ячеек фиксированной ширины (SLOT)
+    и области байтов, куда подряд дописываются ключи и значения. Один процесс
+    строит таблицу (create или from_items), остальные открывают тот же файл
+    (open): страницы файла лежат в страничном кэше ОС в одном экземпляре,
+    и get читает байты прямо из них, без десериализации.
+
+    Ключи и значения — bytes, bytearray или memoryview; строка кодируется в UTF-8,
+    остальные типы (в том числе int) вызывают TypeError. get возвращает bytes.
+    Индекс ячейки считается по zlib.crc32 ключа, а не по hash: hash байтов
+    в каждом процессе свой. Коллизии разрешаются линейным пробированием,
+    удаление оставляет надгробие.
+
+    Размер файла задаётся при создании и не меняется: переполнение ячеек
+    или области байтов вызывает SharedTableFullError. Новое значение ключа
+    дописывается в конец области, удаление оставляет надгробие. Когда место
+    кончается, вставка уплотняет таблицу (_compact): живые пары заново
+    раскладываются по ячейкам без надгробий, а их байты — подряд с начала
+    области. Уплотнение идёт под блокировкой записи, как любая запись.
+
+    Запись (insert, delete) идёт под исключительной блокировкой файла
+    (fcntl.flock, на Windows — msvcrt.locking) и потоковой блокировкой внутри
+    процесса. Чтение обычно блокировок не берёт: писатель делает счётчик
+    записей нечётным на время изменения, а читатель повторяет поиск, если
+    счётчик был нечётным или изменился, пока он читал. После READ_RETRIES
+    неудачных попыток читатель берёт разделяемую блокировку и читает под ней.
+
+    Блокировку файла ОС снимает и с процесса, который упал посреди записи,
+    но счётчик записей тогда остаётся нечётным. Читатель под блокировкой
+    его не ждёт, а следующий писатель выравнивает счётчик перед своей записью.
+    Недописанная запись при этом не откатывается: ячейка пишется одним
+    вызовом после байтов ключа и значения, но счётчики пар могут разойтись,
+    а падение посреди уплотнения теряет содержимое таблицы.
+    """
+
+    def __init__(self, file, mapped):
+        """
+        Используйте create, from_items или open.
+        """
+        self._file = file
+        self._mmap = mapped
+        self._lock = threading.Lock()
+        magic, version, _, slots, *_ = HEADER.unpack_from(mapped, 0)
+        if magic != FILE_MAGIC or version != FILE_VERSION:
+            raise ValueError("Файл не является хэш-таблицей этой версии")
+        self._slots = slots
+        self._mask = slots - 1
+        self._heap = HEADER.size + slots * SLOT.size
+
+    @classmethod
+    def create(cls, path: str, slots: int = 1024, heap_size: int = 1 << 20) -> 'SharedHashTable':
+        """
+        Создаёт пустую таблицу в файле path (существующий файл перезаписывается).
+        slots: число ячеек (округляется вверх до степени двойки); ключей
+               помещается не больше MAX_LOAD_FACTOR от этого числа.
+        heap_size: размер области байтов для ключей и значений.
+        """
+        capacity = 8
+        while capacity < slots:
+            capacity *= 2
+        size = HEADER.size + capacity * SLOT.size + heap_size
+        file = open(path, 'w+b')
+        file.truncate(size)
+        mapped = mmap.mmap(file.fileno(), size)
+        HEADER.pack_into(mapped, 0, FILE_MAGIC, FILE_VERSION, 0, capacity, 0, 0, heap_size, 0, 0)
+        return cls(file, mapped)
+
+    @classmethod
+    def from_items(cls, path: str, items, spare: float = 1.0) -> 'SharedHashTable':
+        """
+        Строит таблицу из пар (ключ, значение), подбирая размер под данные.
+        spare: запас на последующие вставки — доля от числа пар и объёма байтов.
+        """
+        items = [(cls._to_bytes(key), cls._to_bytes(value)) for key, value in items]
+        data = sum(len(key) + len(value) for key, value in items)
+        slots = int(len(items) * (1 + spare) / MAX_LOAD_FACTOR) + 1
+        table = cls.create(path, slots, max(1, int(data * (1 + spare))))
+        with table._writing():
+            for key, value in items:
+                table._insert(key, value)
+        return table
+
+    @classmethod
+    def open(cls, path: str) -> 'SharedHashTable':
+        """
+        Открывает таблицу, созданную другим процессом, для чтения и записи.
+        """
+        file = open(path, 'r+b')
+        return cls(file, mmap.mmap(file.fileno(), 0))
+
+    def close(self) -> None:
+        """
+        Закрывает отображение и файл. Данные остаются в файле.
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+
+    def __enter__(self) -> 'SharedHashTable':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # =======================
+    # Внутреннее устройство
+    # =======================
+
+    @staticmethod
+    def _to_bytes(data) -> bytes:
+        """
+        Приводит ключ или значение к bytes. bytes(int) дал бы буфер из нулей,
+        поэтому принимаются только строки и байтовые типы.
+        """
+        if isinstance(data, str):
+            return data.encode()
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return bytes(data)
+        raise TypeError(f"Ключ и значение должны быть str или bytes, а не {type(data).__name__}")
+
+    def _header(self, field: int) -> int:
+        return struct.unpack_from('<Q', self._mmap, 8 * (field - 2))[0]
+
+    def _set_header(self, field: int, value: int) -> None:
+        struct.pack_into('<Q', self._mmap, 8 * (field - 2), value)
+
+    @contextmanager
+    def _writing(self):
+        """
+        Захватывает блокировки записи и держит счётчик записей нечётным.
+        """
+        with self._lock:
+            _lock_file(self._file)
+            try:
+                seq = self._header(_SEQ)
+                seq += seq & 1  # Нечётный счётчик оставил писатель, упавший посреди записи
+                self._set_header(_SEQ, seq + 1)
+                try:
+                    yield
+                finally:
+                    self._set_header(_SEQ, seq + 2)
+            finally:
+                _unlock_file(self._file)
+
+    def _reading(self, read):
+        """
+        Выполняет чтение read() согласованно с писателями и возвращает его результат.
+        Обычно без блокировок: чтение повторяется, если счётчик записей был
+        нечётным или изменился за время чтения. После READ_RETRIES неудач
+        read() выполняется под разделяемой блокировкой файла: писателей нет,
+        и повторять не нужно, даже если счётчик нечётный после сбоя.
+        Потоковая блокировка обязательна: flock из другого потока на том же
+        дескрипторе не ждал бы писателя, а подменил бы его блокировку.
+        """
+        for _ in range(READ_RETRIES):
+            seq = self._header(_SEQ)
+            if seq & 1:
+                time.sleep(0)  # Идёт запись: уступаем процессор писателю
+                continue
+            result = read()
+            if self._header(_SEQ) == seq:
+                return result
+        with self._lock:
+            _lock_file(self._file, shared=True)
+            try:
+                return read()
+            finally:
+                _unlock_file(self._file)
+
+    def _read_value(self, key: bytes, h: int):
+        index, _ = self._find(key, h)
+        if index < 0:
+            return None
+        _, value_offset, _, _, value_len, _ = SLOT.unpack_from(self._mmap, HEADER.size + index * SLOT.size)
+        start = self._heap + value_offset
+        return self._mmap[start:start + value_len]
+
+    def _find(self, key: bytes, h: int):
+        """
+        Возвращает (индекс ячейки с ключом или -1, первое надгробие или пустая ячейка на пути).
+        """
+        mapped, heap, mask = self._mmap, self._heap, self._mask
+        index = h & mask
+        free = -1
+        while True:
+            offset = HEADER.size + index * SLOT.size
+            key_offset, _, slot_hash, key_len, _, state = SLOT.unpack_from(mapped, offset)
+            if state == _EMPTY:
+                return -1, free if free >= 0 else index
+            if state == _DELETED:
+                if free < 0:
+                    free = index
+            elif (slot_hash == h and key_len == len(key)
+                  and mapped[heap + key_offset:heap + key_offset + key_len] == key):
+                return index, free
+            index = (index + 1) & mask
+
+    def _append(self, data: bytes) -> int:
+        """
+        Дописывает байты в область байтов (место проверено заранее) и возвращает их смещение.
+        """
+        top = self._header(_HEAP_TOP)
+        self._mmap[self._heap + top:self._heap + top + len(data)] = data
+        self._set_header(_HEAP_TOP, top + len(data))
+        return top
+
+    def _live_pairs(self) -> list:
+        """
+        Возвращает копии пар (ключ, значение) из занятых ячеек.
+        """
+        mapped, heap = self._mmap, self._heap
+        pairs = []
+        for index in range(self._slots):
+            key_offset, value_offset, _, key_len, value_len, state = SLOT.unpack_from(
+                mapped, HEADER.size + index * SLOT.size)
+            if state == _FILLED:
+                pairs.append((mapped[heap + key_offset:heap + key_offset + key_len],
+                              mapped[heap + value_offset:heap + value_offset + value_len]))
+        return pairs
+
+    def _compact(self, pairs: list) -> None:
+        """
+        Заново раскладывает пары pairs (все живые пары таблицы) по пустым
+        ячейкам, а их байты — подряд с начала области байтов.
+        """
+        self._mmap[HEADER.size:self._heap] = bytes(self._slots * SLOT.size)
+        for field in (_COUNT, _USED, _HEAP_TOP):
+            self._set_header(field, 0)
+        for key, value in pairs:
+            h = zlib.crc32(key)
+            _, free = self._find(key, h)
+            self._store(free, key, value, h)
+
+    def _store(self, index: int, key: bytes, value: bytes, h: int) -> None:
+        """
+        Записывает новую пару в свободную ячейку index (пустую или надгробие).
+        """
+        offset = HEADER.size + index * SLOT.size
+        reused = SLOT.unpack_from(self._mmap, offset)[-1] == _DELETED
+        key_offset = self._append(key)
+        value_offset = self._append(value)
+        SLOT.pack_into(self._mmap, offset, key_offset, value_offset, h, len(key), len(value), _FILLED)
+        self._set_header(_COUNT, self._header(_COUNT) + 1)
+        if not reused:
+            self._set_header(_USED, self._header(_USED) + 1)
+
+    def _shortage(self, index: int, free: int, size: int):
+        """
+        Проверяет, хватит ли места на запись size байт (и новой ячейки, если
+        ключа нет и free — пустая ячейка). Возвращает описание нехватки или None.
+        """
+        if index < 0 and SLOT.unpack_from(self._mmap, HEADER.size + free * SLOT.size)[-1] == _EMPTY:
+            if self._header(_USED) + 1 > MAX_LOAD_FACTOR * self._slots:
+                return "Ячейки хэш-таблицы заполнены"
+        if self._header(_HEAP_TOP) + size > self._header(_HEAP_SIZE):
+            return "Область байтов хэш-таблицы заполнена"
+        return None
+
+    def _insert(self, key: bytes, value: bytes) -> None:
+        h = zlib.crc32(key)
+        index, free = self._find(key, h)
+        size = len(value) if index >= 0 else len(key) + len(value)
+        shortage = self._shortage(index, free, size)
+        if shortage:
+            # Уплотнение оправдано, только если вернёт заметную долю места
+            pairs = self._live_pairs()
+            tombstones = self._header(_USED) - len(pairs)
+            dead_bytes = self._header(_HEAP_TOP) - sum(len(k) + len(v) for k, v in pairs)
+            if (tombstones < COMPACT_MIN_SHARE * MAX_LOAD_FACTOR * self._slots
+                    and dead_bytes < COMPACT_MIN_SHARE * self._header(_HEAP_SIZE)):
+                raise SharedTableFullError(shortage)
+            self._compact(pairs)
+            index, free = self._find(key, h)
+            shortage = self._shortage(index, free, size)
+            if shortage:
+                raise SharedTableFullError(shortage)
+
+        if index >= 0:
+            offset = HEADER.size + index * SLOT.size
+            key_offset, _, _, key_len, _, _ = SLOT.unpack_from(self._mmap, offset)
+            SLOT.pack_into(self._mmap, offset, key_offset, self._append(value), h, key_len, len(value), _FILLED)
+        else:
+            self._store(free, key, value, h)
+
+    # =======================
+    # Основные операции
+    # =======================
+
+    def insert(self, key, value) -> None:
+        """
+        Вставка пары ключ-значение; значение существующего ключа заменяется.
+        """
+        key, value = self._to_bytes(key), self._to_bytes(value)
+        with self._writing():
+            self._insert(key, value)
+
+    def get(self, key):
+        """
+        Получение значения по ключу, обычно без блокировок.
+        Возвращает байты значения, если ключ найден, иначе None.
+
+        Значение возвращается копией (bytes), снятой до повторной проверки
+        счётчика записей, — это сознательный выбор. Копия проверена счётчиком
+        вместе с ячейкой, из которой взяты смещение и длина; memoryview на
+        отображение увидел бы байты, которые позже перепишет уплотнение,
+        и не дал бы закрыть таблицу (close бросает BufferError, пока на mmap
+        есть представления). Цена — копирование len(value) байт на каждый вызов.
+        """
+        key = self._to_bytes(key)
+        h = zlib.crc32(key)
+        return self._reading(lambda: self._read_value(key, h))
+
+    def delete(self, key) -> None:
+        """
+        Удаление пары по ключу. Если ключ не найден, ничего не происходит.
+        """
+        key = self._to_bytes(key)
+        with self._writing():
+            index, _ = self._find(key, zlib.crc32(key))
+            if index >= 0:
+                self._mmap[HEADER.size + index * SLOT.size + _STATE_OFFSET] = _DELETED
+                self._set_header(_COUNT, self._header(_COUNT) - 1)
+
+    def contains(self, key) -> bool:
+        """
+        Проверка наличия ключа. Возвращает True, если ключ есть в таблице.
+        """
+        return self.get(key) is not None
+
+    def __contains__(self, key) -> bool:
+        """
+        Проверка наличия ключа: key in table.
+        """
+        return self.contains(key)
+
+    def count(self) -> int:
+        """
+        Возвращает количество пар в таблице.
+        """
+        return self._header(_COUNT)
+
+    def __len__(self) -> int:
+        """
+        Возвращает количество пар в таблице.
+        """
+        return self._header(_COUNT)
+
+    def load_factor(self) -> float:
+        """
+        Возвращает долю ячеек, занятых живыми парами.
+        """
+        return self._header(_COUNT) / self._slots
+
+    def items(self) -> list:
+        """
+        Возвращает список пар (ключ, значение) в байтах — согласованный снимок,
+        снятый так же, как get: без блокировок, пока не мешают писатели,
+        и не сбивая счётчик записей читателям.
+        """
+        return self._reading(self._live_pairs)
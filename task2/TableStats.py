@@ -0,0 +1,89 @@
+from collections import Counter
+from TreeBucket import TreeBucket
+
+class TableStats:
+    """
+    Статистика работы хэш-таблицы, включаемая по требованию.
+
+    Пока сбор выключен, таблица не делает ни одной лишней проверки:
+    при включении методы insert, get и delete подменяются обёртками на уровне
+    экземпляра, при выключении обёртки удаляются.
+
+    Обёртка перед вызовом исходного метода считает пробы — сколько пар
+    ячейки пришлось сравнить с ключом (в ячейке-дереве — узлы на пути и пары
+    с тем же хэшем). Занятость ячеек, самая длинная цепочка, число ячеек-деревьев
+    и коэффициент заполнения считаются при выгрузке обходом таблицы.
+    """
+
+    OPERATIONS = ('insert', 'get', 'delete')
+
+    def __init__(self, table):
+        """
+        table: хэш-таблица, за которой ведётся статистика.
+        """
+        self.table = table
+        self.enabled = False
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Обнуляет накопленные счётчики проб.
+        """
+        self.probes = {name: Counter() for name in self.OPERATIONS}
+
+    def enable(self) -> None:
+        """
+        Подключает обёртки к таблице.
+        """
+        if self.enabled:
+            return
+        vars(self.table).update((name, self._count_probes(name, getattr(self.table, name)))
+                                for name in self.OPERATIONS)
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Отключает обёртки; накопленные счётчики сохраняются.
+        """
+        attributes = vars(self.table)
+        for name in self.OPERATIONS:
+            attributes.pop(name, None)
+        self.enabled = False
+
+    def _count_probes(self, name: str, operation):
+        histogram = self.probes[name]
+
+        def wrapper(key, *args):
+            histogram[self.table._probe_count(key)] += 1
+            return operation(key, *args)
+        return wrapper
+
+    def as_dict(self) -> dict:
+        """
+        Возвращает статистику обычным словарем из чисел и вложенных словарей.
+        """
+        buckets = list(self.table._buckets())
+        occupancy = Counter(map(len, buckets))
+        count = len(self.table)
+        probes = {}
+        for name, histogram in self.probes.items():
+            calls = sum(histogram.values())
+            total = sum(probes * times for probes, times in histogram.items())
+            probes[name] = {
+                'calls': calls,
+                'total': total,
+                'mean': total / calls if calls else 0.0,
+                'histogram': dict(sorted(histogram.items())),
+            }
+        return {
+            'enabled': self.enabled,
+            'size': self.table.size,
+            'count': count,
+            'load_factor': self.table.load_factor(),
+            'rehashing': self.table._old_table is not None,
+            'longest_chain': max(occupancy),
+            'empty_buckets': occupancy[0],
+            'tree_buckets': sum(type(bucket) is TreeBucket for bucket in buckets),
+            'bucket_histogram': dict(sorted(occupancy.items())),
+            'probes': probes,
+        }
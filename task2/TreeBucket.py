@@ -0,0 +1,294 @@
+"""
+Ячейка-дерево для HashTable и минимальное AVL-дерево под неё.
+
+AVLTree из task1 здесь не подходит: пакеты task1 и task2 независимы (task2
+ничего не импортирует из task1), а AVLTree хранит только натуральные числа —
+отрицательный хэш или ключ с привязанным значением в него не положить.
+Поэтому ниже своё AVL-дерево, сведённое к минимуму: узел с ключом и полезной
+нагрузкой, два поворота, балансировка, поиск, вставка, удаление и обход.
+Оно одно обслуживает и внешнее дерево по хэшам, и внутренние деревья групп.
+"""
+
+# Типы, у которых «<» — полный порядок, согласованный с «==»: по таким ключам
+# группа с одним хэшем упорядочивается. У float он нарушается на NaN,
+# у frozenset «<» — включение, а не порядок, поэтому остальные типы идут списком.
+_ORDERED_TYPES = (int, str, bytes)
+
+class _Node:
+    # Узел упорядочен по полю key: во внешнем дереве это хэш, а item — группа
+    # ключей с этим хэшем; во внутреннем дереве группы это сам ключ, а item — значение
+    __slots__ = ('key', 'item', 'height', 'left', 'right')
+
+    def __init__(self, key, item):
+        self.key = key
+        self.item = item
+        self.height = 1
+        self.left = None
+        self.right = None
+
+def _height(node):
+    return node.height if node else 0
+
+def _update_height(node):
+    node.height = 1 + max(_height(node.left), _height(node.right))
+
+def _rotate_right(root):
+    new_root = root.left
+    root.left = new_root.right
+    new_root.right = root
+    _update_height(root)
+    _update_height(new_root)
+    return new_root
+
+def _rotate_left(root):
+    new_root = root.right
+    root.right = new_root.left
+    new_root.left = root
+    _update_height(root)
+    _update_height(new_root)
+    return new_root
+
+def _balance(node):
+    """
+    Восстанавливает баланс узла после вставки или удаления в его поддереве.
+    Возвращает новую вершину поддерева.
+    """
+    _update_height(node)
+    balance = _height(node.left) - _height(node.right)
+    if balance > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(node.left)
+        return _rotate_right(node)
+    if balance < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(node.right)
+        return _rotate_left(node)
+    return node
+
+def _descend(node, key):
+    """
+    Ищет ключ key. Возвращает (узел с ключом или None, число пройденных узлов).
+    """
+    visited = 0
+    while node:
+        visited += 1
+        if key < node.key:
+            node = node.left
+        elif node.key < key:
+            node = node.right
+        else:
+            return node, visited
+    return None, visited
+
+def _find(node, key):
+    """
+    Возвращает узел с ключом key или None.
+    """
+    return _descend(node, key)[0]
+
+def _insert(node, new):
+    """
+    Вставляет узел new (его ключа в поддереве нет). Возвращает новую вершину.
+    """
+    if not node:
+        return new
+    if new.key < node.key:
+        node.left = _insert(node.left, new)
+    else:
+        node.right = _insert(node.right, new)
+    return _balance(node)
+
+def _delete(node, key):
+    """
+    Удаляет узел с ключом key (он точно есть в поддереве). Возвращает новую вершину.
+    """
+    if key < node.key:
+        node.left = _delete(node.left, key)
+    elif node.key < key:
+        node.right = _delete(node.right, key)
+    else:
+        if not node.left or not node.right:
+            return node.left or node.right
+        # Место удаляемого узла занимает наименьший узел правого поддерева
+        successor = node.right
+        while successor.left:
+            successor = successor.left
+        node.right = _delete(node.right, successor.key)
+        successor.left, successor.right = node.left, node.right
+        node = successor
+    return _balance(node)
+
+def _nodes(node):
+    """
+    Перечисляет узлы поддерева по возрастанию ключей.
+    """
+    stack = []
+    while stack or node:
+        while node:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node
+        node = node.right
+
+class TreeBucket:
+    """
+    Ячейка хэш-таблицы в виде AVL-дерева — на неё заменяется слишком длинный список пар.
+
+    Ключи таблицы не обязаны сравниваться на «больше-меньше», поэтому внешнее
+    дерево упорядочено по полному значению hash(key). Ключи с одинаковым хэшем
+    лежат во внутреннем AVL-дереве, упорядоченном по самим ключам, — так даже
+    ключи, подобранные под один полный хэш, обходятся O(log n) на операцию.
+    Упорядочить группу можно, только если все её ключи одного типа
+    из _ORDERED_TYPES; иначе группа — список пар, который просматривается подряд.
+
+    Интерфейс повторяет то, что таблица делает со списком пар: итерация
+    по парам (в порядке хэшей), len и строковое представление как у списка.
+    """
+
+    def __init__(self, pairs=()):
+        """
+        pairs: начальные пары (ключ, значение) с различными ключами.
+        """
+        self._root = None
+        self._count = 0
+        for key, value in pairs:
+            self.insert(key, value, hash(key))
+
+    @staticmethod
+    def _find_in_group(group, key):
+        """
+        Возвращает узел внутреннего дерева с ключом или None. Ключ другого
+        типа (например, 1.0 в группе int) может быть равен ключу группы,
+        но сравнивать его на порядок нельзя — такое дерево просматривается подряд.
+        """
+        if type(key) is type(group.key):
+            return _find(group, key)
+        return next((node for node in _nodes(group) if node.key == key), None)
+
+    # =======================
+    # Операции ячейки
+    # =======================
+
+    def _pair(self, key, h):
+        """
+        Возвращает пару (ключ, значение) по ключу с хэшем h или None.
+        """
+        node = _find(self._root, h)
+        if not node:
+            return None
+        group = node.item
+        if type(group) is list:
+            return next((pair for pair in group if pair[0] == key), None)
+        found = self._find_in_group(group, key)
+        return (found.key, found.item) if found else None
+
+    def get(self, key, h):
+        """
+        Возвращает значение по ключу с хэшем h или None, если ключа нет.
+        """
+        pair = self._pair(key, h)
+        return pair[1] if pair else None
+
+    def contains(self, key, h):
+        """
+        Проверка наличия ключа с хэшем h.
+        """
+        return self._pair(key, h) is not None
+
+    def insert(self, key, value, h):
+        """
+        Вставляет пару или обновляет значение существующего ключа.
+        Возвращает True, если ключ добавлен впервые.
+        """
+        node = _find(self._root, h)
+        if not node:
+            group = _Node(key, value) if type(key) in _ORDERED_TYPES else [(key, value)]
+            self._root = _insert(self._root, _Node(h, group))
+            self._count += 1
+            return True
+
+        group = node.item
+        if type(group) is not list:
+            found = self._find_in_group(group, key)
+            if found:
+                found.item = value
+                return False
+            if type(key) is type(group.key):
+                node.item = _insert(group, _Node(key, value))
+                self._count += 1
+                return True
+            # Ключ другого типа: дальше группа — список пар
+            group = node.item = [(n.key, n.item) for n in _nodes(group)]
+
+        for i, (k, v) in enumerate(group):
+            if k == key:
+                group[i] = (key, value)
+                return False
+        group.append((key, value))
+        self._count += 1
+        return True
+
+    def delete(self, key, h):
+        """
+        Удаляет пару по ключу с хэшем h. Возвращает True, если ключ был в ячейке.
+        """
+        node = _find(self._root, h)
+        if not node:
+            return False
+        group = node.item
+        if type(group) is list:
+            for i, (k, v) in enumerate(group):
+                if k == key:
+                    del group[i]
+                    break
+            else:
+                return False
+            empty = not group
+        else:
+            found = self._find_in_group(group, key)
+            if not found:
+                return False
+            node.item = _delete(group, found.key)
+            empty = not node.item
+        if empty:
+            self._root = _delete(self._root, h)
+        self._count -= 1
+        return True
+
+    def probes(self, key, h):
+        """
+        Возвращает число сравнений при поиске ключа: пройденные узлы внешнего
+        дерева и узлы внутреннего дерева (или пары списка) группы с тем же хэшем.
+        """
+        node, probes = _descend(self._root, h)
+        if not node:
+            return probes
+        group = node.item
+        if type(group) is list:
+            for k, v in group:
+                probes += 1
+                if k == key:
+                    break
+            return probes
+        if type(key) is not type(group.key):
+            return probes + sum(1 for _ in _nodes(group))
+        return probes + _descend(group, key)[1]
+
+    def __iter__(self):
+        """
+        Перечисляет пары (ключ, значение) в порядке возрастания хэшей.
+        """
+        for node in _nodes(self._root):
+            group = node.item
+            if type(group) is list:
+                yield from group
+            else:
+                for inner in _nodes(group):
+                    yield inner.key, inner.item
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return repr(list(self))
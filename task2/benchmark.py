@@ -0,0 +1,224 @@
+"""
+Замеры хеш-таблиц: цепочечной HashTable и OpenHashTable с открытой адресацией.
+
+Запуск:
+    python benchmark.py memory                       # байт на пару при 100K и 1M пар
+    python benchmark.py memory --sizes 10000 1000000
+    python benchmark.py lookup                       # get в секунду: попадания и промахи
+    python benchmark.py lookup --sizes 1000 1000000
+    python benchmark.py bulk                         # insert/get/delete по одной и пачкой
+    python benchmark.py concurrency --threads 1 2 4 8 --stripes 1 16  # ConcurrentHashTable
+"""
+import argparse
+import gc
+import random
+import threading
+import time
+import tracemalloc
+from ConcurrentHashTable import ConcurrentHashTable
+from HashTable import HashTable
+from OpenHashTable import OpenHashTable
+
+ENGINES = {
+    'HashTable (цепочки)': HashTable,
+    'OpenHashTable (массивы)': OpenHashTable,
+}
+
+def build(engine, keys: list):
+    """
+    Строит таблицу, в которой каждый ключ отображается сам в себя.
+    """
+    table = engine()
+    for key in keys:
+        table.insert(key, key)
+    return table
+
+# =======================
+# Память
+# =======================
+
+def measure_memory(engine, size: int) -> float:
+    """
+    Строит таблицу из size пар и возвращает число байт на пару по данным
+    tracemalloc. Ключи создаются до начала замера, поэтому считается только
+    собственная память таблицы: ячейки, цепочки или массивы.
+    """
+    keys = list(range(size))
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    table = build(engine, keys)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(table) == size
+    return (after - before) / size
+
+def run_memory(sizes: list) -> None:
+    """
+    Печатает таблицу «движок × размер → байт на пару».
+    """
+    print(f"{'движок':<28}" + ''.join(f'{size:>14,}' for size in sizes))
+    for name, engine in ENGINES.items():
+        row = ''.join(f'{measure_memory(engine, size):>14.1f}' for size in sizes)
+        print(f'{name:<28}' + row)
+
+# =======================
+# Поиск
+# =======================
+
+def measure_lookup(engine, size: int, ops: int, seed: int) -> tuple:
+    """
+    Строит таблицу из size случайных ключей и возвращает число get в секунду
+    для попаданий и для промахов (по ops запросов каждого вида).
+    """
+    rng = random.Random(seed)
+    keys = rng.sample(range(4 * size), 2 * size)
+    present, absent = keys[:size], keys[size:]
+    table = build(engine, present)
+    hits = [rng.choice(present) for _ in range(ops)]
+    misses = [rng.choice(absent) for _ in range(ops)]
+
+    rates = []
+    gc.disable()
+    try:
+        for queries in (hits, misses):
+            get = table.get
+            start = time.perf_counter()
+            for key in queries:
+                get(key)
+            rates.append(ops / (time.perf_counter() - start))
+    finally:
+        gc.enable()
+    return tuple(rates)
+
+def run_lookup(sizes: list, ops: int, seed: int) -> None:
+    """
+    Печатает число get в секунду для каждого движка и размера.
+    """
+    print(f"{'движок':<28}{'размер':>12}{'попадания, оп/с':>18}{'промахи, оп/с':>16}")
+    for size in sizes:
+        for name, engine in ENGINES.items():
+            hit, miss = measure_lookup(engine, size, ops, seed)
+            print(f'{name:<28}{size:>12,}{hit:>18,.0f}{miss:>16,.0f}')
+
+# =======================
+# Пакетные операции
+# =======================
+
+def measure_bulk(size: int, seed: int) -> dict:
+    """
+    Замеряет время (с) вставки, чтения и удаления size случайных ключей
+    в HashTable по одному ключу и пакетными методами.
+    """
+    keys = random.Random(seed).sample(range(10 * size), size)
+    pairs = [(key, key) for key in keys]
+    single, batch = HashTable(), HashTable()
+    steps = {
+        'insert': (lambda: [single.insert(key, value) for key, value in pairs],
+                   lambda: batch.insert_many(pairs)),
+        'get': (lambda: [single.get(key) for key in keys],
+                lambda: batch.get_many(keys)),
+        'delete': (lambda: [single.delete(key) for key in keys],
+                   lambda: batch.delete_many(keys)),
+    }
+    timings = {}
+    for name, variants in steps.items():
+        timings[name] = []
+        for run in variants:
+            start = time.perf_counter()
+            run()
+            timings[name].append(time.perf_counter() - start)
+    return timings
+
+def run_bulk(sizes: list, seed: int) -> None:
+    """
+    Печатает время операций по одной и пачкой для каждого размера.
+    """
+    print(f"{'размер':>12} {'операция':<10}{'по одной, с':>14}{'пачкой, с':>12}")
+    for size in sizes:
+        for name, (single, batch) in measure_bulk(size, seed).items():
+            print(f'{size:>12,} {name:<10}{single:>14.3f}{batch:>12.3f}')
+
+# =======================
+# Многопоточность
+# =======================
+
+def measure_throughput(threads: int, stripes: int, size: int, ops: int, read_ratio: float) -> float:
+    """
+    Запускает threads потоков над общей ConcurrentHashTable из size пар
+    с stripes полосами; каждый поток делает ops операций (доля чтений — read_ratio).
+    Возвращает суммарное число операций в секунду.
+    """
+    table = ConcurrentHashTable(size=size, stripes=stripes)
+    for key in range(size):
+        table.insert(key, key)
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        keys = [rng.randint(0, 2 * size) for _ in range(ops)]
+        reads = [rng.random() < read_ratio for _ in range(ops)]
+        barrier.wait()
+        for key, is_read in zip(keys, reads):
+            if is_read:
+                table.get(key)
+            elif key & 1:
+                table.insert(key, key)
+            else:
+                table.delete(key)
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * ops / (time.perf_counter() - start)
+
+def run_concurrency(thread_counts: list, stripe_counts: list, size: int, ops: int, read_ratio: float) -> None:
+    """
+    Печатает пропускную способность для каждого числа потоков и полос
+    (одна полоса — то же, что общая блокировка на всю таблицу).
+    """
+    print(f"{'потоков':>8}" + ''.join(f"{f'{stripes} полос, оп/с':>22}" for stripes in stripe_counts))
+    for threads in thread_counts:
+        row = ''.join(f'{measure_throughput(threads, stripes, size, ops, read_ratio):>22,.0f}'
+                      for stripes in stripe_counts)
+        print(f'{threads:>8}' + row)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Замеры хеш-таблиц')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    memory = commands.add_parser('memory', help='байт на пару')
+    memory.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+
+    lookup = commands.add_parser('lookup', help='скорость get')
+    lookup.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    lookup.add_argument('--ops', type=int, default=200_000, help='запросов каждого вида')
+    lookup.add_argument('--seed', type=int, default=0)
+
+    bulk = commands.add_parser('bulk', help='пакетные операции HashTable')
+    bulk.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    bulk.add_argument('--seed', type=int, default=0)
+
+    concurrency = commands.add_parser('concurrency', help='ConcurrentHashTable по числу потоков и полос')
+    concurrency.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    concurrency.add_argument('--stripes', type=int, nargs='+', default=[1, 16])
+    concurrency.add_argument('--size', type=int, default=100_000)
+    concurrency.add_argument('--ops', type=int, default=50_000, help='операций на поток')
+    concurrency.add_argument('--read-ratio', type=float, default=0.9)
+
+    args = parser.parse_args()
+    if args.command == 'memory':
+        run_memory(args.sizes)
+    elif args.command == 'lookup':
+        run_lookup(args.sizes, args.ops, args.seed)
+    elif args.command == 'bulk':
+        run_bulk(args.sizes, args.seed)
+    elif args.command == 'concurrency':
+        run_concurrency(args.threads, args.stripes, args.size, args.ops, args.read_ratio)
+
+if __name__ == '__main__':
+    main()
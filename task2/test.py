@@ -1,65 +1,554 @@
-import pytest
-from HashTable import HashTable
-
-def test_insert_and_get():
-    ht = HashTable()
-    ht.insert("apple", 5)
-    ht.insert("banana", 10)
-    
-    assert ht.get("apple") == 5
-    assert ht.get("banana") == 10
-    assert ht.get("orange") is None
-
-def test_insert_update():
-    ht = HashTable()
-    ht.insert("apple", 5)
-    ht.insert("apple", 10)
-    
-    assert ht.get("apple") == 10
-
-def test_delete():
-    ht = HashTable()
-    ht.insert("apple", 5)
-    ht.insert("banana", 10)
-    
-    ht.delete("apple")
-    assert ht.get("apple") is None
-    assert ht.get("banana") == 10
-
-def test_delete_nonexistent_key():
-    ht = HashTable()
-    ht.insert("apple", 5)
-    
-    ht.delete("banana")  # Удаление несуществующего ключа
-    assert ht.get("apple") == 5
-
-def test_collision_handling():
-    ht = HashTable(size=1)  # Все ключи будут попадать в однe ячейку (проверка решения коллизий)
-    ht.insert("apple", 5)
-    ht.insert("banana", 10)
-    
-    assert ht.get("apple") == 5
-    assert ht.get("banana") == 10
-
-def test_empty_table():
-    ht = HashTable()
-    
-    assert ht.get("apple") is None
-    ht.delete("apple")  # Удаление из пустой таблицы
-
-def test_large_table():
-    ht = HashTable(size=100)
-    for i in range(1000):
-        ht.insert(f"key{i}", i)
-    
-    assert ht.get("key0") == 0
-    assert ht.get("key999") == 999
-    assert ht.get("key1000") is None
-
-def test_string_representation():
-    ht = HashTable(size=1)
-    ht.insert("apple", 5)
-    ht.insert("banana", 10)
-    
-    expected_output = "0: [('apple', 5), ('banana', 10)]"
-    assert str(ht) == expected_output
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import pytest
+from ConcurrentHashTable import ConcurrentHashTable
+from HashTable import HashTable, REHASH_STEP, TREEIFY_THRESHOLD, UNTREEIFY_THRESHOLD
+from LRUCache import LRUCache
+from OpenHashTable import OpenHashTable
+from SharedHashTable import SharedHashTable, SharedTableFullError, _SEQ
+from TreeBucket import TreeBucket
+
+def _random_dict_operations(table, seed, steps, make_key, invariant=None):
+    """
+    Случайно вставляет и удаляет ключи make_key(rng) в таблице и в словаре-образце,
+    после каждого шага сверяя с образцом get и len и проверяя invariant(),
+    если он задан. Значение ключа — номер шага. Возвращает образец.
+    """
+    rng = random.Random(seed)
+    expected = {}
+    for step in range(steps):
+        key = make_key(rng)
+        if rng.random() < 0.6:
+            table.insert(key, step)
+            expected[key] = step
+        else:
+            table.delete(key)
+            expected.pop(key, None)
+        assert table.get(key) == expected.get(key) and len(table) == len(expected)
+        if invariant:
+            assert invariant()
+    return expected
+
+def test_insert_and_get():
+    ht = HashTable()
+    ht.insert("apple", 5)
+    ht.insert("banana", 10)
+    
+    assert ht.get("apple") == 5
+    assert ht.get("banana") == 10
+    assert ht.get("orange") is None
+
+def test_insert_update():
+    ht = HashTable()
+    ht.insert("apple", 5)
+    ht.insert("apple", 10)
+    
+    assert ht.get("apple") == 10
+
+def test_delete():
+    ht = HashTable()
+    ht.insert("apple", 5)
+    ht.insert("banana", 10)
+    
+    ht.delete("apple")
+    assert ht.get("apple") is None
+    assert ht.get("banana") == 10
+
+def test_delete_nonexistent_key():
+    ht = HashTable()
+    ht.insert("apple", 5)
+    
+    ht.delete("banana")  # Удаление несуществующего ключа
+    assert ht.get("apple") == 5
+
+def test_collision_handling():
+    ht = HashTable(size=1)  # Все ключи будут попадать в однe ячейку (проверка решения коллизий)
+    ht.insert("apple", 5)
+    ht.insert("banana", 10)
+    
+    assert ht.get("apple") == 5
+    assert ht.get("banana") == 10
+
+def test_empty_table():
+    ht = HashTable()
+    
+    assert ht.get("apple") is None
+    ht.delete("apple")  # Удаление из пустой таблицы
+
+def test_large_table():
+    ht = HashTable(size=100)
+    for i in range(1000):
+        ht.insert(f"key{i}", i)
+    
+    assert ht.get("key0") == 0
+    assert ht.get("key999") == 999
+    assert ht.get("key1000") is None
+
+def test_string_representation():
+    ht = HashTable(size=1)
+    ht.insert("apple", 5)
+    ht.insert("banana", 10)
+    
+    expected_output = "0: [('apple', 5), ('banana', 10)]"
+    assert str(ht) == expected_output
+
+def test_stats():
+    ht = HashTable(size=4)
+    assert ht.stats() == {}
+    ht.enable_stats()
+    for i in range(8):
+        ht.insert(i, i)  # hash(i) == i: по две пары в каждой ячейке
+    ht.get(5)
+    ht.get(100)
+    ht.delete(0)
+
+    stats = ht.stats()
+    assert stats['count'] == 7
+    assert stats['load_factor'] == 7 / 4
+    assert stats['longest_chain'] == 2
+    assert stats['bucket_histogram'] == {1: 1, 2: 3}
+    assert stats['probes']['insert'] == {'calls': 8, 'total': 4, 'mean': 0.5, 'histogram': {0: 4, 1: 4}}
+    assert stats['probes']['get']['histogram'] == {2: 2}  # 5 — второй в ячейке, 100 — промах по ячейке из двух
+    assert stats['probes']['delete']['total'] == 1
+
+    ht.disable_stats()
+    assert 'get' not in vars(ht)
+    ht.get(1)
+    assert ht.stats()['probes']['get']['calls'] == 2
+
+def test_auto_resize():
+    ht = HashTable(size=4)
+    for i in range(1000):
+        ht.insert(f"key{i}", i)
+        assert ht.get(f"key{i // 2}") == i // 2  # Поиск работает и посреди перехеширования
+
+    assert len(ht) == ht.count() == 1000
+    assert ht.size == 512
+    assert ht.load_factor() <= ht.max_load_factor
+    assert all(ht.get(f"key{i}") == i for i in range(1000))
+    assert "key5" in ht and "key1000" not in ht
+
+    ht.insert("key5", -5)
+    assert len(ht) == 1000 and ht.get("key5") == -5
+
+def test_incremental_rehash():
+    ht = HashTable(size=64)
+    for i in range(129):
+        ht.insert(i, i)  # 129-я пара превышает заполнение 2.0 и запускает перенос
+
+    assert ht.size == 128 and ht._old_table is not None
+    ht.get(0)
+    assert ht._rehash_index == REHASH_STEP  # За одну операцию переносится лишь несколько ячеек
+    assert sorted(pair for bucket in ht._buckets() for pair in bucket) == [(i, i) for i in range(129)]
+
+    for _ in range(64 // REHASH_STEP):
+        ht.get(0)
+    assert ht._old_table is None
+    assert all(ht.get(i) == i for i in range(129))
+
+def test_shrink():
+    with pytest.raises(ValueError):
+        HashTable(max_load_factor=2.0, min_load_factor=0.5)
+
+    ht = HashTable(size=8, min_load_factor=0.25)
+    for i in range(1000):
+        ht.insert(i, i)
+    grown = ht.size
+    for i in range(990):
+        ht.delete(i)
+    assert 8 <= ht.size < grown
+    assert len(ht) == 10
+    assert [ht.get(i) for i in range(990, 1000)] == list(range(990, 1000))
+    assert str(ht).count('\n') == ht.size - 1
+
+def test_open_hash_table():
+    with pytest.raises(ValueError):
+        OpenHashTable(max_load_factor=1.0)
+
+    ht = OpenHashTable()
+    ht.insert("apple", 5)
+    ht.insert("banana", 10)
+    ht.insert("apple", 15)
+    assert ht.get("apple") == 15 and ht.get("cherry") is None
+    assert "banana" in ht and ht.contains("apple") and "cherry" not in ht
+    assert len(ht) == ht.count() == 2
+
+    ht.delete("apple")
+    ht.delete("cherry")
+    assert ht.get("apple") is None and ht.get("banana") == 10
+    assert len(ht) == 1
+    assert str(ht).endswith("('banana', 10)")
+
+def test_open_hash_table_collisions():
+    ht = OpenHashTable(size=8)
+    keys = [i * 8 for i in range(5)]  # Одинаковые младшие биты хэша
+    for key in keys:
+        ht.insert(key, -key)
+    assert ht.size == 8
+    ht.delete(keys[1])
+    assert [ht.get(key) for key in keys] == [0, None, -16, -24, -32]  # Надгробие не рвёт цепочку
+
+    ht.insert(keys[1], 1)
+    assert ht._used == 5  # Вставка заняла надгробие
+    for key in keys:
+        ht.delete(key)
+    assert len(ht) == 0 and ht._used == 0  # Надгробия в конце цепочки убраны
+
+def test_open_hash_table_random():
+    ht = OpenHashTable()
+    expected = _random_dict_operations(ht, seed=7, steps=20000, make_key=lambda rng: rng.randint(0, 500),
+                                       invariant=lambda: ht._used <= ht.max_load_factor * ht.size)
+    assert all(ht.get(key) == expected.get(key) for key in range(501))
+    assert ht.size < 4 * len(expected)  # Надгробия не раздувают таблицу
+
+def test_treeify_bucket():
+    ht = HashTable(size=1, max_load_factor=1000)  # Все ключи в одной ячейке, таблица не растёт
+    for i in range(TREEIFY_THRESHOLD):
+        ht.insert(i, i)
+    assert type(ht.table[0]) is list
+
+    for i in range(TREEIFY_THRESHOLD, 500):
+        ht.insert(i, i)
+    assert type(ht.table[0]) is TreeBucket
+    ht.insert(7, -7)
+    assert len(ht) == 500 and ht.get(7) == -7 and ht.get(500) is None
+    assert 499 in ht and 500 not in ht
+    assert ht._probe_count(499) <= 10  # Путь в AVL-дереве вместо прохода по 500 парам
+    assert str(ht).startswith('0: [(0, 0), (1, 1)')
+
+    for i in range(500 - UNTREEIFY_THRESHOLD - 1):
+        ht.delete(i)
+    assert type(ht.table[0]) is TreeBucket
+    ht.delete(500 - UNTREEIFY_THRESHOLD - 1)
+    ht.delete(1000)
+    assert ht.table[0] == [(i, i) for i in range(500 - UNTREEIFY_THRESHOLD, 500)]
+    assert len(ht) == UNTREEIFY_THRESHOLD
+
+def test_treeify_equal_hashes():
+    ht = HashTable(size=1, max_load_factor=1000)
+    keys = [f"key{i}" for i in range(20)] + [-1, -2]  # hash(-1) == hash(-2)
+    for key in keys:
+        ht.insert(key, key)
+    ht.delete(-1)
+    assert ht.get(-2) == -2 and ht.get(-1) is None
+    assert ht.stats() == {}
+    assert ht.enable_stats() and ht.stats()['tree_buckets'] == 1
+
+def test_treeify_equal_full_hashes():
+    stride = 2 ** 61 - 1  # Модуль хэширования int: у всех ключей 1 + i * stride полный хэш 1
+    keys = [1 + i * stride for i in range(3000)]
+    assert len({hash(key) for key in keys}) == 1
+    ht = HashTable()
+    for i, key in enumerate(keys):
+        ht.insert(key, i)
+    assert len(ht) == 3000 and ht.get(keys[1234]) == 1234 and ht.get(1 + 3000 * stride) is None
+    assert ht._probe_count(keys[-1]) <= 2 * 12 + 1  # Внутреннее дерево по ключам, а не список из 3000 пар
+
+    ht.insert(1.0, "float")  # Равен ключу 1, но другого типа: ищется подряд, порядок не нужен
+    ht.insert(True, "bool")
+    assert len(ht) == 3000 and ht.get(1) == "bool"
+    ht.insert("k", 0)
+    for key in keys[:2995]:
+        ht.delete(key)
+    assert sorted(ht.get(key) for key in keys[2995:]) == list(range(2995, 3000))
+    assert len(ht) == 6
+
+def test_treeify_random():
+    stride = 2 ** 20 * 5 ** 7  # Ключи-коллизии для любого размера, до которого дорастёт таблица
+    ht = HashTable(min_load_factor=0.25)
+    expected = _random_dict_operations(ht, seed=3, steps=5000,
+                                       make_key=lambda rng: rng.randint(0, 300) * stride + rng.randint(0, 1))
+
+    assert all(ht.get(key) == value for key, value in expected.items())
+    assert sorted(pair for bucket in ht._buckets() for pair in bucket) == sorted(expected.items())
+
+def test_bulk_operations():
+    ht = HashTable(size=4)
+    ht.insert("a", 0)
+    ht.insert_many([("a", 1), ("b", 2), ("c", 3), ("b", 4)])
+    assert len(ht) == 3
+    assert ht.get_many(["b", "x", "a", "c"]) == [4, None, 1, 3]
+
+    ht.insert_many((i, -i) for i in range(1000))
+    assert ht.size == 512 and ht._old_table is None  # Размер выбран сразу под всю пачку
+    ht.update({"d": 5, 7: 7})
+    ht.update([("e", 6)])
+    assert len(ht) == 1005
+    assert ht.get_many([7, 8, "e"]) == [7, -8, 6]
+
+    assert ht.delete_many(["a", "x", "a", *range(500)]) == 501
+    assert len(ht) == 504
+    assert ht.get_many(["a", 499, 500]) == [None, None, -500]
+
+def test_bulk_shrink_and_trees():
+    ht = HashTable(size=8, min_load_factor=0.25)
+    ht.insert_many((i, i) for i in range(1000))
+    assert ht.delete_many(range(990)) == 990
+    assert ht.size == 32 and len(ht) == 10  # Сжатие сразу до нужного размера
+    assert ht.get_many(range(988, 1000)) == [None, None] + list(range(990, 1000))
+
+    ht = HashTable(size=1, max_load_factor=1000)
+    ht.insert_many((i, i) for i in range(100))
+    assert len(ht.table[0]) == 100 and type(ht.table[0]) is not list
+    assert ht.get_many([5, 100]) == [5, None]
+    ht.delete_many(range(95))
+    assert ht.table[0] == [(i, i) for i in range(95, 100)]
+
+def test_bulk_reads_during_rehash():
+    ht = HashTable(size=64)
+    for i in range(129):
+        ht.insert(i, i)
+    assert ht._old_table is not None and ht._rehash_index == 0
+
+    # Чтение и удаление пачкой не дописывают перенос, а смотрят и в старую таблицу
+    assert ht.get_many([0, 64, 128, 129]) == [0, 64, 128, None]
+    assert ht.delete_many([1, 65, 200]) == 2
+    assert ht._old_table is not None and ht._rehash_index == 0
+    assert len(ht) == 127 and ht.get(1) is None and ht.get(2) == 2
+
+    # Вставка пачкой продвигает перенос на число шагов по числу пар, а не дописывает его
+    start = ht._rehash_index
+    ht.insert_many([(1, -1), (200, 200), (70, -70)])
+    assert ht._old_table is not None and ht._rehash_index == start + 3 * REHASH_STEP
+    assert ht.get_many([0, 1, 200, 70]) == [0, -1, 200, -70] and len(ht) == 129
+    ht.insert_many((i, i) for i in range(1000, 1020))
+    assert ht._old_table is None and len(ht) == 149
+    assert ht.get_many(range(4)) == [0, -1, 2, 3]
+
+def test_lru_cache_eviction():
+    with pytest.raises(ValueError):
+        LRUCache()
+
+    cache = LRUCache(max_entries=3)
+    for key in "abc":
+        cache.put(key, key.upper())
+    assert cache.get("a") == "A"  # "a" становится самой свежей
+    cache.put("d", "D")
+    assert cache.keys() == ["d", "a", "c"]
+    assert cache.get("b") is None and "b" not in cache
+
+    cache.put("c", "C2")
+    cache.put("e", "E")
+    assert cache.keys() == ["e", "c", "d"]
+    cache.delete("c")
+    cache.delete("x")
+    assert len(cache) == 2
+    assert cache.stats() == {'entries': 2, 'bytes': cache.stats()['bytes'], 'hits': 1, 'misses': 1,
+                             'hit_rate': 0.5, 'evictions': 2, 'expirations': 0}
+
+def test_lru_cache_bytes_and_ttl():
+    now = [0.0]
+    cache = LRUCache(max_bytes=10, ttl=5, sizeof=lambda key, value: len(value), clock=lambda: now[0])
+    cache.put(1, "aaaa")
+    cache.put(2, "bbbb")
+    cache.put(3, "cccc")  # 12 байт > 10: вытесняется самая старая запись
+    assert cache.keys() == [3, 2] and cache.stats()['bytes'] == 8
+    cache.put(4, "x" * 11)  # Не помещается даже одна
+    assert 4 not in cache and cache.stats()['bytes'] == 8
+
+    cache.put(5, "ee", ttl=100)
+    now[0] = 5.0
+    assert 2 not in cache and 5 in cache
+    assert len(cache) == 3  # Просроченные удаляются лениво
+    assert cache.get(2) is None and cache.get(5) == "ee"
+    assert len(cache) == 2 and cache.expirations == 1
+
+def test_lru_cache_get_or_load():
+    loads = []
+
+    def loader(key):
+        loads.append(key)
+        return key * 10
+
+    cache = LRUCache(max_entries=2)
+    assert [cache.get_or_load(key, loader) for key in (1, 2, 1, 3, 2)] == [10, 20, 10, 30, 20]
+    assert loads == [1, 2, 3, 2]  # 2 вытеснена вставкой 3 и загружается заново
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 4, 2)
+
+    # loader, который сам кладёт ключ в кэш, не порождает вторую запись
+    cache.get_or_load(4, lambda key: cache.put(key, "inner") or "outer")
+    assert cache.keys() == [4, 2] and cache.get(4) == "outer"
+
+def test_concurrent_hash_table():
+    ht = ConcurrentHashTable(size=10, stripes=4)
+    assert ht.size == 12
+    ht.insert("a", 1)
+    ht.insert("a", 2)
+    assert ht.get("a") == 2 and "a" in ht and ht.get("b") is None
+    assert ht.get_or_insert("a", 3) == 2 and ht.get_or_insert("b", 4) == 4
+    assert ht.compare_and_set("a", 2, 5) and not ht.compare_and_set("a", 2, 6)
+    assert not ht.compare_and_set("c", None, 1) and "c" not in ht
+    ht.delete("a")
+    ht.delete("x")
+    assert ht.items() == [("b", 4)] and len(ht) == 1
+
+    for i in range(1000):
+        ht.insert(i, i)
+    assert ht.size % ht.stripes == 0 and ht.load_factor() <= ht.max_load_factor
+    assert all(ht.get(i) == i for i in range(1000))
+
+    # Ключи, кратные числу полос, не собираются в одной полосе
+    ht = ConcurrentHashTable(stripes=16)
+    for key in range(0, 16 * 1600, 16):
+        ht.insert(key, key)
+    assert max(ht._counts) <= 2 * min(ht._counts)
+    assert all(ht.get(key) == key for key in range(0, 16 * 1600, 16))
+
+    ht = ConcurrentHashTable(size=4, stripes=4)
+    expected = _random_dict_operations(ht, seed=5, steps=5000, make_key=lambda rng: 16 * rng.randint(0, 400))
+    assert dict(ht.items()) == expected
+
+def test_concurrent_hash_table_stress():
+    ht = ConcurrentHashTable(size=4, stripes=4)  # Маленькая таблица: рост идёт во время работы потоков
+    thread_count, rounds = 8, 2000
+    expected = [{} for _ in range(thread_count)]
+    winners = []
+
+    def worker(index):
+        rng = random.Random(index)
+        own = expected[index]
+        for step in range(rounds):
+            key = (index, rng.randint(0, 300))
+            action = rng.random()
+            if action < 0.5:
+                ht.insert(key, step)
+                own[key] = step
+            elif action < 0.7:
+                ht.delete(key)
+                own.pop(key, None)
+            else:
+                assert ht.get(key) == own.get(key)
+
+            # Общий счётчик: без атомарного compare_and_set часть приращений потерялась бы
+            while True:
+                current = ht.get("counter")
+                if ht.compare_and_set("counter", current, current + 1):
+                    break
+        winners.append(ht.get_or_insert("winner", index))
+
+    ht.insert("counter", 0)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)  # Частые переключения потоков
+    try:
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert ht.get("counter") == thread_count * rounds
+    assert len(set(winners)) == 1 and ht.get("winner") == winners[0]
+    merged = {key: value for own in expected for key, value in own.items()}
+    merged.update(counter=thread_count * rounds, winner=winners[0])
+    assert dict(ht.items()) == merged and len(ht) == len(merged)
+    assert ht.size > 4
+
+def test_shared_hash_table(tmp_path):
+    path = str(tmp_path / "table.bin")
+    with SharedHashTable.create(path, slots=8, heap_size=64) as ht:
+        ht.insert("apple", b"5")
+        ht.insert(b"banana", b"10")
+        ht.insert("apple", b"15")
+        assert ht.get("apple") == b"15" and ht.get(b"banana") == b"10" and ht.get("cherry") is None
+        assert "banana" in ht and len(ht) == 2
+
+        ht.delete("apple")
+        ht.delete("cherry")
+        assert ht.get("apple") is None and len(ht) == 1
+        ht.insert("apple", b"")  # Вставка занимает надгробие
+        assert ht.get("apple") == b"" and "apple" in ht
+
+        for i in range(4):
+            ht.insert(f"k{i}", b"v")
+        with pytest.raises(SharedTableFullError):
+            ht.insert("k4", b"v")  # 6 из 8 ячеек: больше не помещается
+        with pytest.raises(SharedTableFullError):
+            ht.insert("apple", b"x" * 64)
+
+    with SharedHashTable.open(path) as ht:
+        assert sorted(ht.items()) == [(b"apple", b""), (b"banana", b"10"),
+                                      (b"k0", b"v"), (b"k1", b"v"), (b"k2", b"v"), (b"k3", b"v")]
+
+def test_shared_hash_table_churn(tmp_path):
+    with SharedHashTable.create(str(tmp_path / "updates.bin"), slots=8, heap_size=1 << 16) as ht:
+        ht.insert("other", b"o")
+        for i in range(20000):  # Устаревшие значения уплотняются, а не копятся до переполнения
+            ht.insert("key", b"%010d" % i)
+        assert ht.get("key") == b"%010d" % 19999 and ht.get("other") == b"o" and len(ht) == 2
+
+    with SharedHashTable.create(str(tmp_path / "deletes.bin"), slots=8, heap_size=64) as ht:
+        ht.insert("stay", b"s")
+        for i in range(1000):  # Надгробия разных ключей не занимают ячейки навсегда
+            ht.insert(f"k{i}", b"v")
+            ht.delete(f"k{i}")
+        assert len(ht) == 1 and ht.items() == [(b"stay", b"s")]
+
+def test_shared_hash_table_types_and_snapshot(tmp_path):
+    with SharedHashTable.create(str(tmp_path / "table.bin")) as ht:
+        for key, value in ((5, b"v"), ("a", 3), ("a", None), (1.5, b"v")):
+            with pytest.raises(TypeError):
+                ht.insert(key, value)
+        with pytest.raises(TypeError):
+            ht.get(5)
+        assert len(ht) == 0 and ht.get(b"\x00" * 5) is None
+
+        ht.insert(bytearray(b"x"), memoryview(b"yz"))
+        ht.insert("s", "строка")
+        assert ht.get(b"x") == b"yz" and ht.get("s") == "строка".encode()
+        seq = ht._header(_SEQ)
+        assert sorted(ht.items()) == [(b"s", "строка".encode()), (b"x", b"yz")]
+        assert ht._header(_SEQ) == seq  # Снимок читает, как get, не сбивая читателей
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="нужен fork")
+def test_shared_hash_table_processes(tmp_path):
+    path = str(tmp_path / "table.bin")
+    table = SharedHashTable.from_items(path, ((f"key{i}", str(i).encode()) for i in range(1000)))
+    assert len(table) == 1000
+
+    def worker(index):
+        with SharedHashTable.open(path) as ht:
+            assert all(ht.get(f"key{i}") == str(i).encode() for i in range(800, 1000))  # Их никто не удаляет
+            for i in range(200):
+                ht.insert(f"w{index}-{i}", b"%d" % i)
+                ht.delete(f"key{index * 200 + i}")
+
+    context = multiprocessing.get_context('fork')
+    processes = [context.Process(target=worker, args=(index,)) for index in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert [process.exitcode for process in processes] == [0] * 4
+
+    assert len(table) == 1000  # 800 вставок и 800 удалений из четырёх процессов
+    assert table.get("key0") is None and table.get("key999") == b"999"
+    assert table.get("w3-199") == b"199"
+    table.close()
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="нужен fork")
+def test_shared_hash_table_writer_crash(tmp_path):
+    path = str(tmp_path / "table.bin")
+    table = SharedHashTable.create(path)
+    table.insert("a", b"1")
+
+    def crashing_writer():
+        with SharedHashTable.open(path) as ht:
+            with ht._writing():
+                ht._insert(b"b", b"2")
+                os._exit(1)  # Процесс умирает, не выйдя из записи
+
+    process = multiprocessing.get_context('fork').Process(target=crashing_writer)
+    process.start()
+    process.join()
+    assert process.exitcode == 1 and table._header(_SEQ) % 2 == 1
+
+    # Читатели не зависают на нечётном счётчике, следующий писатель его выравнивает
+    assert table.get("a") == b"1" and table.get("b") == b"2" and table.get("c") is None
+    table.insert("c", b"3")
+    assert table._header(_SEQ) % 2 == 0 and table.get("c") == b"3"
+    table.close()